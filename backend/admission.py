@@ -0,0 +1,229 @@
+# admission.py
+"""
+Admission control for the expensive endpoints (resume upload, applications,
+job create/update), which hold a worker thread for seconds to tens of
+seconds of parsing, embedding and LLM calls.
+
+Each endpoint belongs to a pool (Config.ADMISSION_POOLS) with a cap on
+requests running at once and a bounded queue of requests waiting for a
+slot. A request is turned away with 429 and Retry-After, instead of piling
+up behind the others, when:
+
+  - its user already has ADMISSION_USER_MAX_IN_FLIGHT requests in the pool
+    or has used up ADMISSION_USER_REQUESTS_PER_MINUTE (per-user quota),
+  - the queue is full, or the expected wait (queue position times the
+    pool's recent service time) is longer than the pool's queue timeout,
+  - it waited queue_timeout seconds without getting a slot.
+
+A route that hands its work to a background thread (a streamed
+application) calls detach() so the slot is held until that work ends, not
+just until the response closes.
+
+Limits are per process: with gunicorn multiply by the number of workers.
+In-flight and queued requests per pool are exported on /metrics and at
+GET /api/admin/admission.
+"""
+
+import math
+import time
+import threading
+from functools import wraps
+from config import Config
+from metrics import registry
+
+in_flight_gauge = registry.gauge("admission_in_flight", "Requests holding a slot, by pool")
+queue_depth_gauge = registry.gauge("admission_queue_depth", "Requests waiting for a slot, by pool")
+rejected_total = registry.counter(
+    "admission_rejected_total", "Requests turned away with 429, by pool and reason")
+wait_seconds = registry.histogram(
+    "admission_wait_seconds", "Time admitted requests waited for a slot, by pool",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0))
+
+
+class Rejected(Exception):
+    """A request was not admitted; retry_after is a hint in whole seconds"""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = max(1, int(math.ceil(retry_after)))
+
+
+class Pool:
+    """Concurrency cap with a bounded FIFO wait queue and per-user quotas"""
+
+    def __init__(self, name, max_concurrent, max_queue, queue_timeout):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.waiting = []  # tickets in arrival order
+        self.user_in_flight = {}
+        self.user_windows = {}  # user id -> start times of recent requests
+        self.service_time = None  # moving average of seconds a request holds its slot
+        self.admitted = 0
+        self.condition = threading.Condition()
+
+    def _expected_wait(self, position):
+        average = self.service_time if self.service_time is not None else 1.0
+        return average * (position // self.max_concurrent + 1)
+
+    def _check_user(self, user_id, now):
+        if self.user_in_flight.get(user_id, 0) >= Config.ADMISSION_USER_MAX_IN_FLIGHT:
+            raise Rejected("user_concurrency", self._expected_wait(0))
+        window = [t for t in self.user_windows.get(user_id, []) if now - t < 60]
+        if len(window) >= Config.ADMISSION_USER_REQUESTS_PER_MINUTE:
+            self.user_windows[user_id] = window
+            raise Rejected("user_rate", 60 - (now - window[0]))
+        self.user_windows[user_id] = window
+
+    def _publish(self):
+        in_flight_gauge.set(self.in_flight, pool=self.name)
+        queue_depth_gauge.set(len(self.waiting), pool=self.name)
+
+    def acquire(self, user_id):
+        """Take a slot, waiting in the queue if needed; raises Rejected. Returns seconds waited."""
+        start = time.monotonic()
+        with self.condition:
+            self._check_user(user_id, time.time())
+            if self.in_flight >= self.max_concurrent or self.waiting:
+                position = len(self.waiting)
+                if position >= self.max_queue:
+                    raise Rejected("queue_full", self._expected_wait(position))
+                if self._expected_wait(position) > self.queue_timeout:
+                    raise Rejected("overloaded", self._expected_wait(position))
+                ticket = object()
+                self.waiting.append(ticket)
+                self._publish()
+                try:
+                    deadline = start + self.queue_timeout
+                    while self.in_flight >= self.max_concurrent or self.waiting[0] is not ticket:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise Rejected("queue_timeout", self._expected_wait(len(self.waiting)))
+                        self.condition.wait(remaining)
+                finally:
+                    self.waiting.remove(ticket)
+                    # The next in line may be able to go now
+                    self.condition.notify_all()
+            self.in_flight += 1
+            self.admitted += 1
+            self.user_in_flight[user_id] = self.user_in_flight.get(user_id, 0) + 1
+            # Only admitted requests count against the per-minute quota
+            self.user_windows[user_id].append(time.time())
+            self._publish()
+        return time.monotonic() - start
+
+    def release(self, user_id, held):
+        with self.condition:
+            self.in_flight -= 1
+            if self.user_in_flight.get(user_id, 0) <= 1:
+                self.user_in_flight.pop(user_id, None)
+            else:
+                self.user_in_flight[user_id] -= 1
+            self.service_time = held if self.service_time is None else 0.8 * self.service_time + 0.2 * held
+            self._publish()
+            self.condition.notify_all()
+
+    def stats(self):
+        with self.condition:
+            return {
+                "pool": self.name,
+                "in_flight": self.in_flight,
+                "queue_depth": len(self.waiting),
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "queue_timeout": self.queue_timeout,
+                "avg_service_seconds": round(self.service_time, 3) if self.service_time is not None else None,
+                "admitted": self.admitted,
+                "users_in_flight": len(self.user_in_flight),
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name):
+    with _pools_lock:
+        if name not in _pools:
+            limits = Config.ADMISSION_POOLS[name]
+            _pools[name] = Pool(name, limits["max_concurrent"], limits["max_queue"], limits["queue_timeout"])
+        return _pools[name]
+
+
+def stats():
+    return {
+        "enabled": Config.ADMISSION_CONTROL_ENABLED,
+        "user_max_in_flight": Config.ADMISSION_USER_MAX_IN_FLIGHT,
+        "user_requests_per_minute": Config.ADMISSION_USER_REQUESTS_PER_MINUTE,
+        "pools": [get_pool(name).stats() for name in Config.ADMISSION_POOLS],
+    }
+
+
+def detach():
+    """
+    Hand the current request's slot over to work that outlives the response
+    (e.g. a background operation). Returns the function that releases it,
+    which that work must call when it ends; the decorator then no longer
+    releases the slot itself.
+    """
+    from flask import g
+    release = g.pop('admission_release', None)
+    return release if release is not None else (lambda: None)
+
+
+def admission_controlled(pool_name):
+    """
+    Decorator for routes taking current_user (place it under @token_required).
+    The slot is held until the response is closed, so streamed responses keep
+    it while they are being generated, or until the work it was detached to
+    (see detach) ends.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(current_user, *args, **kwargs):
+            from flask import current_app, jsonify, g
+            if not Config.ADMISSION_CONTROL_ENABLED:
+                return f(current_user, *args, **kwargs)
+            pool = get_pool(pool_name)
+            user_id = current_user['id']
+            try:
+                waited = pool.acquire(user_id)
+            except Rejected as e:
+                rejected_total.inc(pool=pool_name, reason=e.reason)
+                response = jsonify({'message': 'Server busy, please retry later', 'reason': e.reason,
+                                    'retry_after': e.retry_after})
+                response.status_code = 429
+                response.headers['Retry-After'] = str(e.retry_after)
+                return response
+            wait_seconds.observe(waited, pool=pool_name)
+
+            admitted_at = time.monotonic()
+            released = []
+            release_lock = threading.Lock()
+
+            def release():
+                with release_lock:
+                    if released:
+                        return
+                    released.append(True)
+                pool.release(user_id, time.monotonic() - admitted_at)
+
+            g.admission_release = release
+            try:
+                response = current_app.make_response(f(current_user, *args, **kwargs))
+            except BaseException:
+                release()
+                raise
+            if g.pop('admission_release', None) is None:
+                # Detached: released by the work that took the slot over
+                return response
+            if response.is_streamed:
+                response.call_on_close(release)
+            else:
+                release()
+            return response
+        return decorated
+    return decorator
@@ -0,0 +1,259 @@
+# agents/chunker.py
+"""
+Chunking strategies for job descriptions and resumes.
+
+    fixed   - the original RecursiveCharacterTextSplitter(1000 chars, 200 overlap)
+    token   - recursive splitting packed to a token budget
+    section - split on detected section headings (Requirements,
+              Responsibilities, Skills, Experience, ...) first, then pack
+              each section to the token budget
+
+Sizes are measured in embedding-model tokens so chunks fit the model's
+context window (MODEL_MAX_TOKENS) instead of being silently truncated.
+Config.CHUNK_STRATEGY picks the default strategy.
+"""
+
+import re
+import threading
+from collections import namedtuple
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from config import Config
+from metrics import registry
+from embeddings import MODEL_MAX_TOKENS
+
+Chunk = namedtuple("Chunk", "text section tokens")
+
+chunks_per_document = registry.histogram(
+    "chunker_chunks_per_document", "Chunks produced per document",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128))
+embedded_tokens = registry.counter(
+    "chunker_embedded_tokens_total", "Tokens sent to the embedding model, including overlap")
+
+APPROX_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+# Canonical names for common JD and resume headings
+SECTION_ALIASES = {
+    "about": "about", "about the role": "about", "about us": "about", "about the company": "about",
+    "overview": "about", "company": "about", "the role": "about", "job summary": "about",
+    "summary": "summary", "profile": "summary", "professional summary": "summary", "objective": "summary",
+    "responsibilities": "responsibilities", "key responsibilities": "responsibilities",
+    "duties": "responsibilities", "what you'll do": "responsibilities", "what you will do": "responsibilities",
+    "requirements": "requirements", "qualifications": "requirements", "minimum qualifications": "requirements",
+    "required skills": "requirements", "required qualifications": "requirements",
+    "what you'll need": "requirements", "what we're looking for": "requirements", "must have": "requirements",
+    "preferred": "preferred", "preferred qualifications": "preferred", "preferred skills": "preferred",
+    "nice to have": "preferred", "bonus points": "preferred",
+    "benefits": "benefits", "perks": "benefits", "what we offer": "benefits", "compensation": "benefits",
+    "skills": "skills", "technical skills": "skills", "core skills": "skills",
+    "experience": "experience", "work experience": "experience", "professional experience": "experience",
+    "employment history": "experience",
+    "education": "education", "academic background": "education",
+    "certifications": "certifications", "certificates": "certifications", "licenses": "certifications",
+    "projects": "projects", "publications": "publications", "awards": "awards", "languages": "languages",
+}
+
+
+def approx_token_count(text):
+    """Rough word-piece count used when the model's tokenizer is not available"""
+    return sum(1 + len(piece) // 8 for piece in APPROX_TOKEN.findall(text))
+
+
+_token_counters = {}
+_token_counters_lock = threading.Lock()
+
+
+def get_token_counter(model_name):
+    """Token counting function for an embedding model (its tokenizer when available)"""
+    with _token_counters_lock:
+        if model_name not in _token_counters:
+            counter = approx_token_count
+            if Config.EMBEDDING_BACKEND in ("huggingface", "onnx"):
+                try:
+                    from transformers import AutoTokenizer
+                    repo = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+                    tokenizer = AutoTokenizer.from_pretrained(repo)
+                    counter = lambda text: len(tokenizer.encode(text, add_special_tokens=False))
+                except Exception as e:
+                    print(f"Tokenizer for {model_name} unavailable, approximating token counts: {e}")
+            _token_counters[model_name] = counter
+        return _token_counters[model_name]
+
+
+def section_heading(line):
+    """Canonical section name if the line is a heading, else None"""
+    title = line.strip().lstrip("#").strip()
+    if not title or len(title) > 50 or len(title.split()) > 6:
+        return None
+    explicit = title.endswith(":")
+    title = title.rstrip(":").strip()
+    name = title.lower()
+    if name in SECTION_ALIASES:
+        return SECTION_ALIASES[name]
+    if explicit or line.strip().startswith("#") or (title.isupper() and len(title) > 3):
+        return re.sub(r"[^a-z0-9]+", "_", name).strip("_") or None
+    return None
+
+
+class Chunker:
+    """Base class: split text into Chunks of at most max_tokens tokens"""
+    name = None
+
+    def __init__(self, max_tokens, overlap_tokens, count_tokens):
+        self.max_tokens = max_tokens
+        self.overlap_tokens = min(overlap_tokens, max_tokens // 2)
+        self.count_tokens = count_tokens
+
+    def split(self, text):
+        raise NotImplementedError
+
+
+class FixedChunker(Chunker):
+    """The original fixed 1000-character / 200-overlap splitter, kept for comparison"""
+    name = "fixed"
+
+    def __init__(self, max_tokens, overlap_tokens, count_tokens):
+        super().__init__(max_tokens, overlap_tokens, count_tokens)
+        self.splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200, length_function=len)
+
+    def split(self, text):
+        return [Chunk(piece, None, self.count_tokens(piece)) for piece in self.splitter.split_text(text)]
+
+
+class TokenChunker(Chunker):
+    """Recursive splitting (paragraphs, lines, sentences, words) packed to the token budget"""
+    name = "token"
+    separators = ("\n\n", "\n", ". ", " ")
+
+    def _pieces(self, text, separators, budget):
+        """Split text into pieces that each fit the budget; separators stay attached"""
+        if self.count_tokens(text) <= budget or not separators:
+            return [text]
+        separator, rest = separators[0], separators[1:]
+        parts = text.split(separator)
+        pieces = []
+        for i, part in enumerate(parts):
+            if i < len(parts) - 1:
+                part += separator
+            if part:
+                pieces.extend(self._pieces(part, rest, budget))
+        return pieces
+
+    def _pack(self, text, section=None, prefix=""):
+        """Greedily pack pieces into chunks, carrying up to overlap_tokens between them"""
+        budget = max(self.max_tokens - (self.count_tokens(prefix) if prefix else 0), 1)
+        chunks, current, current_tokens = [], [], 0
+        for piece in self._pieces(text, self.separators, budget):
+            tokens = self.count_tokens(piece)
+            if current and current_tokens + tokens > budget:
+                chunks.append(current)
+                # Keep trailing pieces of the previous chunk as overlap
+                overlap, overlap_tokens = [], 0
+                for prev_piece, prev_tokens in reversed(current):
+                    if overlap_tokens + prev_tokens > min(self.overlap_tokens, budget - tokens):
+                        break
+                    overlap.insert(0, (prev_piece, prev_tokens))
+                    overlap_tokens += prev_tokens
+                current, current_tokens = overlap, overlap_tokens
+            current.append((piece, tokens))
+            current_tokens += tokens
+        if current:
+            chunks.append(current)
+
+        result = []
+        for pieces in chunks:
+            body = "".join(piece for piece, _ in pieces).strip()
+            if body:
+                chunk_text = f"{prefix}\n{body}" if prefix else body
+                result.append(Chunk(chunk_text, section, self.count_tokens(chunk_text)))
+        return result
+
+    def split(self, text):
+        return self._pack(text)
+
+
+class SectionChunker(TokenChunker):
+    """
+    One chunk per detected section where it fits the budget. Long sections
+    are packed like TokenChunker with their heading repeated on every chunk;
+    sections under Config.CHUNK_MIN_TOKENS are merged into the next one.
+    """
+    name = "section"
+
+    def sections(self, text):
+        """[(section name, heading line, body)] in document order"""
+        sections = [[None, "", []]]
+        for line in text.splitlines():
+            name = section_heading(line)
+            if name:
+                sections.append([name, line.strip(), []])
+            else:
+                sections[-1][2].append(line)
+        return [(name, heading, "\n".join(body).strip()) for name, heading, body in sections
+                if heading or "\n".join(body).strip()]
+
+    def split(self, text):
+        merged = []
+        carry, carry_name = "", None
+        for name, heading, body in self.sections(text):
+            if carry:
+                heading, name = f"{carry}\n\n{heading}".strip(), name or carry_name
+                carry, carry_name = "", None
+            if self.count_tokens(f"{heading}\n{body}") < Config.CHUNK_MIN_TOKENS:
+                carry, carry_name = f"{heading}\n{body}".strip(), name
+                continue
+            merged.append((name, heading, body))
+        if carry:
+            if merged:
+                name, heading, body = merged.pop()
+                merged.append((name, heading, f"{body}\n\n{carry}".strip()))
+            else:
+                merged.append((carry_name, "", carry))
+
+        chunks = []
+        for name, heading, body in merged:
+            if body:
+                chunks.extend(self._pack(body, section=name, prefix=heading))
+            else:
+                chunks.append(Chunk(heading, name, self.count_tokens(heading)))
+        return chunks
+
+
+CHUNKERS = {cls.name: cls for cls in (FixedChunker, TokenChunker, SectionChunker)}
+
+_chunkers = {}
+_chunkers_lock = threading.Lock()
+
+
+def get_chunker(strategy=None, model_name=None):
+    """Shared chunker for a strategy (default Config.CHUNK_STRATEGY) sized for model_name"""
+    strategy = strategy or Config.CHUNK_STRATEGY
+    model_name = model_name or Config.EMBEDDING_MODEL
+    if strategy not in CHUNKERS:
+        raise ValueError(f"Unknown chunking strategy: {strategy}")
+    key = (strategy, model_name, Config.CHUNK_MAX_TOKENS, Config.CHUNK_OVERLAP_TOKENS)
+    with _chunkers_lock:
+        if key not in _chunkers:
+            # Leave room for the [CLS]/[SEP] tokens the model adds
+            max_tokens = MODEL_MAX_TOKENS.get(model_name, 256) - 2
+            if Config.CHUNK_MAX_TOKENS:
+                max_tokens = min(max_tokens, Config.CHUNK_MAX_TOKENS)
+            _chunkers[key] = CHUNKERS[strategy](max_tokens, Config.CHUNK_OVERLAP_TOKENS,
+                                                get_token_counter(model_name))
+    return _chunkers[key]
+
+
+def chunk_stats(chunks, text=None, count_tokens=approx_token_count):
+    """Chunk count and embedding cost of one document"""
+    tokens = sum(chunk.tokens for chunk in chunks)
+    stats = {"chunks": len(chunks), "embedded_tokens": tokens}
+    if text is not None:
+        document_tokens = count_tokens(text)
+        stats["document_tokens"] = document_tokens
+        stats["overhead"] = round(tokens / document_tokens - 1, 3) if document_tokens else 0.0
+    return stats
+
+
+def record_chunking(kind, chunker, chunks):
+    """Report chunk count and embedded tokens for one document to /metrics"""
+    chunks_per_document.observe(len(chunks), kind=kind, strategy=chunker.name)
+    embedded_tokens.inc(sum(chunk.tokens for chunk in chunks), kind=kind, strategy=chunker.name)
@@ -0,0 +1,73 @@
+# agents/document_text.py
+"""
+Plain-text extraction from resume files (PDF and DOCX).
+
+Kept free of model and vector store imports so it is cheap to run in the
+worker processes of bulk ingestion (see resume_ingest.py), which run
+
+    python -m agents.document_text
+
+and exchange one JSON line per file on stdin/stdout (see serve).
+"""
+
+import os
+import re
+import sys
+import json
+import zipfile
+from xml.etree import ElementTree
+import PyPDF2
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def extract_text_from_pdf(file_path):
+    """
+    Extract text from PDF file
+    """
+    text = ""
+    with open(file_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        for page in reader.pages:
+            text += page.extract_text() + "\n"
+    return text
+
+
+def extract_text_from_docx(file_path):
+    """Paragraph text of a .docx file (one line per paragraph, tabs and breaks kept)"""
+    with zipfile.ZipFile(file_path) as archive:
+        root = ElementTree.fromstring(archive.read("word/document.xml"))
+    lines = []
+    for paragraph in root.iter(f"{WORD_NS}p"):
+        parts = []
+        for node in paragraph.iter():
+            if node.tag == f"{WORD_NS}t" and node.text:
+                parts.append(node.text)
+            elif node.tag == f"{WORD_NS}tab":
+                parts.append("\t")
+            elif node.tag in (f"{WORD_NS}br", f"{WORD_NS}cr"):
+                parts.append("\n")
+        lines.append("".join(parts))
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines))
+
+
+def extract_text(file_path):
+    """Text of a resume file, by extension"""
+    if os.path.splitext(file_path)[1].lower() == ".docx":
+        return extract_text_from_docx(file_path)
+    return extract_text_from_pdf(file_path)
+
+
+def serve(requests=sys.stdin, replies=sys.stdout):
+    """Worker loop: a JSON file path per line in, {"text"} or {"error"} per line out"""
+    for line in requests:
+        try:
+            reply = {"text": extract_text(json.loads(line))}
+        except Exception as e:
+            reply = {"error": str(e) or type(e).__name__}
+        replies.write(json.dumps(reply) + "\n")
+        replies.flush()
+
+
+if __name__ == "__main__":
+    serve()
@@ -1,30 +1,11 @@
 # agents/jd_summarizer.py
 
-import os
-import json
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.vectorstores import Chroma
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain.chains import LLMChain
 from langchain.prompts import PromptTemplate
-from langchain_groq import ChatGroq
-
-# Initialize embeddings
-embeddings = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
-
-# Initialize LLM (lazy initialization)
-def get_llm():
-    return ChatGroq(
-        groq_api_key=os.getenv("GROQ_API_KEY"),
-        model_name="openai/gpt-oss-20b"
-    )
-
-# Create text splitter
-text_splitter = RecursiveCharacterTextSplitter(
-    chunk_size=1000,
-    chunk_overlap=200,
-    length_function=len,
-)
+from metrics import span, timed
+from vector_store import active_model
+from vector_index import get_job_index
+from agents.chunker import get_chunker, record_chunking
+from agents.output_parser import complete_structured, OutputParseError, JD_SUMMARY
 
 # Create prompt template
 template = """
@@ -42,7 +23,7 @@ Job Description:
 {job_description}
 
 Provide the information in JSON format with the following structure if they exist. Otherwise leave them blank. Ensure the output is valid JSON. Do not include any explanation or commentary:
-{
+{{
     "job_title": "",
     "required_skills": [],
     "preferred_skills": [],
@@ -50,7 +31,7 @@ Provide the information in JSON format with the following structure if they exis
     "education": "",
     "responsibilities": [],
     "company_info": ""
-}
+}}
 """
 
 prompt = PromptTemplate(
@@ -58,45 +39,67 @@ prompt = PromptTemplate(
     template=template
 )
 
-# Create chain (lazy initialization)
-def get_chain():
-    return LLMChain(llm=get_llm(), prompt=prompt)
+SUMMARY_QUERY = "What are the key requirements and responsibilities for this job?"
+
+
+def chunk_jd(job_description, job_id=None):
+    """(texts, metadatas) of a job description's chunks (Config.CHUNK_STRATEGY)"""
+    chunker = get_chunker(model_name=active_model("jobs"))
+    with span("chunk"):
+        chunks = chunker.split(job_description)
+    record_chunking("jd", chunker, chunks)
+    texts = [chunk.text for chunk in chunks]
+    metadatas = [{"section": chunk.section or ""} for chunk in chunks]
+    if job_id is not None:
+        metadatas = [{**metadata, "job_id": job_id} for metadata in metadatas]
+    return texts, metadatas
+
+
+def summarize_stored_jd(job_id, chunk_count, query_vec=None):
+    """
+    LLM summary of a job description whose chunks are already in the vector
+    store. query_vec, when given, is the embedded SUMMARY_QUERY (bulk
+    imports embed it once for every job).
+    """
+    index = get_job_index()
+
+    # Retrieve relevant chunks for summarization (every section of a typical JD)
+    k = min(max(chunk_count, 3), 8)
+    with span("vector_retrieve"):
+        if query_vec is None:
+            relevant_chunks = index.search_text(SUMMARY_QUERY, k=k, job_id=job_id)
+        else:
+            relevant_chunks = index.search(query_vec, k=k, job_id=job_id)
+
+    # Combine relevant chunks
+    context = "\n".join([chunk.text for chunk in relevant_chunks])
+
+    # Run the prompt with retrieved context through the shared gateway; the
+    # answer is validated against JD_SUMMARY (repaired locally or re-asked once)
+    try:
+        with span("llm"):
+            return complete_structured(prompt.format(job_description=context), JD_SUMMARY)
+    except OutputParseError as e:
+        return {"summary": e.raw, "error": f"Failed to parse LLM response as JSON: {e}"}
 
-def summarize_jd(job_description):
+
+@timed("summarize_jd")
+def summarize_jd(job_description, job_id=None):
     """
     Process job description using RAG pipeline:
-    1. Chunk the job description
-    2. Store chunks in vector store
+    1. Chunk the job description (Config.CHUNK_STRATEGY, section-aware by default)
+    2. Store chunks in vector store (tagged with job_id when given, replacing
+       that job's chunks from any earlier version of the description)
     3. Use LLM to generate structured summary
     """
     try:
         # Create chunks
-        chunks = text_splitter.split_text(job_description)
-        
-        # Store in Chroma
-        vectorstore = Chroma.from_texts(
-            chunks,
-            embeddings,
-            persist_directory="db/vector_store/jobs"
-        )
-        
-        # Retrieve relevant chunks for summarization
-        relevant_chunks = vectorstore.similarity_search(
-            "What are the key requirements and responsibilities for this job?",
-            k=3
-        )
-        
-        # Combine relevant chunks
-        context = "\n".join([chunk.page_content for chunk in relevant_chunks])
+        texts, metadatas = chunk_jd(job_description, job_id)
         
-        # Run the chain with retrieved context
-        result = get_chain().invoke({"job_description": context})
+        # Store in the job index (embeds the chunks)
+        get_job_index().replace([(job_id, texts, metadatas, None)])
         
-        # Parse result as JSON
-        try:
-            return json.loads(result.content)
-        except json.JSONDecodeError:
-            return {"summary": result.content}
+        return summarize_stored_jd(job_id, len(texts))
             
     except Exception as e:
         print(f"Error in summarize_jd: {str(e)}")
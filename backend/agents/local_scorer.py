@@ -0,0 +1,110 @@
+# agents/local_scorer.py
+"""
+Fully local scoring: embedding similarity plus the rule-based skill,
+experience and education scores, with no LLM call. Used when a job (or
+Config.SCORING_MODE) selects the "local" scoring mode.
+"""
+
+import re
+from config import Config
+from metrics import timed
+from progress import emit, stage
+from agents import rule_engine
+from agents.shortlister import (
+    get_skill_match_score,
+    get_experience_match_score,
+    get_education_match_score,
+    get_semantic_similarity,
+    generate_matching_analysis,
+)
+
+def _contains_term(text_lower, term):
+    term = term.lower().strip()
+    if not term:
+        return False
+    return re.search(r"(?<![a-z0-9])" + re.escape(term) + r"(?![a-z0-9])", text_lower) is not None
+
+
+def extract_local_resume_data(resume_text, jd_data):
+    """
+    Build the structured resume dict the rule-based scorers expect from raw text.
+
+    Skills are the JD's required/preferred skills that appear in the resume,
+    experience from merged date ranges (or the largest "N years" mention) and
+    education from lines naming a degree (see agents/rule_engine.py).
+    """
+    text_lower = resume_text.lower()
+    jd_skills = list(jd_data.get('required_skills', [])) + list(jd_data.get('preferred_skills', []))
+    skills = [skill for skill in jd_skills if _contains_term(text_lower, skill)]
+
+    years = rule_engine.text_experience_years(resume_text)
+    experience = [{"duration": f"{round(years, 2)} years"}] if years else []
+
+    education = []
+    for line in resume_text.splitlines():
+        if rule_engine.degree_level(line):
+            education.append({"degree": line.strip()})
+
+    return {
+        "skills": skills,
+        "experience": experience,
+        "education": education,
+    }
+
+
+def combine_local_score(semantic_score, component_scores):
+    """
+    Combine rule-based component scores (keyed skills/experience/education)
+    using the Config weights, renormalized over the components present, then
+    blend with semantic similarity. Returns (final score, rule score).
+    """
+    weights = {
+        'skills': Config.SKILL_WEIGHT,
+        'experience': Config.EXPERIENCE_WEIGHT,
+        'education': Config.EDUCATION_WEIGHT,
+    }
+    total_weight = sum(weights[name] for name in component_scores)
+    rule_score = sum(score * weights[name] for name, score in component_scores.items()) / total_weight
+    final_score = (semantic_score * Config.LOCAL_SEMANTIC_WEIGHT
+                   + rule_score * (1 - Config.LOCAL_SEMANTIC_WEIGHT))
+    return final_score, rule_score
+
+
+@timed("evaluate_match_local")
+def evaluate_match_local(resume_text, jd_data, job_id=None, profile_vec=None):
+    """
+    Score a resume against a summarized JD without any network call.
+
+    The rule-based components are combined with Config.SKILL_WEIGHT,
+    EXPERIENCE_WEIGHT and EDUCATION_WEIGHT (renormalized over the components
+    the JD actually specifies), then blended with embedding similarity using
+    Config.LOCAL_SEMANTIC_WEIGHT. Returns the same shape as evaluate_match.
+    """
+    jd_data = jd_data if isinstance(jd_data, dict) else {}
+    resume_data = extract_local_resume_data(resume_text, jd_data)
+
+    semantic_score = get_semantic_similarity(resume_text, job_id, resume_vec=profile_vec)
+    emit("partial", semantic_score=round(semantic_score, 2))
+    stage("analyzing", scoring_mode="local")
+
+    components = {}
+    if jd_data.get('required_skills') or jd_data.get('preferred_skills'):
+        components['skills'] = get_skill_match_score(resume_data['skills'], jd_data)
+    components['experience'] = get_experience_match_score(
+        resume_data['experience'], str(jd_data.get('experience_required', '')))
+    components['education'] = get_education_match_score(
+        resume_data['education'], str(jd_data.get('education', '')))
+
+    final_score, rule_score = combine_local_score(semantic_score, components)
+
+    return {
+        "match_score": round(final_score, 2),
+        "analysis": {
+            "detailed_analysis": generate_matching_analysis(resume_data, jd_data, final_score),
+            "component_scores": {name: round(score, 2) for name, score in components.items()},
+            "rule_score": round(rule_score, 2),
+            "scoring_mode": "local"
+        },
+        "semantic_score": round(semantic_score, 2),
+        "llm_score": None
+    }
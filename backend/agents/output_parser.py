@@ -0,0 +1,284 @@
+# agents/output_parser.py
+"""
+Schema-validated JSON answers from the LLM.
+
+complete_structured() asks the gateway for a completion and turns the text
+into a dict that matches a Schema:
+
+1. extract  - the JSON object is taken out of code fences, reasoning
+              blocks and surrounding prose
+2. repair   - common defects are fixed locally: smart quotes, comments,
+              trailing commas, Python literals, raw newlines in strings,
+              single-quoted objects and output cut off mid-object
+3. validate - fields are coerced to their declared kind ("85%" -> 85.0,
+              "a, b" -> ["a", "b"]); a missing required field fails
+4. retry    - only when 1-3 fail, the prompt is sent once more with a
+              stricter instruction naming the expected keys
+
+Every parse is counted in llm_output_parse_total{prompt, model, outcome}
+with outcome ok, repaired, retried or failed.
+"""
+
+import re
+import ast
+import json
+from collections import namedtuple
+from config import Config
+from llm_gateway import get_gateway
+from metrics import registry, span
+
+Field = namedtuple("Field", "kind required")
+Schema = namedtuple("Schema", "name fields")
+
+parse_total = registry.counter(
+    "llm_output_parse_total", "Structured LLM answers by parse outcome (ok, repaired, retried, failed)")
+
+MATCH_ANALYSIS = Schema("match_analysis", {
+    "match_score": Field("score", True),
+    "strengths": Field("list", False),
+    "gaps": Field("list", False),
+    "detailed_analysis": Field("text", False),
+    "recommendation": Field("text", False),
+})
+
+JD_SUMMARY = Schema("jd_summary", {
+    "job_title": Field("text", False),
+    "required_skills": Field("text_list", True),
+    "preferred_skills": Field("text_list", False),
+    "experience_required": Field("text", False),
+    "education": Field("text", False),
+    "responsibilities": Field("text_list", False),
+    "company_info": Field("text", False),
+})
+
+FENCE = re.compile(r"```(?:json|JSON)?\s*\n?(.*?)```", re.DOTALL)
+THINK = re.compile(r"<think>.*?</think>", re.DOTALL)
+SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+DANGLING_KEY = re.compile(r'[,{]\s*"(?:[^"\\]|\\.)*"\s*:?\s*$')
+PYTHON_LITERAL = re.compile(r"(True|False|None)\b")
+NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+RETRY_INSTRUCTION = """
+
+Your previous answer could not be parsed ({error}). Reply with a single JSON object only: no code fences, no comments, no text before or after it. It must contain the keys: {keys}."""
+
+
+class OutputParseError(ValueError):
+    """The LLM answer could not be turned into a valid object; raw holds the text"""
+
+    def __init__(self, message, raw):
+        super().__init__(message)
+        self.raw = raw
+
+
+def extract_json(text):
+    """The JSON object in an answer: fenced block, else from the first '{' (or the whole text)"""
+    text = THINK.sub("", text or "").strip()
+    for block in FENCE.findall(text):
+        if "{" in block:
+            text = block
+            break
+    start = text.find("{")
+    if start < 0:
+        return text.strip()
+    end = _object_end(text, start)
+    return text[start:end].strip()
+
+
+def _object_end(text, start):
+    """Index just past the object opened at start (end of text when it is never closed)"""
+    depth, in_string, escaped = 0, False, False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return len(text)
+
+
+def repair_json(text):
+    """
+    Fix the usual defects of model-written JSON in one pass over the text:
+    comments, trailing commas, raw control characters inside strings,
+    Python True/False/None and brackets left open by a truncated answer
+    """
+    text = text.translate(SMART_QUOTES)
+    out, stack = [], []
+    in_string, escaped, i = False, False, 0
+    while i < len(text):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            elif char == "\n":
+                char = "\\n"
+            elif char in "\r\t":
+                char = "\\r" if char == "\r" else "\\t"
+            out.append(char)
+            i += 1
+            continue
+        if text.startswith("//", i):
+            i = text.find("\n", i) if "\n" in text[i:] else len(text)
+            continue
+        if text.startswith("/*", i):
+            close = text.find("*/", i + 2)
+            i = close + 2 if close >= 0 else len(text)
+            continue
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]":
+            out = [_without_trailing_comma("".join(out))]
+            if stack:
+                stack.pop()
+        elif char in "TFN":
+            literal = PYTHON_LITERAL.match(text, i)
+            if literal and (not out or not out[-1][-1:].isalnum()):
+                out.append({"True": "true", "False": "false", "None": "null"}[literal.group(1)])
+                i += len(literal.group(1))
+                continue
+        out.append(char)
+        i += 1
+
+    # Close whatever a truncated answer left open
+    text = "".join(out)
+    if in_string:
+        text = (text[:-1] if escaped else text) + '"'
+    while stack:
+        closer = stack.pop()
+        text = _without_trailing_comma(text)
+        if closer == "}":
+            # A key cut off before (or right after) its colon has no value to keep
+            dangling = DANGLING_KEY.search(text)
+            if dangling:
+                text = _without_trailing_comma(text[:dangling.start() + 1])
+        text += closer
+    return text
+
+
+def _without_trailing_comma(text):
+    text = text.rstrip()
+    return text[:-1] if text.endswith(",") else text
+
+
+def loads_lenient(text):
+    """(object, repaired) from answer text; raises ValueError when nothing parses"""
+    candidate = extract_json(text)
+    if not candidate.startswith(("{", "[")):
+        raise ValueError("no JSON object in the answer")
+    try:
+        return json.loads(candidate), False
+    except ValueError:
+        pass
+    try:
+        return json.loads(repair_json(candidate)), True
+    except ValueError as e:
+        error = e
+    try:
+        # A Python dict literal (single quotes) is a frequent near miss
+        value = ast.literal_eval(candidate)
+        if isinstance(value, dict):
+            return value, True
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        pass
+    raise ValueError(f"invalid JSON: {error}")
+
+
+def _coerce(kind, value):
+    if kind == "score":
+        if isinstance(value, str):
+            match = NUMBER.search(value)
+            if not match:
+                raise ValueError(f"not a number: {value!r}")
+            value = match.group()
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise ValueError(f"not a number: {value!r}")
+        return min(100.0, max(0.0, float(value)))
+    if kind == "text":
+        if isinstance(value, (list, tuple)):
+            return "; ".join(str(item) for item in value if item not in (None, ""))
+        return "" if value is None else str(value)
+    if kind == "text_list":
+        if isinstance(value, str):
+            value = [part.strip(" -•*") for part in re.split(r"[\n,;]", value)]
+        elif not isinstance(value, (list, tuple)):
+            value = [] if value is None else [value]
+        return [str(item).strip() for item in value if str(item).strip()]
+    # "list": items kept as they are (objects or strings)
+    if value is None:
+        return []
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def validate(data, schema):
+    """Copy of data with the schema's fields coerced; raises ValueError on a bad or missing required field"""
+    if not isinstance(data, dict):
+        raise ValueError(f"expected a JSON object, got {type(data).__name__}")
+    result = dict(data)
+    for key, field in schema.fields.items():
+        if key not in data or data[key] in (None, ""):
+            if field.required:
+                raise ValueError(f"missing field {key}")
+            result[key] = _coerce(field.kind, None) if field.kind != "score" else None
+            continue
+        try:
+            result[key] = _coerce(field.kind, data[key])
+        except ValueError as e:
+            raise ValueError(f"field {key}: {e}")
+    return result
+
+
+def parse_structured(text, schema):
+    """(validated dict, repaired) from answer text; raises OutputParseError"""
+    try:
+        data, repaired = loads_lenient(text)
+        return validate(data, schema), repaired
+    except ValueError as e:
+        raise OutputParseError(str(e), text)
+
+
+def complete_structured(prompt, schema, model=None, **kwargs):
+    """
+    Gateway completion parsed into a dict matching schema
+
+    Repairs the answer locally when it can, and re-asks once with a
+    stricter instruction when it cannot. Raises OutputParseError (with the
+    last raw answer) when the retry fails too.
+    """
+    model = model or Config.LLM_MODEL
+    gateway = get_gateway()
+    text = gateway.complete(prompt, model=model, **kwargs)
+    try:
+        data, repaired = parse_structured(text, schema)
+        parse_total.inc(prompt=schema.name, model=model, outcome="repaired" if repaired else "ok")
+        return data
+    except OutputParseError as e:
+        error = e
+
+    print(f"Unparseable {schema.name} answer from {model} ({error}); retrying once")
+    retry_prompt = prompt + RETRY_INSTRUCTION.format(error=error, keys=", ".join(schema.fields))
+    with span("llm_retry"):
+        text = gateway.complete(retry_prompt, model=model, **kwargs)
+    try:
+        data, _ = parse_structured(text, schema)
+    except OutputParseError:
+        parse_total.inc(prompt=schema.name, model=model, outcome="failed")
+        raise
+    parse_total.inc(prompt=schema.name, model=model, outcome="retried")
+    return data
@@ -0,0 +1,250 @@
+# agents/prompt_budget.py
+"""
+Token-budgeted assembly of the match analysis prompt.
+
+The candidate profile (parse_resume's answers run to several paragraphs
+per section) and the retrieved job description chunks are fitted into
+Config.LLM_PROMPT_TOKEN_BUDGET tokens, instructions included:
+
+- whitespace is collapsed first
+- JD chunks are kept best-first until Config.LLM_PROMPT_JD_SHARE of the
+  budget is used; the chunk that no longer fits is cut short
+- profile sections are ordered by term overlap with the kept JD text.
+  When the profile is too long, every section keeps its opening passage
+  and the rest of the budget goes to the passages that overlap most with
+  the JD; dropped passages are marked with "…"
+
+Tokens are counted with tiktoken's o200k_base encoding when tiktoken is
+installed and approximated otherwise. Every prompt's size is exported as
+llm_prompt_tokens{prompt} and what was cut as
+llm_prompt_trimmed_tokens_total{prompt}.
+"""
+
+import re
+import math
+import threading
+from collections import namedtuple
+from config import Config
+from metrics import registry
+from agents.chunker import approx_token_count
+
+BudgetedPrompt = namedtuple("BudgetedPrompt", "text tokens budget trimmed_tokens")
+
+prompt_tokens = registry.histogram(
+    "llm_prompt_tokens", "Tokens in assembled LLM prompts",
+    buckets=(250, 500, 750, 1000, 1500, 2000, 3000, 4000, 6000, 8000))
+trimmed_tokens = registry.counter(
+    "llm_prompt_trimmed_tokens_total", "Tokens of profile and JD text left out to fit the prompt budget")
+
+# Profile sections in the order build_candidate_profile renders them
+PROFILE_SECTIONS = (
+    ("skills", "Skills"),
+    ("experience", "Experience"),
+    ("education", "Education"),
+    ("certifications", "Certifications"),
+    ("additional_info", "Additional Information"),
+)
+ELLIPSIS = "…"
+MIN_PARTIAL_TOKENS = 24  # don't bother cutting a passage shorter than this
+LONG_LINE_TOKENS = 48  # lines longer than this are ranked sentence by sentence
+SENTENCE_END = re.compile(r"(?<=[.!?;])\s+")
+TERM = re.compile(r"[a-z][a-z0-9+#.]*[a-z0-9+#]|[a-z]")
+STOPWORDS = frozenset("""
+    a an and are as at be been by can for from has have in is it its of on or our that the
+    their this to was we were will with you your who what which candidate experience years
+    work working team role job skills ability strong knowledge using used including
+""".split())
+
+_encoding = None
+_encoding_lock = threading.Lock()
+
+
+def count_tokens(text):
+    """LLM token count of text (tiktoken when available, approximate otherwise)"""
+    global _encoding
+    if _encoding is None:
+        with _encoding_lock:
+            if _encoding is None:
+                try:
+                    import tiktoken
+                    _encoding = tiktoken.get_encoding("o200k_base").encode
+                except Exception:
+                    _encoding = False
+    if _encoding:
+        return len(_encoding(text, disallowed_special=()))
+    return approx_token_count(text)
+
+
+def compress(text):
+    """Collapse runs of spaces and blank lines and strip indentation"""
+    lines = [" ".join(line.split()) for line in str(text).splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def truncate(text, max_tokens):
+    """Longest word prefix of text that fits max_tokens with an ellipsis appended"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    words = text.split(" ")
+    low, high = 0, len(words)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(" ".join(words[:middle]) + " " + ELLIPSIS) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return " ".join(words[:low]) + " " + ELLIPSIS if low else ""
+
+
+def terms(text):
+    return {term for term in TERM.findall(text.lower()) if term not in STOPWORDS}
+
+
+def relevance(text, reference_terms):
+    """Share of text's distinct terms found in the reference, damped for long passages"""
+    own = terms(text)
+    if not own:
+        return 0.0
+    return len(own & reference_terms) / math.sqrt(len(own))
+
+
+def render_value(value):
+    """Parsed resume field as text: strings as is, lists one item per line, dicts as key: value"""
+    if value is None or value == "" or value == []:
+        return ""
+    if isinstance(value, dict):
+        return "; ".join(f"{key}: {render_value(item)}" for key, item in value.items() if item)
+    if isinstance(value, (list, tuple)):
+        if all(isinstance(item, str) for item in value):
+            return ", ".join(value)
+        return "\n".join(f"- {render_value(item)}" for item in value)
+    return str(value)
+
+
+def passages(text):
+    """Distinct lines of text, long lines split further into sentences"""
+    result, seen = [], set()
+    for line in text.split("\n"):
+        parts = SENTENCE_END.split(line) if count_tokens(line) > LONG_LINE_TOKENS else [line]
+        for part in parts:
+            if part and part.lower() not in seen:
+                seen.add(part.lower())
+                result.append(part)
+    return result
+
+
+def fit_chunks(chunks, budget, fallback=None):
+    """JD chunk texts (best first) within budget tokens; returns (text, tokens, trimmed)"""
+    entries = [(f"Chunk {i + 1}:", body) for i, body in enumerate(filter(None, map(compress, chunks)))]
+    if not entries and fallback:
+        entries = [("Full JD Fallback:", compress(fallback))]
+    kept, used, total, full = [], 0, 0, False
+    for label, body in entries:
+        tokens = count_tokens(f"{label}\n{body}") + 1
+        total += tokens
+        if full:
+            continue
+        if used + tokens <= budget:
+            kept.append(f"{label}\n{body}")
+            used += tokens
+            continue
+        # Cut this chunk short and drop the less relevant ones after it
+        full = True
+        room = budget - used - count_tokens(label) - 2
+        if room >= MIN_PARTIAL_TOKENS:
+            kept.append(f"{label}\n{truncate(body, room)}")
+            used += count_tokens(kept[-1]) + 1
+    return "\n\n".join(kept), used, total - used
+
+
+def fit_profile(resume_data, reference_terms, budget):
+    """Candidate profile text within budget tokens; returns (text, tokens, trimmed)"""
+    header = f"Name: {compress(resume_data.get('name') or 'N/A')}"
+    sections = []
+    for order, (field, title) in enumerate(PROFILE_SECTIONS):
+        body = compress(render_value(resume_data.get(field)))
+        if not body and field not in ("skills", "experience", "education"):
+            continue
+        parts = passages(body) or ["N/A"]
+        sections.append({
+            "title": title, "order": order, "body": body or "N/A", "parts": parts,
+            "tokens": [count_tokens(part) + 1 for part in parts],
+            "score": relevance(body, reference_terms),
+        })
+    # Most relevant sections first
+    sections.sort(key=lambda section: (-section["score"], section["order"]))
+
+    def render(kept):
+        blocks = [header]
+        for section in sections:
+            lines, gap = [], False
+            for index, part in enumerate(section["parts"]):
+                if index in kept[section["title"]]:
+                    if gap:
+                        lines.append(ELLIPSIS)
+                    lines.append(kept[section["title"]][index])
+                    gap = False
+                else:
+                    gap = True
+            if gap:
+                lines.append(ELLIPSIS)
+            blocks.append(f"{section['title']}:\n" + "\n".join(lines))
+        return "\n\n".join(blocks)
+
+    whole = "\n\n".join([header] + [f"{section['title']}:\n{section['body']}" for section in sections])
+    tokens = count_tokens(whole)
+    if tokens <= budget:
+        return whole, tokens, 0
+    total = tokens
+    overhead = count_tokens(header) + sum(count_tokens(section["title"]) + 3 for section in sections)
+
+    kept = {section["title"]: {} for section in sections}
+    used = overhead + 2 * len(sections)  # room for ellipsis lines
+    # Opening passage of every section first (in section relevance order), then the
+    # remaining passages by their own overlap with the JD
+    candidates = [(section, 0) for section in sections]
+    rest = [(section, index) for section in sections for index in range(1, len(section["parts"]))]
+    rest.sort(key=lambda item: -relevance(item[0]["parts"][item[1]], reference_terms))
+    for section, index in candidates + rest:
+        tokens = section["tokens"][index]
+        if used + tokens <= budget:
+            kept[section["title"]][index] = section["parts"][index]
+            used += tokens
+        elif index == 0 and budget - used >= MIN_PARTIAL_TOKENS:
+            part = truncate(section["parts"][0], min(budget - used, budget // max(len(sections), 1)))
+            if part:
+                kept[section["title"]][0] = part
+                used += count_tokens(part) + 1
+    text = render(kept)
+    tokens = count_tokens(text)
+    return text, tokens, max(total - tokens, 0)
+
+
+def build_match_prompt(template, resume_data, chunks, fallback=None, budget=None, name="match_analysis"):
+    """
+    Format the match analysis PromptTemplate within a token budget
+
+    Args:
+        template: PromptTemplate with job_chunks and candidate_profile variables
+        resume_data (dict): Parsed resume data
+        chunks (list): JD chunk texts, most relevant first
+        fallback (str): Job description text used when there are no chunks
+        budget (int): Total prompt tokens (default Config.LLM_PROMPT_TOKEN_BUDGET)
+
+    Returns:
+        BudgetedPrompt(text, tokens, budget, trimmed_tokens)
+    """
+    budget = budget or Config.LLM_PROMPT_TOKEN_BUDGET
+    fixed = count_tokens(template.format(job_chunks="", candidate_profile=""))
+    available = max(budget - fixed, 0)
+
+    job_chunks, jd_tokens, jd_trimmed = fit_chunks(chunks, int(available * Config.LLM_PROMPT_JD_SHARE), fallback)
+    # Whatever the JD did not need goes to the profile
+    candidate_profile, _, profile_trimmed = fit_profile(resume_data, terms(job_chunks), available - jd_tokens)
+
+    text = template.format(job_chunks=job_chunks, candidate_profile=candidate_profile)
+    tokens = count_tokens(text)
+    prompt_tokens.observe(tokens, prompt=name)
+    if jd_trimmed + profile_trimmed:
+        trimmed_tokens.inc(jd_trimmed + profile_trimmed, prompt=name)
+    return BudgetedPrompt(text, tokens, budget, jd_trimmed + profile_trimmed)
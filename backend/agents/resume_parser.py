@@ -1,83 +1,87 @@
 
 # agents/resume_parser.py
 
-import os
-import PyPDF2
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_community.vectorstores import Chroma
-from langchain_community.chat_models import ChatOpenAI
-from langchain.chains import RetrievalQA
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_groq import ChatGroq
+import time
+import uuid
+from langchain_core.prompts import PromptTemplate
+from llm_gateway import get_gateway
+from metrics import span, timed
+from vector_store import get_store, active_model
+from agents.chunker import get_chunker, record_chunking
+from agents.document_text import extract_text
 
 
+def get_resume_vectorstore():
+    """Shared handle on the scratch vector store resumes are chunked into while parsing"""
+    return get_store("resumes")
+
+
+# System message for every resume question
+system = "You are an HR assistant that specializes in analyzing resumes."
+
+# "Stuff" question-answering prompt over the retrieved resume text
+qa_prompt = PromptTemplate.from_template(
+    """Use the following pieces of context to answer the question at the end. If you don't know the answer, just say that you don't know, don't try to make up an answer.
+
+{context}
+
+Question: {question}
+Helpful Answer:"""
+)
+
+
+@timed("parse_resume")
 def parse_resume(file_path):
     """
-    Parse resume PDF and extract structured information
+    Parse resume PDF (or DOCX) and extract structured information
     """
     # Extract text from PDF
-    text = extract_text_from_pdf(file_path)
-    
-    # Initialize embedding model
-    embeddings = HuggingFaceEmbeddings(
-        model_name="sentence-transformers/all-mpnet-base-v2"
-    )
-    
-    # Create a temporary document for the resume
-    os.makedirs("temp_db_resume", exist_ok=True)
-    
-    # Store the text in vector db
-    db = Chroma.from_texts(
-        [text], 
-        embeddings, 
-        persist_directory="temp_db_resume"
-    )
-    
-    # Define the prompt template
-    system = "You are an HR assistant that specializes in analyzing resumes."
+    with span("pdf_extract"):
+        text = extract_text(file_path)
+    return parse_resume_text(text)
 
-    human = """
-    Please analyze the following resume and extract key information:
 
-    {resume_text}
-
-    Please provide:
-    1. Skills  
-    2. Work experience (with years)  
-    3. Education  
-    4. Certifications  
-    5. Projects  
-    """
-    
-    prompt = ChatPromptTemplate.from_messages([("system", system), ("human", human)])
-
-    
-    # Initialize the language model (lazy initialization)
-    def get_llm():
-        return ChatGroq(
-            temperature=0.3,
-            groq_api_key=os.getenv("GROQ_API_KEY"),
-            model_name="openai/gpt-oss-20b"
-        )
+def parse_resume_text(text):
+    """Structured information from already extracted resume text"""
+    # Split into sections (Skills, Experience, Education, ...) sized for the embedding model
+    chunker = get_chunker(model_name=active_model("resumes"))
+    with span("chunk"):
+        chunks = chunker.split(text)
+    record_chunking("resume", chunker, chunks)
     
-    # Create a retrieval chain
-    qa = RetrievalQA.from_chain_type(
-        llm=get_llm(),
-        chain_type="stuff",
-        retriever=db.as_retriever(),
-    )
+    # Store the chunks in vector db, tagged so retrieval only sees this resume
+    doc_id = uuid.uuid4().hex
+    db = get_resume_vectorstore()
+    if chunks:
+        with span("chroma_write"):
+            db.add_texts(
+                [chunk.text for chunk in chunks],
+                metadatas=[{"doc_id": doc_id, "section": chunk.section or "", "added_at": int(time.time())}
+                           for chunk in chunks]
+            )
     
     # Query for each aspect of the resume
     skills_query = "What are the skills mentioned in this resume?"
     experience_query = "What is the work experience mentioned in this resume?"
     education_query = "What is the educational background mentioned in this resume?"
     certifications_query = "What certifications are mentioned in this resume?"
+    queries = [skills_query, experience_query, education_query, certifications_query]
     
-    # Get responses
-    skills = qa.run(skills_query)
-    experience = qa.run(experience_query)
-    education = qa.run(education_query)
-    certifications = qa.run(certifications_query)
+    # Retrieve context for each query and ask all questions concurrently
+    retriever = db.as_retriever(search_kwargs={"k": 4, "filter": {"doc_id": doc_id}})
+    prompts = []
+    try:
+        with span("chroma_retrieve"):
+            for query in queries:
+                context = "\n\n".join(doc.page_content for doc in retriever.invoke(query)) if chunks else ""
+                prompts.append(qa_prompt.format(context=context, question=query))
+    finally:
+        # The scratch chunks are only needed for the retrieval above
+        db.delete(where={"doc_id": doc_id})
+    with span("llm"):
+        skills, experience, education, certifications = get_gateway().complete_many(
+            prompts, temperature=0.3, system=system
+        )
     
     # For simplicity, create parsed data structure
     parsed_data = {
@@ -89,14 +93,3 @@ def parse_resume(file_path):
     
     return parsed_data
 
-
-def extract_text_from_pdf(file_path):
-    """
-    Extract text from PDF file
-    """
-    text = ""
-    with open(file_path, 'rb') as file:
-        reader = PyPDF2.PdfReader(file)
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-    return text
\ No newline at end of file
@@ -0,0 +1,224 @@
+# agents/rule_engine.py
+"""
+Rule-based extraction of experience and education, shared by the hybrid
+and local scorers.
+
+All patterns are compiled once at import. Durations are read from explicit
+lengths ("2 years 6 months", "18 mos", "3.5 yrs") or from date ranges
+("Jan 2019 – Present", "03/2017 - 11/2020", "2015 to 2018"), and
+overlapping ranges are merged so parallel jobs are not counted twice.
+Degrees are matched by a single alternation ("M.Sc.", "B.Tech", "Ph.D.",
+"Bachelor's", "MBA", ...) whose matching group gives the level.
+
+score_candidates() scores a list of candidates against one job's
+requirements, which are parsed once for the whole batch.
+"""
+
+import re
+from datetime import date
+from functools import lru_cache
+
+MONTH_NAMES = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_MONTH = (r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+          r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?")
+
+
+def _date(prefix):
+    return (rf"(?:(?P<{prefix}_month>{_MONTH})\s*,?\s*|(?P<{prefix}_num>0?[1-9]|1[0-2])\s*[/.-]\s*)?"
+            rf"(?P<{prefix}_year>(?:19|20)\d{{2}})")
+
+
+DATE_RANGE = re.compile(
+    rf"(?<![\d/]){_date('start')}\s*(?:-|–|—|to|until)\s*"
+    rf"(?:{_date('end')}|(?P<ongoing>present|current(?:ly)?|now|today|date))(?![\d/])",
+    re.IGNORECASE)
+EXPLICIT_DURATION = re.compile(
+    r"(?P<years>\d+(?:\.\d+)?)\s*\+?\s*(?:years?|yrs?)\b"
+    r"(?:\s*,?\s*(?:and\s+)?(?P<extra_months>\d+)\s*(?:months?|mos?)\b)?"
+    r"|(?P<months>\d+)\s*(?:months?|mos?)\b", re.IGNORECASE)
+REQUIRED_YEARS = re.compile(
+    r"(?P<low>\d+(?:\.\d+)?)\s*(?:\+|plus)?\s*(?:(?:-|–|to)\s*\d+(?:\.\d+)?\s*)?(?:years?|yrs?)\b",
+    re.IGNORECASE)
+NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+_B, _E = r"(?<![a-z0-9])", r"(?![a-z0-9])"
+DEGREE_LEVELS = {"high_school": 1, "associate": 2, "bachelor": 3, "master": 4, "doctorate": 5}
+DEGREE_NAMES = {"high_school": "high school", "associate": "associate", "bachelor": "bachelor",
+                "master": "master", "doctorate": "phd"}
+DEGREE = re.compile("|".join(f"(?P<{level}>{_B}(?:{pattern}){_E})" for level, pattern in [
+    ("doctorate", r"ph\.?\s?d\.?|doctor(?:ate|al)?|d\.phil\.?"),
+    ("master", r"master(?:'?s)?|m\.?\s?sc\.?|m\.?\s?tech|m\.?\s?eng|m\.b\.a\.|mba|mca|m\.s\.|m\.a\."
+               r"|m\.?s(?=\s+(?:in|of)\s)"),
+    ("bachelor", r"bachelor(?:'?s)?|b\.?\s?sc\.?|b\.?\s?tech|b\.?\s?eng|b\.e\.|b\.s\.|b\.a\.|bca"
+                 r"|b\.?[sa](?=\s+(?:in|of)\s)|undergraduate"),
+    ("associate", r"associate'?s|associate(?=\s+(?:degree|of|in)\s)|a\.a\.s?\."),
+    ("high_school", r"high\s+school|secondary\s+school|ged"),
+]), re.IGNORECASE)
+
+
+def _month_index(match, prefix):
+    """Months since year 0 of one side of a DATE_RANGE match"""
+    year = int(match.group(f"{prefix}_year"))
+    if match.group(f"{prefix}_month"):
+        month = MONTH_NAMES[match.group(f"{prefix}_month")[:3].lower()]
+    elif match.group(f"{prefix}_num"):
+        month = int(match.group(f"{prefix}_num"))
+    else:
+        # Bare years: "2015 - 2018" spans from the start of one to the start of the other
+        month = 1
+    return year * 12 + month - 1
+
+
+def _month_now(today=None):
+    today = today or date.today()
+    return today.year * 12 + today.month - 1
+
+
+def _ranges(text, now):
+    ranges = []
+    for match in DATE_RANGE.finditer(text):
+        start = _month_index(match, "start")
+        end = min(now if match.group("ongoing") else _month_index(match, "end"), now)
+        if end > start:
+            ranges.append((start, end))
+    return tuple(ranges)
+
+
+def date_ranges(text, today=None):
+    """(start, end) month indices of every date range in text, end exclusive"""
+    return list(_ranges(text or "", _month_now(today)))
+
+
+def explicit_years(text):
+    """Years in an explicit length like "2 years 6 months" or "18 months", else None"""
+    match = EXPLICIT_DURATION.search(text or "")
+    if match is None:
+        return None
+    if match.group("years"):
+        return float(match.group("years")) + int(match.group("extra_months") or 0) / 12
+    return int(match.group("months")) / 12
+
+
+@lru_cache(maxsize=65536)
+def _parse_duration(duration, now):
+    """(explicit years or None, date ranges) of one entry's duration text"""
+    ranges = _ranges(duration, now)
+    return (None if ranges else explicit_years(duration)), ranges
+
+
+def merged_months(ranges):
+    """Months covered by a set of ranges, counting overlaps once"""
+    total, current_start, current_end = 0, None, None
+    for start, end in sorted(ranges):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def experience_years(entries, today=None):
+    """
+    Total years of experience of parsed resume entries. An entry's explicit
+    duration wins; otherwise its date range (from duration, or start/end)
+    is used, merged with the other entries' ranges.
+    """
+    return _experience_years(entries, _month_now(today))
+
+
+def _experience_years(entries, now):
+    years, ranges = 0.0, []
+    for entry in entries or []:
+        if isinstance(entry, str):
+            entry = {"duration": entry}
+        explicit, entry_ranges = _parse_duration(str(entry.get("duration") or ""), now)
+        if explicit is not None:
+            years += explicit
+            continue
+        if not entry_ranges and (entry.get("start") or entry.get("end")):
+            entry_ranges = _parse_duration(f"{entry.get('start', '')} - {entry.get('end', '')}", now)[1]
+        ranges.extend(entry_ranges)
+    return years + merged_months(ranges) / 12
+
+
+def text_experience_years(text, today=None):
+    """Years of experience in raw resume text: merged date ranges, else the largest "N years" mention"""
+    ranges = _ranges(text or "", _month_now(today))
+    if ranges:
+        return merged_months(ranges) / 12
+    mentions = [float(m.group("low")) for m in REQUIRED_YEARS.finditer(text or "")]
+    return max(mentions) if mentions else 0.0
+
+
+@lru_cache(maxsize=1024)
+def required_years(jd_experience):
+    """Years a JD asks for ("5+ years", "3-5 years", "minimum of 2 yrs"); 0 when unspecified"""
+    match = REQUIRED_YEARS.search(jd_experience or "")
+    if match:
+        return float(match.group("low"))
+    number = NUMBER.search(jd_experience or "")
+    return float(number.group()) if number else 0.0
+
+
+@lru_cache(maxsize=65536)
+def degree_level(text):
+    """Highest degree level named in text (0 = none, 5 = doctorate)"""
+    level = 0
+    for match in DEGREE.finditer(text or ""):
+        level = max(level, DEGREE_LEVELS[match.lastgroup])
+    return level
+
+
+def education_level(entries):
+    """Highest degree level of parsed resume education entries"""
+    level = 0
+    for entry in entries or []:
+        degree = entry.get("degree", "") if isinstance(entry, dict) else str(entry)
+        level = max(level, degree_level(degree))
+    return level
+
+
+def degree_name(text):
+    """Canonical name of the highest degree in text ("bachelor", "master", "phd", ...), or None"""
+    best = None
+    for match in DEGREE.finditer(text or ""):
+        if best is None or DEGREE_LEVELS[match.lastgroup] > DEGREE_LEVELS[best]:
+            best = match.lastgroup
+    return DEGREE_NAMES[best] if best else None
+
+
+def experience_score(candidate_years, jd_years):
+    if jd_years == 0:
+        return 50.0  # JD doesn't specify years
+    return 100.0 if candidate_years >= jd_years else candidate_years / jd_years * 100
+
+
+def education_score(candidate_level, jd_level):
+    if jd_level == 0 or candidate_level >= jd_level:
+        return 100.0
+    return candidate_level / jd_level * 100
+
+
+def score_candidates(candidates, jd_experience, jd_education, today=None):
+    """
+    Experience and education scores of many parsed resumes against one job.
+    candidates: dicts with "experience" and "education" lists as produced by
+    the resume parser. Returns [{"experience": score, "education": score}].
+    """
+    now = _month_now(today)
+    jd_years = required_years(jd_experience or "")
+    jd_level = degree_level(jd_education or "")
+    return [
+        {
+            "experience": experience_score(_experience_years(c.get("experience"), now), jd_years),
+            "education": education_score(education_level(c.get("education")), jd_level),
+        }
+        for c in candidates
+    ]
@@ -1,29 +1,36 @@
 # agents/shortlister.py
-import os
-import json
-from langchain_community.vectorstores import Chroma
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain.chains import LLMChain
+import threading
+from contextlib import nullcontext
 from langchain.prompts import PromptTemplate
-from langchain_groq import ChatGroq
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from metrics import span, timed
+from progress import emit, stage
+from agents import rule_engine
+from agents.prompt_budget import build_match_prompt
+from agents.output_parser import complete_structured, OutputParseError, MATCH_ANALYSIS
+from embeddings import get_embeddings
+from vector_store import get_store, active_model
+from vector_index import get_job_index
+from config import Config
 
-# Initialize embeddings
-embeddings = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+def get_job_vectorstore():
+    """Shared handle on the jobs vector store (see vector_store.py)"""
+    return get_store("jobs")
 
-# Initialize LLM (lazy initialization)
-def get_llm():
-    return ChatGroq(
-        groq_api_key=os.getenv("GROQ_API_KEY"),
-        model_name="openai/gpt-oss-20b"
-    )
+def job_embeddings():
+    """Embedding model of the jobs vector store; profiles must be embedded with it too"""
+    return get_embeddings(active_model("jobs"))
 
-# Create text splitter for resume
-text_splitter = RecursiveCharacterTextSplitter(
-    chunk_size=1000,
-    chunk_overlap=200,
-    length_function=len,
-)
+_job_llm_slots = {}  # job id -> BoundedSemaphore
+_job_llm_slots_lock = threading.Lock()
+
+def job_llm_slot(job_id):
+    """Slot for one match analysis LLM call of a job (Config.LLM_MAX_CONCURRENT_PER_JOB at once)"""
+    if job_id is None or not Config.LLM_MAX_CONCURRENT_PER_JOB:
+        return nullcontext()
+    with _job_llm_slots_lock:
+        if job_id not in _job_llm_slots:
+            _job_llm_slots[job_id] = threading.BoundedSemaphore(Config.LLM_MAX_CONCURRENT_PER_JOB)
+        return _job_llm_slots[job_id]
 
 # Create prompt template for match analysis
 template = """
@@ -63,10 +70,6 @@ prompt = PromptTemplate(
     template=template
 )
 
-# Create chain (lazy initialization)
-def get_chain():
-    return LLMChain(llm=get_llm(), prompt=prompt)
-
 def get_skill_match_score(resume_skills, jd_skills):
     """Calculate skill match score between resume and job description"""
     if not resume_skills or not jd_skills:
@@ -89,109 +92,73 @@ def get_skill_match_score(resume_skills, jd_skills):
 
 def get_experience_match_score(resume_exp, jd_exp):
     """Calculate experience match score"""
-    try:
-        # Extract years from resume experience
-        resume_years = 0
-        for exp in resume_exp:
-            duration = exp.get('duration', '').lower()
-            if 'year' in duration:
-                try:
-                    years = float(duration.split()[0])
-                    resume_years += years
-                except:
-                    pass
+    return rule_engine.experience_score(rule_engine.experience_years(resume_exp),
+                                        rule_engine.required_years(str(jd_exp or '')))
+
+def get_education_match_score(resume_edu, jd_edu):
+    """Calculate education match score"""
+    return rule_engine.education_score(rule_engine.education_level(resume_edu),
+                                       rule_engine.degree_level(str(jd_edu or '')))
+
+def similarity_from_hits(hits):
+    """Mean cosine similarity of retrieved chunks, as a 0-100 percentage"""
+    if not hits:
+        return 0.0
+    return float(min(100, max(0, (sum(hit.score for hit in hits) / len(hits)) * 100)))
+
+def build_candidate_profile(resume_data):
+    """Render parsed resume data as the text profile used for retrieval and the LLM"""
+    skills = resume_data.get('skills', [])
+    if isinstance(skills, list):
+        skills = ', '.join(skills)
+    return f"""
+        Candidate Profile:
+        Name: {resume_data.get('name', 'N/A')}
+        Email: {resume_data.get('email', 'N/A')}
+        
+        Skills:
+        {skills}
         
-        # Extract required years from JD
-        jd_years_str = jd_exp.replace('+', '').lower()
-        jd_years = 0
-        for word in jd_years_str.split():
-            try:
-                jd_years = float(word)
-                break
-            except:
-                pass
+        Experience:
+        {resume_data.get('experience', 'N/A')}
         
-        # Calculate score
-        if jd_years == 0:
-            return 50.0  # If JD doesn't specify years
+        Education:
+        {resume_data.get('education', 'N/A')}
         
-        if resume_years >= jd_years:
-            return 100.0
-        else:
-            return (resume_years / jd_years) * 100
-    except:
-        return 50.0  # Default to 50% if parsing fails
+        Additional Information:
+        {resume_data.get('additional_info', 'N/A')}
+        """
 
-def get_education_match_score(resume_edu, jd_edu):
-    """Calculate education match score"""
-    education_levels = {
-        'high school': 1,
-        'associate': 2,
-        'bachelor': 3,
-        'master': 4,
-        'phd': 5,
-        'doctorate': 5
-    }
-    
-    # Get highest education level from resume
-    resume_level = 0
-    for edu in resume_edu:
-        degree = edu.get('degree', '').lower()
-        for level_name, level_value in education_levels.items():
-            if level_name in degree:
-                resume_level = max(resume_level, level_value)
-    
-    # Get required education level from JD
-    jd_level = 0
-    jd_edu_lower = jd_edu.lower()
-    for level_name, level_value in education_levels.items():
-        if level_name in jd_edu_lower:
-            jd_level = max(jd_level, level_value)
-    
-    # Calculate score
-    if jd_level == 0 or resume_level >= jd_level:
-        return 100.0
-    else:
-        return (resume_level / jd_level) * 100
+def combine_hybrid_score(semantic_score, llm_score):
+    """Blend embedding similarity and the LLM's score with Config.HYBRID_SEMANTIC_WEIGHT"""
+    if llm_score is None:
+        # No usable LLM answer: the semantic score alone
+        return semantic_score
+    return semantic_score * Config.HYBRID_SEMANTIC_WEIGHT + llm_score * (1 - Config.HYBRID_SEMANTIC_WEIGHT)
 
-def get_semantic_similarity(resume_text, job_id):
+def embed_candidate_profile(candidate_profile):
+    """Embed a candidate profile once so it can be reused across several jobs"""
+    with span("embed"):
+        return job_embeddings().embed_query(candidate_profile)
+
+@timed("semantic_similarity")
+def get_semantic_similarity(resume_text, job_id=None, resume_vec=None):
     """
     Calculate semantic similarity using RAG pipeline:
-    1. Convert resume to embedding
-    2. Retrieve relevant job chunks
+    1. Convert resume to embedding (skipped when resume_vec is supplied)
+    2. Retrieve relevant job chunks (restricted to job_id when given)
     3. Calculate similarity
     """
     try:
-        # Load the vector store
-        vectorstore = Chroma(
-            persist_directory="db/vector_store/jobs",
-            embedding_function=embeddings
-        )
-        
-        # Retrieve relevant chunks
-        relevant_chunks = vectorstore.similarity_search(
-            resume_text,
-            k=3
-        )
-        
-        # Calculate similarity scores safely
-        similarities = []
-        resume_vec = embeddings.embed_query(resume_text)
-        for chunk in relevant_chunks:
-            chunk_vec = embeddings.embed_query(chunk.page_content)
-            # Cosine similarity
-            dot = sum(a*b for a, b in zip(resume_vec, chunk_vec))
-            norm_a = sum(a*a for a in resume_vec) ** 0.5
-            norm_b = sum(b*b for b in chunk_vec) ** 0.5
-            if norm_a == 0 or norm_b == 0:
-                continue
-            similarities.append(dot / (norm_a * norm_b))
+        if resume_vec is None:
+            resume_vec = embed_candidate_profile(resume_text)
 
-        if not similarities:
-            return 0.0
+        # Retrieve relevant chunks; hits carry their stored vectors and cosine similarity
+        with span("vector_retrieve"):
+            relevant_chunks = get_job_index().search(resume_vec, k=3, job_id=job_id)
 
         # Return average similarity as percentage
-        return float(min(100, max(0, (sum(similarities) / len(similarities)) * 100)))
+        return similarity_from_hits(relevant_chunks)
         
     except Exception as e:
         print(f"Error in get_semantic_similarity: {str(e)}")
@@ -240,11 +207,7 @@ def generate_matching_analysis(resume_data, jd_data, match_score):
         jd_exp = jd_data.get('experience_required', '')
         
         if resume_exp:
-            total_years = sum(
-                float(exp.get('duration', '0').split()[0])
-                for exp in resume_exp
-                if 'year' in exp.get('duration', '').lower()
-            )
+            total_years = rule_engine.experience_years(resume_exp)
             strengths.append(f"Has {total_years:.1f} years of relevant experience")
             
         # Generate the analysis text
@@ -275,107 +238,85 @@ def generate_matching_analysis(resume_data, jd_data, match_score):
         print(f"Error generating matching analysis: {str(e)}")
         return "Unable to generate detailed analysis."
 
-def evaluate_match(resume_data, job_description):
+@timed("evaluate_match")
+def evaluate_match(resume_data, job_description, job_id=None, profile_vec=None):
     """
     Evaluate match using comprehensive RAG pipeline:
     1. Create structured candidate profile
     2. Retrieve relevant job description chunks
-    3. Augment profile with job context
+    3. Fit the chunks and profile into the prompt token budget
     4. Generate detailed analysis
+
+    Args:
+        resume_data (dict): Parsed resume data
+        job_description (str): Job description text used when retrieval finds nothing
+        job_id (int): Restricts retrieval to this job's chunks when given
+        profile_vec (list): Precomputed embedding of the candidate profile
     """
+    semantic_score = None
     try:
         # Create comprehensive candidate profile
-        candidate_profile = f"""
-        Candidate Profile:
-        Name: {resume_data.get('name', 'N/A')}
-        Email: {resume_data.get('email', 'N/A')}
-        
-        Skills:
-        {', '.join(resume_data.get('skills', []))}
-        
-        Experience:
-        {resume_data.get('experience', 'N/A')}
-        
-        Education:
-        {resume_data.get('education', 'N/A')}
-        
-        Additional Information:
-        {resume_data.get('additional_info', 'N/A')}
-        """
+        candidate_profile = build_candidate_profile(resume_data)
+        if profile_vec is None:
+            profile_vec = embed_candidate_profile(candidate_profile)
         
-        # Get semantic similarity score (with fallback if retrieval yields nothing)
-        semantic_score = get_semantic_similarity(candidate_profile, job_description)
+        # Retrieve the most relevant job chunks once, for both the semantic score and the prompt
+        with span("vector_retrieve"):
+            job_chunks = get_job_index().search(profile_vec, k=3, job_id=job_id)
+        semantic_score = similarity_from_hits(job_chunks)
+        emit("partial", semantic_score=round(semantic_score, 2))
         
-        # Load vector store and retrieve relevant job chunks
-        vectorstore = Chroma(
-            persist_directory="db/vector_store/jobs",
-            embedding_function=embeddings
-        )
+        # Fit the chunks and profile into the prompt budget (raw job description if retrieval returns nothing)
+        with span("prompt_assembly"):
+            match_prompt = build_match_prompt(prompt, resume_data, [chunk.text for chunk in job_chunks],
+                                              fallback=job_description)
         
-        # Retrieve most relevant chunks
-        job_chunks = vectorstore.similarity_search(candidate_profile, k=3)
-        
-        # Format retrieved chunks
-        if job_chunks:
-            formatted_chunks = "\n\n".join([
-                f"Chunk {i+1}:\n{chunk.page_content}"
-                for i, chunk in enumerate(job_chunks)
-            ])
-        else:
-            # Fallback: use raw job description if retrieval returns nothing
-            formatted_chunks = f"Full JD Fallback:\n{job_description}"
-        
-        # Generate detailed analysis using LLM
-        result = get_chain().invoke({
-            "job_chunks": formatted_chunks,
-            "candidate_profile": candidate_profile
-        })
-        # Normalize LLM output to text
-        if hasattr(result, 'content'):
-            llm_text = result.content
-        elif isinstance(result, dict) and 'text' in result:
-            llm_text = result['text']
-        elif isinstance(result, str):
-            llm_text = result
-        else:
-            llm_text = str(result)
-
+        # Generate detailed analysis using LLM (rate limited and retried by the gateway)
+        stage("analyzing", scoring_mode="hybrid", prompt_tokens=match_prompt.tokens)
         try:
-            analysis = json.loads(llm_text)
-            # Combine semantic score with LLM analysis
-            llm_match = float(analysis.get('match_score', 0))
-            final_score = (semantic_score * 0.7 + llm_match * 0.3)
-            
-            return {
-                "match_score": round(final_score, 2),
-                "analysis": {
-                    "strengths": analysis.get('strengths', []),
-                    "gaps": analysis.get('gaps', []),
-                    "detailed_analysis": analysis.get('detailed_analysis', ''),
-                    "recommendation": analysis.get('recommendation', '')
-                },
-                "semantic_score": round(semantic_score, 2),
-                "llm_score": analysis.get('match_score', 0)
-            }
-        except json.JSONDecodeError:
+            # Validated against MATCH_ANALYSIS, repaired locally or re-asked once when malformed.
+            # One job's applicants (a bulk fan-out, a rescoring run) can't take every gateway slot.
+            with job_llm_slot(job_id), span("llm"):
+                analysis = complete_structured(match_prompt.text, MATCH_ANALYSIS,
+                                               max_tokens=Config.LLM_MATCH_MAX_TOKENS or None)
+        except OutputParseError as e:
+            # Scored on similarity alone; a rescoring run with include_llm fills in the missing LLM score
             return {
                 "match_score": round(semantic_score, 2),
                 "analysis": {
-                    "detailed_analysis": llm_text,
-                    "error": "Failed to parse LLM response as JSON"
+                    "detailed_analysis": e.raw,
+                    "error": f"Failed to parse LLM response as JSON: {e}"
                 },
                 "semantic_score": round(semantic_score, 2),
-                "llm_score": 0
+                "llm_score": None
             }
+
+        # Combine semantic score with LLM analysis
+        llm_match = analysis['match_score']
+        final_score = combine_hybrid_score(semantic_score, llm_match)
+        
+        return {
+            "match_score": round(final_score, 2),
+            "analysis": {
+                "strengths": analysis['strengths'],
+                "gaps": analysis['gaps'],
+                "detailed_analysis": analysis['detailed_analysis'],
+                "recommendation": analysis['recommendation']
+            },
+            "semantic_score": round(semantic_score, 2),
+            "llm_score": llm_match
+        }
             
     except Exception as e:
+        # Gateway timeouts, exhausted retries...: keep the similarity if it was computed, no LLM score
         print(f"Error in evaluate_match: {str(e)}")
+        semantic_score = semantic_score or 0.0
         return {
-            "match_score": 0.0,
+            "match_score": round(combine_hybrid_score(semantic_score, None), 2),
             "analysis": {
                 "error": str(e),
                 "detailed_analysis": "Error in match evaluation"
             },
-            "semantic_score": 0.0,
-            "llm_score": 0
+            "semantic_score": round(semantic_score, 2),
+            "llm_score": None
         }
\ No newline at end of file
@@ -0,0 +1,197 @@
+# analysis_cache.py
+"""
+Approximate-match cache of LLM match scores, per job.
+
+Template, cohort and lightly edited resubmitted resumes produce candidate
+profiles whose embeddings are almost identical. Before a hybrid match is
+sent to the LLM, the profile is compared with the profiles already analysed
+for the same job description (same jd_hash, same embedding model). When the
+closest one is within Config.MATCH_CACHE_MAX_DISTANCE (cosine distance),
+only its LLM score is reused. The LLM's prose describes the other
+applicant (employers, projects), so the analysis is rebuilt for this
+profile: strengths and gaps from the rule-based skill, experience and
+education checks against the job's summary, and a generic note. The
+semantic score is still computed for the new profile and the hybrid score
+recombined, and the analysis is flagged with `reused` (similarity and
+cache entry).
+
+Every lookup observes the best similarity found, so hit rates and the
+effect of moving the threshold show on /metrics; per-job entries and hits
+are at GET /api/admin/match-cache.
+"""
+
+import json
+import numpy as np
+from config import Config
+from metrics import registry, span
+from progress import emit, stage
+from embeddings import vector_to_blob, blob_to_vector
+from vector_store import active_model
+from vector_index import normalized
+from agents import rule_engine
+from agents.shortlister import evaluate_match, get_semantic_similarity, combine_hybrid_score
+from rescoring import connect, jd_fingerprint
+
+lookups_total = registry.counter(
+    "match_cache_lookups_total", "Match analysis cache lookups by outcome (hit, miss)")
+best_similarity = registry.histogram(
+    "match_cache_best_similarity", "Cosine similarity of the closest cached profile on each lookup",
+    buckets=(0.5, 0.8, 0.9, 0.95, 0.97, 0.98, 0.99, 0.995, 0.999, 1.0))
+
+
+def find_similar(db, job, profile_vec):
+    """(entry, similarity) of the closest cached profile for this job, or (None, None)"""
+    rows = db.execute('''
+        SELECT id, profile_embedding, llm_score FROM match_analysis_cache
+        WHERE job_id = ? AND jd_hash = ? AND embedding_model = ?
+    ''', [job['id'], jd_fingerprint(job), active_model("jobs")]).fetchall()
+    if not rows:
+        return None, None
+    matrix = normalized([blob_to_vector(row['profile_embedding']) for row in rows])
+    similarities = matrix @ normalized(profile_vec)
+    best = int(np.argmax(similarities))
+    # float32 rounding can put an identical profile just above 1
+    return rows[best], min(float(similarities[best]), 1.0)
+
+
+def _entries(value):
+    """Parsed resume field as a list of entries: parse_resume often returns prose"""
+    if not value:
+        return []
+    return [value] if isinstance(value, (str, dict)) else list(value)
+
+
+def _skills(resume_data):
+    skills = resume_data.get('skills') or []
+    if isinstance(skills, str):
+        skills = skills.split(',')
+    return [str(skill).lower().strip() for skill in skills if str(skill).strip()]
+
+
+def profile_analysis(resume_data, jd_data, match_score):
+    """
+    Analysis of this candidate for a reused LLM score: strengths and gaps
+    from the rule-based checks against the JD summary, nothing taken from
+    the cached applicant's analysis
+    """
+    strengths, gaps = [], []
+    resume_skills = _skills(resume_data)
+    for kind in ('required', 'preferred'):
+        jd_skills = [str(skill) for skill in jd_data.get(f'{kind}_skills') or []]
+        matched = [skill for skill in jd_skills if any(skill.lower() in own for own in resume_skills)]
+        if matched:
+            strengths.append({"category": "skills", "description": f"Has {kind} skills: {', '.join(matched)}",
+                              "relevance": f"{len(matched)} of {len(jd_skills)} {kind} skills"})
+        missing = [skill for skill in jd_skills if skill not in matched]
+        if missing and kind == 'required':
+            gaps.append({"category": "skills", "description": f"Missing required skills: {', '.join(missing)}",
+                         "importance": "required by the job"})
+
+    years = rule_engine.experience_years(_entries(resume_data.get('experience')))
+    required_years = rule_engine.required_years(str(jd_data.get('experience_required') or ''))
+    if required_years and years < required_years:
+        gaps.append({"category": "experience", "description": f"{years:.1f} years of experience",
+                     "importance": f"the job asks for {required_years:g}+ years"})
+    elif years:
+        strengths.append({"category": "experience", "description": f"{years:.1f} years of experience",
+                          "relevance": f"the job asks for {required_years:g}+ years" if required_years
+                          else "no minimum stated"})
+
+    level = rule_engine.education_level(_entries(resume_data.get('education')))
+    required_level = rule_engine.degree_level(str(jd_data.get('education') or ''))
+    if required_level and level < required_level:
+        gaps.append({"category": "education", "description": "Degree below the level the job asks for",
+                     "importance": str(jd_data.get('education'))})
+    elif level and required_level:
+        strengths.append({"category": "education", "description": "Degree meets the job's requirement",
+                          "relevance": str(jd_data.get('education'))})
+
+    if match_score >= 80:
+        recommendation = "Strong match. Consider shortlisting."
+    elif match_score >= 60:
+        recommendation = "Moderate match. Review in detail."
+    else:
+        recommendation = "Low match. May not be suitable."
+    return {
+        "strengths": strengths,
+        "gaps": gaps,
+        "detailed_analysis": "The LLM score was reused from a near-identical profile analysed for this job; "
+                             "strengths and gaps come from the rule-based checks of this candidate's resume.",
+        "recommendation": recommendation,
+    }
+
+
+def store(db, job, profile_vec, match_result):
+    """Cache the LLM score of a fresh analysis and trim the job's entries (commits)"""
+    jd_hash = jd_fingerprint(job)
+    # Entries for an older version of the job description can never match again
+    db.execute('DELETE FROM match_analysis_cache WHERE job_id = ? AND jd_hash != ?', [job['id'], jd_hash])
+    db.execute('''
+        INSERT INTO match_analysis_cache (job_id, jd_hash, embedding_model, profile_embedding, llm_score)
+        VALUES (?, ?, ?, ?, ?)
+    ''', [job['id'], jd_hash, active_model("jobs"), vector_to_blob(profile_vec), float(match_result['llm_score'])])
+    db.execute('''
+        DELETE FROM match_analysis_cache WHERE job_id = ? AND id NOT IN (
+            SELECT id FROM match_analysis_cache WHERE job_id = ?
+            ORDER BY COALESCE(last_hit_at, created_at) DESC, id DESC LIMIT ?
+        )
+    ''', [job['id'], job['id'], Config.MATCH_CACHE_MAX_ENTRIES_PER_JOB])
+    db.commit()
+
+
+def evaluate_match_cached(job, resume_data, job_description, profile_vec, db_path=None):
+    """
+    evaluate_match for a hybrid job, reusing the LLM score of a
+    near-identical profile already analysed for the same description
+    """
+    if not Config.MATCH_CACHE_ENABLED:
+        return evaluate_match(resume_data, job_description, job_id=job['id'], profile_vec=profile_vec)
+
+    db = connect(db_path)
+    try:
+        with span("match_cache_lookup"):
+            entry, similarity = find_similar(db, job, profile_vec)
+        if similarity is not None:
+            best_similarity.observe(similarity)
+        if entry is not None and 1 - similarity <= Config.MATCH_CACHE_MAX_DISTANCE:
+            lookups_total.inc(outcome="hit")
+            db.execute("UPDATE match_analysis_cache SET hits = hits + 1, last_hit_at = datetime('now') WHERE id = ?",
+                       [entry['id']])
+            db.commit()
+            semantic_score = get_semantic_similarity(None, job['id'], resume_vec=profile_vec)
+            emit("partial", semantic_score=round(semantic_score, 2))
+            stage("analyzing", scoring_mode="hybrid", reused=True)
+            match_score = combine_hybrid_score(semantic_score, entry['llm_score'])
+            analysis = profile_analysis(resume_data, json.loads(job['summarized_data'] or '{}'), match_score)
+            analysis['reused'] = {"similarity": round(similarity, 4), "cache_entry": entry['id']}
+            return {
+                "match_score": round(match_score, 2),
+                "analysis": analysis,
+                "semantic_score": round(semantic_score, 2),
+                "llm_score": entry['llm_score']
+            }
+
+        lookups_total.inc(outcome="miss")
+        match_result = evaluate_match(resume_data, job_description, job_id=job['id'], profile_vec=profile_vec)
+        # Only reuse analyses the LLM actually produced
+        if 'error' not in match_result['analysis']:
+            try:
+                store(db, job, profile_vec, match_result)
+            except Exception as e:
+                print(f"Error caching match analysis for job {job['id']}: {e}")
+        return match_result
+    finally:
+        db.close()
+
+
+def job_stats(db):
+    """Cached entries, reuse count and threshold per job, for the admin view"""
+    rows = db.execute('''
+        SELECT job_id, COUNT(*) AS entries, SUM(hits) AS hits, MAX(last_hit_at) AS last_hit_at
+        FROM match_analysis_cache GROUP BY job_id ORDER BY job_id
+    ''').fetchall()
+    return {
+        "enabled": Config.MATCH_CACHE_ENABLED,
+        "max_distance": Config.MATCH_CACHE_MAX_DISTANCE,
+        "jobs": [dict(row) for row in rows],
+    }
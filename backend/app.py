@@ -1,31 +1,63 @@
 # File: app.py (Flask Backend)
-from flask import Flask, request, jsonify, g, send_from_directory
+from flask import Flask, Request, request, jsonify, g, send_from_directory, Response, stream_with_context
 from flask_cors import CORS
 import sqlite3
 import os
 import json
+import sys
 import hashlib
+import zipfile
 import uuid
+import contextvars
 from datetime import datetime
 import jwt
 from werkzeug.utils import secure_filename
+from werkzeug.exceptions import RequestEntityTooLarge
 from functools import wraps
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import truststore
-from langchain_community.vectorstores import Chroma
-from langchain_community.embeddings import HuggingFaceEmbeddings
 
 truststore.inject_into_ssl()
 
 # Import agents
 from agents.jd_summarizer import summarize_jd
-from agents.resume_parser import parse_resume
-from agents.shortlister import evaluate_match
+from agents.resume_parser import parse_resume, extract_text
+from agents.shortlister import build_candidate_profile, embed_candidate_profile
+from agents.shortlister import get_job_vectorstore
+from agents.local_scorer import evaluate_match_local
+from embeddings import vector_to_blob, blob_to_vector
+import vector_store
+from vector_index import get_job_index
+from vector_store import STORES, active_model, describe, migrate_in_background
+import rescoring
+import job_import
+import resume_ingest
+import recommender
+import http_cache
+import analysis_cache
+import admission
+import progress
+from progress import stage
+from admission import admission_controlled
+from analysis_cache import evaluate_match_cached
+import metrics
+from metrics import span
+
+class AppRequest(Request):
+    @property
+    def max_content_length(self):
+        # MAX_CONTENT_LENGTH is sized for a resume; job catalogs are much larger
+        if self.endpoint == 'create_job_import':
+            return app.config['JOB_IMPORT_MAX_BYTES']
+        return super().max_content_length
 
 app = Flask(__name__)
+app.request_class = AppRequest
 CORS(app)
 from config import get_config
 config = get_config()
 config.init_app(app)
+metrics.init_app(app)
 
 # Validate GROQ API key is set
 try:
@@ -37,18 +69,40 @@ except ValueError as e:
     sys.exit(1)
 
 # Ensure upload directories exist
-os.makedirs(app.config['UPLOAD_FOLDER'] + 'resumes/', exist_ok=True)
-os.makedirs(app.config['UPLOAD_FOLDER'] + 'jds/', exist_ok=True)
+os.makedirs(os.path.join(app.config['UPLOAD_FOLDER'], 'resumes'), exist_ok=True)
+os.makedirs(os.path.join(app.config['UPLOAD_FOLDER'], 'jds'), exist_ok=True)
 os.makedirs('db/', exist_ok=True)
 
 # Set database path
 app.config['DATABASE'] = app.config['DATABASE_PATH']
 
+# Database connection with per-statement timing spans
+class TimedCursor(sqlite3.Cursor):
+    def execute(self, *args, **kwargs):
+        with span("db_execute"):
+            return super().execute(*args, **kwargs)
+
+class TimedConnection(sqlite3.Connection):
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, *args, **kwargs):
+        with span("db_execute"):
+            return super().execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        with span("db_execute"):
+            return super().executemany(*args, **kwargs)
+
+    def commit(self):
+        with span("db_commit"):
+            return super().commit()
+
 # Database connection helper
 def get_db():
     db = getattr(g, '_database', None)
     if db is None:
-        db = g._database = sqlite3.connect(app.config['DATABASE'])
+        db = g._database = sqlite3.connect(app.config['DATABASE'], factory=TimedConnection)
         db.row_factory = sqlite3.Row
     return db
 
@@ -66,6 +120,80 @@ def init_db():
             db.cursor().executescript(f.read())
         db.commit()
 
+def ensure_column(db, table, column, definition):
+    """Add a column to an existing table if it is missing (lightweight migration)"""
+    columns = {row[1] for row in db.execute(f"PRAGMA table_info({table})")}
+    if column not in columns:
+        db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        return True
+    return False
+
+# Bring databases created from an older schema.sql up to date
+def migrate_db():
+    with app.app_context():
+        db = get_db()
+        ensure_column(db, 'applications', 'match_analysis', 'TEXT')
+        ensure_column(db, 'jobs', 'scoring_mode', "TEXT CHECK(scoring_mode IN ('hybrid', 'local'))")
+        ensure_column(db, 'jobs', 'version', 'INTEGER NOT NULL DEFAULT 1')
+        ensure_column(db, 'resumes', 'content_hash', 'TEXT')
+        ensure_column(db, 'resumes', 'profile_embedding', 'BLOB')
+        ensure_column(db, 'resumes', 'embedding_model', 'TEXT')
+        db.execute('CREATE INDEX IF NOT EXISTS idx_resumes_content_hash ON resumes(content_hash)')
+        if ensure_column(db, 'resumes', 'stored_filename', 'TEXT'):
+            rows = db.execute('SELECT id, file_path FROM resumes').fetchall()
+            db.executemany('UPDATE resumes SET stored_filename = ? WHERE id = ?',
+                           [(os.path.basename(row['file_path']), row['id']) for row in rows])
+        db.execute('CREATE INDEX IF NOT EXISTS idx_resumes_stored_filename ON resumes(stored_filename)')
+        ensure_column(db, 'applications', 'semantic_score', 'FLOAT')
+        ensure_column(db, 'applications', 'llm_score', 'FLOAT')
+        ensure_column(db, 'applications', 'jd_hash', 'TEXT')
+        ensure_column(db, 'applications', 'weights_hash', 'TEXT')
+        if 'analysis' in {row[1] for row in db.execute("PRAGMA table_info(match_analysis_cache)")}:
+            # Held other applicants' full LLM analyses; only a cache, recreated below without them
+            db.execute('DROP TABLE match_analysis_cache')
+        has_rankings = db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'job_rankings'").fetchone()
+        # Create any tables and indexes added to schema.sql since the database was made
+        with app.open_resource('schema.sql', mode='r') as f:
+            db.executescript(f.read())
+        if not has_rankings:
+            rebuild_rankings(db)
+        db.commit()
+
+# Ranked application views are served from job_rankings, a denormalized copy of
+# applications joined with users, resumes and jobs. Its (job_id, match_score,
+# application_date) indexes give top-N and per-status views without a join or sort.
+RANKING_SOURCE = '''
+    SELECT a.id, a.job_id, a.applicant_id, a.resume_id, a.match_score, a.match_analysis,
+           a.status, a.application_date, u.username, u.email, r.file_path, j.title
+    FROM applications a
+    JOIN users u ON a.applicant_id = u.id
+    LEFT JOIN resumes r ON a.resume_id = r.id
+    JOIN jobs j ON a.job_id = j.id
+'''
+RANKING_INSERT = '''
+    INSERT OR REPLACE INTO job_rankings (
+        application_id, job_id, applicant_id, resume_id, match_score, match_analysis,
+        status, application_date, username, email, resume_path, job_title
+    )
+'''
+
+def sync_ranking(db, application_id):
+    """Refresh one application's row in job_rankings (caller commits)"""
+    db.execute(RANKING_INSERT + RANKING_SOURCE + ' WHERE a.id = ?', [application_id])
+
+def rebuild_rankings(db):
+    """Repopulate job_rankings from applications (caller commits)"""
+    db.execute('DELETE FROM job_rankings')
+    db.execute(RANKING_INSERT + RANKING_SOURCE)
+
+def ranking_page_args():
+    """Optional ?status=, ?limit= and ?offset= filters for ranked views"""
+    status = request.args.get('status')
+    limit = request.args.get('limit', default=-1, type=int)
+    offset = request.args.get('offset', default=0, type=int)
+    return status, limit, max(offset, 0)
+
 # JWT token verification
 def token_required(f):
     @wraps(f)
@@ -174,7 +302,9 @@ def login():
 @app.route('/api/jobs', methods=['GET'])
 def get_jobs():
     try:
-        jobs = query_db('''
+        # Any insert or change to a job moves this key (versions only grow)
+        version = get_db().execute('SELECT COUNT(*), COALESCE(SUM(version), 0), COALESCE(MAX(id), 0) FROM jobs').fetchone()
+        return http_cache.cached_json('jobs', tuple(version), lambda: query_db('''
             SELECT 
                 id,
                 title,
@@ -184,151 +314,444 @@ def get_jobs():
             FROM jobs 
             WHERE status = "open" 
             ORDER BY posting_date DESC
-        ''')
-        return jsonify(jobs)
+        '''))
     except Exception as e:
         print(f"Error in get_jobs: {str(e)}")
         return jsonify({'message': f'Error fetching jobs: {str(e)}'}), 500
 
+@app.route('/api/jobs/recommendations', methods=['GET'])
+@token_required
+def recommend_jobs(current_user):
+    """Open jobs closest to the caller's resume (latest, or ?resume_id=), best first"""
+    try:
+        k = min(max(request.args.get('k', config.RECOMMENDATION_DEFAULT_K, type=int), 1),
+                config.RECOMMENDATION_MAX_K)
+        resume_id = request.args.get('resume_id', type=int)
+        # Read directly: query_db would decode the embedding BLOB
+        db = get_db()
+        if resume_id:
+            resume = db.execute('SELECT * FROM resumes WHERE id = ? AND applicant_id = ?',
+                                [resume_id, current_user['id']]).fetchone()
+        else:
+            resume = db.execute('SELECT * FROM resumes WHERE applicant_id = ? ORDER BY id DESC LIMIT 1',
+                                [current_user['id']]).fetchone()
+        if not resume:
+            return jsonify({'message': 'Upload a resume to get job recommendations'}), 404
+        if not resume['parsed_data']:
+            return jsonify({'message': 'Resume has not been parsed yet'}), 409
+
+        if resume['profile_embedding'] and resume['embedding_model'] == active_model('jobs'):
+            profile_vec = blob_to_vector(resume['profile_embedding'])
+        else:
+            # Embedded with an older model (or never): embed once and keep it
+            profile_vec = embed_candidate_profile(build_candidate_profile(json.loads(resume['parsed_data'])))
+            db.execute('UPDATE resumes SET profile_embedding = ?, embedding_model = ? WHERE id = ?',
+                       [vector_to_blob(profile_vec), active_model('jobs'), resume['id']])
+            db.commit()
+
+        # Jobs already applied to are left out unless ?include_applied=true
+        exclude = set()
+        if request.args.get('include_applied', 'false').lower() != 'true':
+            exclude = {row['job_id'] for row in db.execute(
+                'SELECT job_id FROM applications WHERE applicant_id = ?', [current_user['id']])}
+        scored = recommender.recommend(db, profile_vec, k=k, exclude=exclude)
+
+        titles = {}
+        if scored:
+            rows = query_db('SELECT id, title, datetime(posting_date) as posting_date FROM jobs WHERE id IN (%s)'
+                            % ', '.join('?' * len(scored)), [job_id for job_id, _ in scored])
+            titles = {row['id']: row for row in rows}
+        return jsonify({
+            'resume_id': resume['id'],
+            'recommendations': [
+                {'job_id': job_id, 'title': titles[job_id]['title'],
+                 'posting_date': titles[job_id]['posting_date'], 'score': score}
+                for job_id, score in scored if job_id in titles
+            ]
+        })
+    except Exception as e:
+        print(f"Error in recommend_jobs: {str(e)}")
+        return jsonify({'message': f'Error recommending jobs: {str(e)}'}), 500
+
 @app.route('/api/jobs', methods=['POST'])
 @token_required
 @admin_required
+@admission_controlled('job_write')
 def add_job(current_user):
     data = request.get_json()
+    scoring_mode = data.get('scoring_mode')
+    if scoring_mode is not None and scoring_mode not in config.SCORING_MODES:
+        return jsonify({'message': f'scoring_mode must be one of {", ".join(config.SCORING_MODES)}'}), 400
     
     # Insert new job
     db = get_db()
     cursor = db.cursor()
-    cursor.execute('INSERT INTO jobs (title, description) VALUES (?, ?)', 
-                  [data['title'], data['description']])
+    cursor.execute('INSERT INTO jobs (title, description, scoring_mode) VALUES (?, ?, ?)', 
+                  [data['title'], data['description'], scoring_mode])
     job_id = cursor.lastrowid
     db.commit()
     
     # Process job description with RAG
     job_data = query_db('SELECT * FROM jobs WHERE id = ?', [job_id], one=True)
-    summarized_jd = summarize_jd(job_data['description'])
+    summarized_jd = summarize_jd(job_data['description'], job_id)
     
     # Store the summarized JD (optional - could also store in vector DB)
     db.execute('UPDATE jobs SET summarized_data = ? WHERE id = ?', 
               [json.dumps(summarized_jd), job_id])
     db.commit()
+    recommender.refresh_jobs(db, [job_id])
+    http_cache.invalidate(('jobs',))
     
     return jsonify({'message': 'Job added successfully!', 'job_id': job_id}), 201
 
 # Resume and application routes
+def save_upload_streaming(file, directory, max_size):
+    """
+    Copy an uploaded file to a temporary file in directory chunk by chunk,
+    hashing as it goes. Raises RequestEntityTooLarge as soon as more than
+    max_size bytes have been read. Returns (temp path, SHA-256 hex digest).
+    """
+    tmp_path = os.path.join(directory, f".upload-{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with span("upload_stream"), open(tmp_path, 'wb') as out:
+            while True:
+                chunk = file.stream.read(app.config['UPLOAD_CHUNK_SIZE'])
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise RequestEntityTooLarge()
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return tmp_path, digest.hexdigest()
+
 @app.route('/api/resumes', methods=['POST'])
 @token_required
+@admission_controlled('resume_upload')
 def upload_resume(current_user):
+    too_large = {'message': f"File too large (max {app.config['MAX_FILE_SIZE'] // (1024 * 1024)}MB)"}
+    # Reject oversize uploads from the declared length, before reading the body
+    if request.content_length is not None and request.content_length > app.config['MAX_CONTENT_LENGTH']:
+        return jsonify(too_large), 413
+
     # Check if resume file is included
-    if 'resume' not in request.files:
-        return jsonify({'message': 'No resume file!'}), 400
-    
+    try:
+        if 'resume' not in request.files:
+            return jsonify({'message': 'No resume file!'}), 400
+    except RequestEntityTooLarge:
+        return jsonify(too_large), 413
+
     file = request.files['resume']
     if file.filename == '':
         return jsonify({'message': 'No selected file!'}), 400
-    
-    # Save resume file
-    filename = secure_filename(f"{uuid.uuid4()}_{file.filename}")
-    filepath = os.path.join(app.config['UPLOAD_FOLDER'], 'resumes', filename)
-    file.save(filepath)
-    
-    # Parse resume with LLM
-    parsed_data = parse_resume(filepath)
-    
-    # Save resume to database
+    ext = os.path.splitext(secure_filename(file.filename))[1].lower()
+    if ext not in app.config['ALLOWED_EXTENSIONS']:
+        return jsonify({'message': 'Unsupported file type!'}), 400
+
+    # Stream resume file to disk while hashing it
+    resume_dir = os.path.join(app.config['UPLOAD_FOLDER'], 'resumes')
+    try:
+        tmp_path, content_hash = save_upload_streaming(file, resume_dir, app.config['MAX_FILE_SIZE'])
+    except RequestEntityTooLarge:
+        return jsonify(too_large), 413
+
     db = get_db()
+    # Re-uploading a file the applicant already has returns the existing resume
+    own = query_db('SELECT id, file_path FROM resumes WHERE content_hash = ? AND applicant_id = ?',
+                   [content_hash, current_user['id']], one=True)
+    if own:
+        os.remove(tmp_path)
+        return jsonify({
+            'message': 'Resume already uploaded',
+            'resume_id': own['id'],
+            'deduplicated': True
+        }), 200
+
+    # Content-addressed name, one file per applicant and content
+    filepath = os.path.join(resume_dir, f"{content_hash}_{current_user['id']}{ext}")
+    os.replace(tmp_path, filepath)
+
+    # The same file uploaded by someone else: reuse its parsed profile and embedding
+    existing = db.execute('''
+        SELECT parsed_data, profile_embedding, embedding_model FROM resumes
+        WHERE content_hash = ? AND parsed_data IS NOT NULL
+        LIMIT 1
+    ''', [content_hash]).fetchone()
+    if existing:
+        parsed_data = existing['parsed_data']
+        profile_embedding = existing['profile_embedding']
+        embedding_model = existing['embedding_model']
+    else:
+        # Parse resume with LLM and embed the candidate profile once
+        resume_data = parse_resume(filepath)
+        parsed_data = json.dumps(resume_data)
+        profile_embedding = vector_to_blob(embed_candidate_profile(build_candidate_profile(resume_data)))
+        embedding_model = active_model('jobs')
+
+    # Save resume to database
     cursor = db.cursor()
-    cursor.execute('INSERT INTO resumes (applicant_id, file_path, parsed_data) VALUES (?, ?, ?)', 
-                  [current_user['id'], filepath, json.dumps(parsed_data)])
+    cursor.execute('''
+        INSERT INTO resumes (applicant_id, file_path, stored_filename, parsed_data,
+                             content_hash, profile_embedding, embedding_model)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', [current_user['id'], filepath, os.path.basename(filepath), parsed_data,
+          content_hash, profile_embedding, embedding_model])
     resume_id = cursor.lastrowid
     db.commit()
-    
+
     return jsonify({
         'message': 'Resume uploaded successfully!',
-        'resume_id': resume_id
+        'resume_id': resume_id,
+        'deduplicated': existing is not None
     }), 201
 
-@app.route('/api/applications', methods=['POST'])
-@token_required
-def create_application(current_user):
+def load_resume_profile(resume_rec):
+    """Parsed resume data and profile embedding, from the stored copies when available"""
+    stage('extracting', cached=bool(resume_rec.get('parsed_data')))
+    if resume_rec.get('parsed_data'):
+        resume_data = json.loads(resume_rec['parsed_data'])
+    else:
+        resume_data = parse_resume(resume_rec['file_path'])
+    row = get_db().execute('SELECT profile_embedding, embedding_model FROM resumes WHERE id = ?',
+                           [resume_rec['id']]).fetchone()
+    if row and row['profile_embedding'] and row['embedding_model'] == active_model('jobs'):
+        stage('embedding', cached=True)
+        profile_vec = blob_to_vector(row['profile_embedding'])
+    else:
+        stage('embedding', cached=False)
+        profile_vec = embed_candidate_profile(build_candidate_profile(resume_data))
+    return resume_data, profile_vec
+
+def retrieve_job_description(job):
+    """Retrieve the job's description chunks from Chroma, falling back to the stored text"""
+    stage('retrieving')
+    with span("vector_retrieve"):
+        job_chunks = get_job_index().search_text(job.get('title', ''), k=3, job_id=job['id'])
+    return "\n".join([chunk.text for chunk in job_chunks]) if job_chunks else job.get('description', '')
+
+def scoring_mode_for(job):
+    """The job's own scoring mode, or the global Config.SCORING_MODE"""
+    return job.get('scoring_mode') or config.SCORING_MODE
+
+def score_local(job, resume_text, profile_vec=None):
+    """Score without the LLM against the job's stored JD summary"""
     try:
-        data = request.get_json() or {}
-        job_id = data.get('job_id')
-        resume_id = data.get('resume_id')
-        if not job_id or not resume_id:
-            return jsonify({"message": "job_id and resume_id are required"}), 400
+        jd_data = json.loads(job.get('summarized_data') or '{}')
+    except json.JSONDecodeError:
+        jd_data = {}
+    return evaluate_match_local(resume_text, jd_data, job_id=job['id'], profile_vec=profile_vec)
+
+def insert_application(db, applicant_id, job, resume_id, match_result):
+    """Store a scored application, its score components and its ranking row (caller commits)"""
+    jd_hash, weights_hash = rescoring.score_fingerprints(job)
+    llm_score = match_result['llm_score']
+    cursor = db.execute(
+        """
+        INSERT INTO applications (
+            applicant_id,
+            job_id,
+            resume_id,
+            application_date,
+            status,
+            match_score,
+            match_analysis,
+            semantic_score,
+            llm_score,
+            jd_hash,
+            weights_hash
+        ) VALUES (?, ?, ?, datetime('now'), ?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
+            applicant_id,
+            job['id'],
+            resume_id,
+            'pending',
+            match_result['match_score'],
+            json.dumps(match_result['analysis']),
+            match_result['semantic_score'],
+            float(llm_score) if llm_score is not None else None,
+            jd_hash,
+            weights_hash
+        ],
+    )
+    sync_ranking(db, cursor.lastrowid)
 
+def screen_application(current_user, job_id, resume_id):
+    """Score a resume against a job and store the application; returns (response body, status)"""
+    try:
         # Load resume record
-        resume_rec = query_db('SELECT * FROM resumes WHERE id = ?', [resume_id], one=True)
+        resume_rec = query_db('SELECT id, file_path, parsed_data FROM resumes WHERE id = ?', [resume_id], one=True)
         if not resume_rec:
-            return jsonify({"message": "Resume not found"}), 404
+            return {"message": "Resume not found"}, 404
         resume_path = resume_rec.get('file_path')
 
         # Load job
         job = query_db('SELECT * FROM jobs WHERE id = ?', [job_id], one=True)
         if not job:
-            return jsonify({"message": "Job not found"}), 404
+            return {"message": "Job not found"}, 404
 
-        # Parse resume (re-parse to get structured data if not stored)
-        resume_data = parse_resume(resume_path)
+        if scoring_mode_for(job) == 'local':
+            # Deterministic scoring from the raw resume text, no LLM calls
+            stage('extracting', cached=False)
+            match_result = score_local(job, extract_text(resume_path))
+        else:
+            # Stored parsed data and embedding (parsed only if never stored)
+            resume_data, profile_vec = load_resume_profile(resume_rec)
 
-        # Retrieve job description chunks from Chroma
-        vectorstore = Chroma(
-            persist_directory="db/vector_store/jobs",
-            embedding_function=HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
-        )
-        job_chunks = vectorstore.similarity_search(job.get('title', ''), k=3)
-        job_description = "\n".join([chunk.page_content for chunk in job_chunks]) if job_chunks else job.get('description', '')
+            # Retrieve job description chunks from Chroma
+            job_description = retrieve_job_description(job)
 
-        # Evaluate match
-        match_result = evaluate_match(resume_data, job_description)
+            # Evaluate match
+            match_result = evaluate_match_cached(job, resume_data, job_description, profile_vec,
+                                                 db_path=app.config['DATABASE'])
 
         # Save application
         db = get_db()
-        # Ensure applications table has match_analysis column (lightweight migration)
-        try:
-            get_db().execute("SELECT match_analysis FROM applications LIMIT 1")
-        except Exception:
-            try:
-                get_db().execute("ALTER TABLE applications ADD COLUMN match_analysis TEXT")
-                get_db().commit()
-            except Exception:
-                pass
-
-        db.execute(
-            """
-            INSERT INTO applications (
-                applicant_id,
-                job_id,
-                resume_id,
-                application_date,
-                status,
-                match_score,
-                match_analysis
-            ) VALUES (?, ?, ?, datetime('now'), ?, ?, ?)
-            """,
-            [
-                current_user['id'],
-                job_id,
-                resume_id,
-                'pending',
-                match_result['match_score'],
-                json.dumps(match_result['analysis'])
-            ],
-        )
+        insert_application(db, current_user['id'], job, resume_id, match_result)
         db.commit()
 
-        return jsonify({
+        return {
             "message": "Application submitted successfully",
             "match_score": match_result['match_score'],
             "semantic_score": match_result['semantic_score'],
             "llm_score": match_result['llm_score'],
             "analysis": match_result['analysis'],
             "status": "pending"
-        }), 201
+        }, 201
     except Exception as e:
         print(f"Error creating application: {e}")
-        return jsonify({"message": f"Failed to submit application: {e}"}), 500
+        return {"message": f"Failed to submit application: {e}"}, 500
+
+def event_stream_response(operation):
+    """text/event-stream response following an operation from the client's Last-Event-ID"""
+    last_event_id = request.headers.get('Last-Event-ID', request.args.get('last_event_id', '0'))
+    return Response(progress.sse_stream(operation, int(last_event_id) if last_event_id.isdigit() else 0),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/applications', methods=['POST'])
+@token_required
+@admission_controlled('application')
+def create_application(current_user):
+    """
+    Apply with a resume to a job. With `Accept: text/event-stream` the
+    screening runs in the background and its progress is streamed as
+    server-sent events (see progress.py); otherwise the call blocks.
+    """
+    data = request.get_json() or {}
+    job_id = data.get('job_id')
+    resume_id = data.get('resume_id')
+    if not job_id or not resume_id:
+        return jsonify({"message": "job_id and resume_id are required"}), 400
+
+    if request.accept_mimetypes.best == 'text/event-stream':
+        def run():
+            with app.app_context():
+                return screen_application(current_user, job_id, resume_id)
+        # A retried request joins the screening already running for it. The admission
+        # slot stays taken until the screening ends, even if the client disconnects.
+        operation = progress.start(('application', current_user['id'], job_id, resume_id),
+                                   current_user['id'], run, on_done=admission.detach())
+        return event_stream_response(operation)
+
+    body, status = screen_application(current_user, job_id, resume_id)
+    return jsonify(body), status
+
+@app.route('/api/applications/operations/<operation_id>/events', methods=['GET'])
+@token_required
+def get_application_events(current_user, operation_id):
+    """Reconnect to a streamed application's events (honours Last-Event-ID)"""
+    operation = progress.get(operation_id)
+    if operation is None:
+        return jsonify({"message": "Operation not found"}), 404
+    if operation.owner_id != current_user['id'] and current_user['role'] != 'admin':
+        return jsonify({"message": "Access denied"}), 403
+    return event_stream_response(operation)
+
+@app.route('/api/applications/bulk', methods=['POST'])
+@token_required
+@admission_controlled('application')
+def create_applications_bulk(current_user):
+    """
+    Apply one resume to several jobs at once.
+
+    The resume is parsed and embedded once, then every job is scored
+    concurrently. Results are streamed back as newline-delimited JSON,
+    one line per job, in the order the jobs finish.
+    """
+    data = request.get_json() or {}
+    resume_id = data.get('resume_id')
+    job_ids = data.get('job_ids') or []
+    if not resume_id or not isinstance(job_ids, list) or not job_ids:
+        return jsonify({"message": "resume_id and a non-empty job_ids list are required"}), 400
+    job_ids = list(dict.fromkeys(job_ids))
+    if len(job_ids) > config.BULK_APPLICATION_MAX_JOBS:
+        return jsonify({"message": f"At most {config.BULK_APPLICATION_MAX_JOBS} jobs per request"}), 400
+
+    resume_rec = query_db('SELECT id, file_path, parsed_data FROM resumes WHERE id = ? AND applicant_id = ?',
+                          [resume_id, current_user['id']], one=True)
+    if not resume_rec:
+        return jsonify({"message": "Resume not found"}), 404
+
+    placeholders = ','.join('?' * len(job_ids))
+    jobs = {job['id']: job for job in query_db(
+        f'SELECT * FROM jobs WHERE id IN ({placeholders})', job_ids)}
+    applied = {row['job_id'] for row in query_db(
+        f'SELECT job_id FROM applications WHERE applicant_id = ? AND job_id IN ({placeholders})',
+        [current_user['id']] + job_ids)}
+
+    # Parse and embed the resume once for all jobs, for each scoring mode in use
+    modes = {scoring_mode_for(job) for job in jobs.values()}
+    if 'hybrid' in modes:
+        resume_data, profile_vec = load_resume_profile(resume_rec)
+    if 'local' in modes:
+        resume_text = extract_text(resume_rec['file_path'])
+        text_vec = embed_candidate_profile(resume_text)
+
+    def score_job(job):
+        if scoring_mode_for(job) == 'local':
+            return score_local(job, resume_text, profile_vec=text_vec)
+        job_description = retrieve_job_description(job)
+        return evaluate_match_cached(job, resume_data, job_description, profile_vec, db_path=app.config['DATABASE'])
+
+    def generate():
+        db = get_db()
+        for job_id in job_ids:
+            if job_id not in jobs:
+                yield json.dumps({"job_id": job_id, "error": "Job not found"}) + "\n"
+            elif job_id in applied:
+                yield json.dumps({"job_id": job_id, "error": "Already applied"}) + "\n"
+
+        pending = [jobs[job_id] for job_id in job_ids if job_id in jobs and job_id not in applied]
+        if not pending:
+            return
+        with ThreadPoolExecutor(max_workers=min(config.BULK_APPLICATION_WORKERS, len(pending))) as pool:
+            # Copy the request context so worker spans land in this request's trace
+            futures = {pool.submit(contextvars.copy_context().run, score_job, job): job for job in pending}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    match_result = future.result()
+                    insert_application(db, current_user['id'], job, resume_id, match_result)
+                    db.commit()
+                    yield json.dumps({
+                        "job_id": job['id'],
+                        "match_score": match_result['match_score'],
+                        "semantic_score": match_result['semantic_score'],
+                        "llm_score": match_result['llm_score'],
+                        "analysis": match_result['analysis'],
+                        "status": "pending"
+                    }) + "\n"
+                except Exception as e:
+                    print(f"Error in bulk application for job {job['id']}: {e}")
+                    yield json.dumps({"job_id": job['id'], "error": str(e)}) + "\n"
+
+    return Response(stream_with_context(generate()), status=200, mimetype='application/x-ndjson')
 
 @app.route('/api/applications', methods=['GET'])
 @token_required
@@ -373,13 +796,15 @@ def get_my_applications(current_user):
 @token_required
 @admin_required
 def get_all_applications(current_user):
-    applications = query_db('''
-        SELECT a.*, u.username, u.email, j.title as job_title
-        FROM applications a
-        JOIN users u ON a.applicant_id = u.id
-        JOIN jobs j ON a.job_id = j.id
-        ORDER BY a.match_score DESC, a.application_date DESC
-    ''')
+    status, limit, offset = ranking_page_args()
+    applications = query_db(f'''
+        SELECT application_id as id, applicant_id, job_id, resume_id, application_date,
+               status, match_score, match_analysis, username, email, job_title
+        FROM job_rankings
+        {'WHERE status = ?' if status else ''}
+        ORDER BY match_score DESC, application_date DESC
+        LIMIT ? OFFSET ?
+    ''', ([status] if status else []) + [limit, offset])
     
     return jsonify(applications)
 
@@ -395,6 +820,7 @@ def update_application_status(current_user, application_id):
     
     db = get_db()
     db.execute('UPDATE applications SET status = ? WHERE id = ?', [new_status, application_id])
+    db.execute('UPDATE job_rankings SET status = ? WHERE application_id = ?', [new_status, application_id])
     db.commit()
     
     # Status updated successfully
@@ -450,20 +876,20 @@ def admin_stats():
 @app.route('/api/jobs/<int:job_id>', methods=['GET'])
 def get_job(job_id):
     try:
-        job = query_db('''
+        version = get_db().execute('SELECT version FROM jobs WHERE id = ?', [job_id]).fetchone()
+        if not version:
+            return jsonify({'message': 'Job not found!'}), 404
+        return http_cache.cached_json('job', (job_id, version[0]), lambda: query_db('''
             SELECT 
                 id,
                 title,
                 description,
                 datetime(posting_date) as posting_date,
-                status
+                status,
+                scoring_mode
             FROM jobs 
             WHERE id = ?
-        ''', [job_id], one=True)
-        
-        if not job:
-            return jsonify({'message': 'Job not found!'}), 404
-        return jsonify(job)
+        ''', [job_id], one=True))
     except Exception as e:
         print(f"Error in get_job: {str(e)}")
         return jsonify({'message': f'Error fetching job: {str(e)}'}), 500
@@ -471,6 +897,7 @@ def get_job(job_id):
 @app.route('/api/jobs/<int:job_id>', methods=['PUT'])
 @token_required
 @admin_required
+@admission_controlled('job_write')
 def update_job(current_user, job_id):
     data = request.get_json()
     
@@ -479,21 +906,254 @@ def update_job(current_user, job_id):
     if not job:
         return jsonify({'message': 'Job not found!'}), 404
     
+    scoring_mode = data.get('scoring_mode', job.get('scoring_mode'))
+    if scoring_mode is not None and scoring_mode not in config.SCORING_MODES:
+        return jsonify({'message': f'scoring_mode must be one of {", ".join(config.SCORING_MODES)}'}), 400
+    status = data.get('status', job['status'])
+    if status not in ('open', 'closed'):
+        return jsonify({'message': 'status must be one of open, closed'}), 400
+    
     # Update job
     db = get_db()
-    db.execute('UPDATE jobs SET title = ?, description = ? WHERE id = ?',
-              [data['title'], data['description'], job_id])
+    db.execute('UPDATE jobs SET title = ?, description = ?, scoring_mode = ?, status = ? WHERE id = ?',
+              [data['title'], data['description'], scoring_mode, status, job_id])
+    db.execute('UPDATE job_rankings SET job_title = ? WHERE job_id = ?', [data['title'], job_id])
     
     # Process updated job description with RAG
     updated_job = query_db('SELECT * FROM jobs WHERE id = ?', [job_id], one=True)
-    summarized_jd = summarize_jd(updated_job['description'])
+    summarized_jd = summarize_jd(updated_job['description'], job_id)
     
     # Store the summarized JD
     db.execute('UPDATE jobs SET summarized_data = ? WHERE id = ?',
               [json.dumps(summarized_jd), job_id])
     db.commit()
-    
-    return jsonify({'message': 'Job updated successfully!'})
+    recommender.refresh_jobs(db, [job_id])
+    http_cache.invalidate(('jobs',))
+    http_cache.invalidate(('job', job_id))
+
+    # Existing applications were scored against the old description
+    response = {'message': 'Job updated successfully!'}
+    if config.RESCORE_ON_JOB_UPDATE:
+        response['rescore_run_id'] = rescoring.start_rescore(db, job_id, db_path=app.config['DATABASE'])
+
+    return jsonify(response)
+
+@app.route('/api/admin/jobs/import', methods=['POST'])
+@token_required
+@admin_required
+def create_job_import(current_user):
+    """
+    Import a JSONL or CSV catalog of jobs (multipart field `file`, or the
+    request body) in the background; poll the returned import for progress
+    and per-row errors.
+    """
+    too_large = {'message': f"Catalog too large (max {app.config['JOB_IMPORT_MAX_BYTES'] // (1024 * 1024)}MB)"}
+    if request.content_length is not None and request.content_length > app.config['JOB_IMPORT_MAX_BYTES']:
+        return jsonify(too_large), 413
+    try:
+        if 'file' in request.files:
+            upload = request.files['file']
+            filename, content_type = upload.filename, upload.mimetype
+            raw = upload.read()
+        else:
+            filename, content_type = request.args.get('filename'), request.mimetype
+            raw = request.get_data()
+    except RequestEntityTooLarge:
+        return jsonify(too_large), 413
+    if not raw:
+        return jsonify({'message': 'No catalog provided'}), 400
+    try:
+        text = raw.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return jsonify({'message': 'Catalog must be UTF-8'}), 400
+    fmt = request.args.get('format') or job_import.detect_format(filename, content_type)
+    if fmt not in job_import.FORMATS:
+        return jsonify({'message': f'format must be one of {", ".join(job_import.FORMATS)}'}), 400
+
+    import_id = job_import.start_import(get_db(), text, fmt, filename, db_path=app.config['DATABASE'])
+    return jsonify({'message': 'Import started', 'import_id': import_id}), 202
+
+@app.route('/api/admin/jobs/import/<int:import_id>', methods=['GET'])
+@token_required
+@admin_required
+def get_job_import(current_user, import_id):
+    """Progress, created job ids and per-row errors of a job import"""
+    result = job_import.get_import(get_db(), import_id)
+    if result is None:
+        return jsonify({'message': 'Import not found'}), 404
+    return jsonify(result)
+
+@app.route('/api/admin/resumes/ingest', methods=['POST'])
+@token_required
+@admin_required
+def create_resume_ingestion(current_user):
+    """
+    Ingest a directory or zip archive of resumes under RESUME_INGEST_ROOT in
+    the background: {"source": path relative to the root, "applicant_id":
+    owner (default: the caller)}.
+    """
+    data = request.get_json(silent=True) or {}
+    root = os.path.realpath(config.RESUME_INGEST_ROOT)
+    source = os.path.realpath(os.path.join(root, str(data.get('source') or '')))
+    if not data.get('source') or os.path.commonpath([root, source]) != root:
+        return jsonify({'message': f'source must be a path inside {config.RESUME_INGEST_ROOT}'}), 400
+    if not (os.path.isdir(source) or zipfile.is_zipfile(source)):
+        return jsonify({'message': 'source must be a directory or a zip archive'}), 400
+    applicant_id = data.get('applicant_id', current_user['id'])
+    if query_db('SELECT id FROM users WHERE id = ?', [applicant_id], one=True) is None:
+        return jsonify({'message': 'Applicant not found'}), 404
+
+    ingestion_id = resume_ingest.start_ingestion(get_db(), source, applicant_id, db_path=app.config['DATABASE'])
+    return jsonify({'message': 'Ingestion started', 'ingestion_id': ingestion_id}), 202
+
+@app.route('/api/admin/resumes/ingest/<int:ingestion_id>', methods=['GET'])
+@token_required
+@admin_required
+def get_resume_ingestion(current_user, ingestion_id):
+    """Progress, outcome counters and skipped/failed files of a resume ingestion"""
+    result = resume_ingest.get_ingestion(get_db(), ingestion_id)
+    if result is None:
+        return jsonify({'message': 'Ingestion not found'}), 404
+    return jsonify(result)
+
+@app.route('/api/admin/resumes/ingest/<int:ingestion_id>/resume', methods=['POST'])
+@token_required
+@admin_required
+def resume_resume_ingestion(current_user, ingestion_id):
+    """Continue an interrupted or failed ingestion from its last committed batch"""
+    result = resume_ingest.get_ingestion(get_db(), ingestion_id)
+    if result is None:
+        return jsonify({'message': 'Ingestion not found'}), 404
+    if result['status'] == 'completed':
+        return jsonify({'message': 'Ingestion already completed'}), 409
+    resume_ingest.resume_in_background(ingestion_id, db_path=app.config['DATABASE'])
+    return jsonify({'message': 'Ingestion resumed', 'ingestion_id': ingestion_id}), 202
+
+@app.route('/api/admin/rescore', methods=['POST'])
+@token_required
+@admin_required
+def create_rescore_run(current_user):
+    """Rescore stale applications (one job or all) in the background"""
+    data = request.get_json(silent=True) or {}
+    job_id = data.get('job_id')
+    if job_id is not None and not query_db('SELECT id FROM jobs WHERE id = ?', [job_id], one=True):
+        return jsonify({'message': 'Job not found!'}), 404
+    run_id = rescoring.start_rescore(get_db(), job_id, bool(data.get('include_llm')),
+                                     db_path=app.config['DATABASE'])
+    return jsonify({'message': 'Rescoring started', 'run_id': run_id}), 202
+
+@app.route('/api/admin/rescore/<int:run_id>', methods=['GET'])
+@token_required
+@admin_required
+def get_rescore_run(current_user, run_id):
+    run = query_db('SELECT * FROM rescore_runs WHERE id = ?', [run_id], one=True)
+    if not run:
+        return jsonify({'message': 'Rescoring run not found'}), 404
+    return jsonify(run)
+
+@app.route('/api/admin/rescore/<int:run_id>/resume', methods=['POST'])
+@token_required
+@admin_required
+def resume_rescore_run(current_user, run_id):
+    run = query_db('SELECT status FROM rescore_runs WHERE id = ?', [run_id], one=True)
+    if not run:
+        return jsonify({'message': 'Rescoring run not found'}), 404
+    if run['status'] == 'completed':
+        return jsonify({'message': 'Rescoring run already completed'}), 409
+    rescoring.resume_in_background(run_id, db_path=app.config['DATABASE'])
+    return jsonify({'message': 'Rescoring resumed', 'run_id': run_id}), 202
+
+@app.route('/api/admin/admission', methods=['GET'])
+@token_required
+@admin_required
+def get_admission_stats(current_user):
+    """Slots in use, queue depth and limits of each admission pool"""
+    return jsonify(admission.stats())
+
+@app.route('/api/admin/match-cache', methods=['GET'])
+@token_required
+@admin_required
+def get_match_cache_stats(current_user):
+    """Reused match analyses per job and the reuse threshold"""
+    return jsonify(analysis_cache.job_stats(get_db()))
+
+@app.route('/api/admin/vector-stores', methods=['GET'])
+@token_required
+@admin_required
+def get_vector_stores(current_user):
+    """Embedding model, dimension, size and migration state of each vector store"""
+    return jsonify([describe(name) for name in STORES])
+
+@app.route('/api/admin/vector-stores/<name>/migrate', methods=['POST'])
+@token_required
+@admin_required
+def migrate_vector_store(current_user, name):
+    """Re-embed a vector store with another model in the background, then swap it in"""
+    if name not in STORES:
+        return jsonify({'message': 'Vector store not found'}), 404
+    data = request.get_json(silent=True) or {}
+    if not data.get('model'):
+        return jsonify({'message': 'Missing model'}), 400
+    migrate_in_background(name, data['model'], int(data.get('batch_size', 64)))
+    return jsonify({'message': 'Migration started', 'store': name, 'model': data['model']}), 202
+
+@app.route('/api/admin/vector-stores/<name>/stats', methods=['GET'])
+@token_required
+@admin_required
+def get_vector_store_stats(current_user, name):
+    """Disk usage, dead vectors and (with ?probe=N) query latency of a vector store"""
+    if name not in STORES:
+        return jsonify({'message': 'Vector store not found'}), 404
+    probe = min(request.args.get('probe', 0, type=int), 200)
+    return jsonify(vector_store.index_stats(name, probe))
+
+@app.route('/api/admin/vector-stores/maintain', methods=['POST'])
+@token_required
+@admin_required
+def maintain_vector_stores(current_user):
+    """Purge dead documents and compact the stores that need it, in the background"""
+    names = (request.get_json(silent=True) or {}).get('stores') or list(STORES)
+    if any(name not in STORES for name in names):
+        return jsonify({'message': f'stores must be among {", ".join(STORES)}'}), 400
+    vector_store.maintain_in_background(names, db_path=app.config['DATABASE'])
+    return jsonify({'message': 'Maintenance started', 'stores': names}), 202
+
+@app.route('/api/admin/vector-stores/snapshots', methods=['GET'])
+@token_required
+@admin_required
+def get_vector_store_snapshots(current_user):
+    """Snapshots of the vector stores, newest first"""
+    return jsonify(vector_store.list_snapshots())
+
+@app.route('/api/admin/vector-stores/<name>/snapshot', methods=['POST'])
+@token_required
+@admin_required
+def snapshot_vector_store(current_user, name):
+    """Take a consistent snapshot of a vector store while it keeps serving"""
+    if name not in STORES:
+        return jsonify({'message': 'Vector store not found'}), 404
+    try:
+        return jsonify(vector_store.snapshot(name)), 201
+    except Exception as e:
+        print(f"Error in snapshot_vector_store: {str(e)}")
+        return jsonify({'message': f'Error taking snapshot: {str(e)}'}), 500
+
+@app.route('/api/admin/vector-stores/<name>/restore', methods=['POST'])
+@token_required
+@admin_required
+def restore_vector_store(current_user, name):
+    """Replace a vector store with one of its snapshots: {"snapshot": directory name}"""
+    if name not in STORES:
+        return jsonify({'message': 'Vector store not found'}), 404
+    wanted = (request.get_json(silent=True) or {}).get('snapshot')
+    match = next((s for s in vector_store.list_snapshots(name) if os.path.basename(s['path']) == wanted), None)
+    if match is None:
+        return jsonify({'message': 'Snapshot not found'}), 404
+    try:
+        return jsonify(vector_store.restore(name, match['path']))
+    except Exception as e:
+        print(f"Error in restore_vector_store: {str(e)}")
+        return jsonify({'message': f'Error restoring snapshot: {str(e)}'}), 500
 
 @app.route('/api/jobs/<int:job_id>/applications', methods=['GET'])
 @token_required
@@ -505,27 +1165,26 @@ def get_job_applications(current_user, job_id):
         if not job:
             return jsonify({'message': 'Job not found!'}), 404
 
-        applications = query_db('''
-            SELECT 
-                a.id,
-                a.applicant_id,
-                a.job_id,
-                a.resume_id,
-                a.match_score,
-                a.match_analysis,
-                a.status,
-                datetime(a.application_date) as application_date,
-                u.username,
-                u.email,
-                r.file_path as resume_path,
-                j.title as job_title
-            FROM applications a
-            JOIN users u ON a.applicant_id = u.id
-            LEFT JOIN resumes r ON a.resume_id = r.id
-            JOIN jobs j ON a.job_id = j.id
-            WHERE a.job_id = ?
-            ORDER BY a.match_score DESC, a.application_date DESC
-        ''', [job_id])
+        status, limit, offset = ranking_page_args()
+        applications = query_db(f'''
+            SELECT
+                application_id as id,
+                applicant_id,
+                job_id,
+                resume_id,
+                match_score,
+                match_analysis,
+                status,
+                datetime(application_date) as application_date,
+                username,
+                email,
+                resume_path,
+                job_title
+            FROM job_rankings
+            WHERE job_id = ? {'AND status = ?' if status else ''}
+            ORDER BY match_score DESC, application_date DESC
+            LIMIT ? OFFSET ?
+        ''', [job_id] + ([status] if status else []) + [limit, offset])
         
         # Convert file paths to relative paths for JSON serialization
         for app in applications:
@@ -545,24 +1204,36 @@ def get_job_applications(current_user, job_id):
 @token_required
 def get_resume(current_user, filename):
     try:
-        # Check if the user is admin or the resume belongs to them
-        resume = query_db('''
-            SELECT r.*, a.applicant_id 
-            FROM resumes r
-            LEFT JOIN applications a ON r.id = a.resume_id
-            WHERE r.file_path LIKE ?
-        ''', [f'%{filename}'], one=True)
-        
+        # Indexed lookup: numeric resume id, stored filename or content hash
+        if filename.isdigit():
+            resume = query_db('SELECT id, applicant_id, stored_filename, content_hash FROM resumes WHERE id = ?',
+                              [int(filename)], one=True)
+        else:
+            resume = query_db('''
+                SELECT id, applicant_id, stored_filename, content_hash FROM resumes
+                WHERE stored_filename = ? OR content_hash = ?
+                ORDER BY stored_filename = ? DESC, applicant_id = ? DESC
+                LIMIT 1
+            ''', [filename, filename, filename, current_user['id']], one=True)
+
         if not resume:
             return jsonify({'message': 'Resume not found'}), 404
-            
+
+        # Check if the user is admin or the resume belongs to them
         if current_user['role'] != 'admin' and resume['applicant_id'] != current_user['id']:
             return jsonify({'message': 'Unauthorized access'}), 403
-        
+
         # Get the directory and filename
         resume_dir = os.path.join(app.config['UPLOAD_FOLDER'], 'resumes')
         try:
-            return send_from_directory(resume_dir, filename, as_attachment=True)
+            # conditional=True answers If-None-Match / If-Modified-Since with 304 and Range
+            # with 206; the body goes out via wsgi.file_wrapper (sendfile) or X-Sendfile
+            response = send_from_directory(resume_dir, resume['stored_filename'], as_attachment=True,
+                                           conditional=True, etag=resume['content_hash'] or True,
+                                           max_age=app.config['RESUME_CACHE_MAX_AGE'])
+            response.cache_control.public = False
+            response.cache_control.private = True
+            return response
         except Exception as e:
             print(f"Error sending file: {str(e)}")
             return jsonify({'message': 'Error serving resume file'}), 500
@@ -575,7 +1246,7 @@ def get_resume(current_user, filename):
 @token_required
 def get_user_resumes(current_user):
     resumes = query_db('''
-        SELECT * FROM resumes 
+        SELECT id, applicant_id, file_path, parsed_data, upload_date, content_hash FROM resumes
         WHERE applicant_id = ? 
         ORDER BY upload_date DESC
     ''', [current_user['id']])
@@ -586,6 +1257,9 @@ def get_user_resumes(current_user):
 if not os.path.exists(app.config['DATABASE']):
     init_db()
     create_admin_if_not_exists()
+migrate_db()
+# Fail at startup rather than per request if the jobs store holds another model's vectors
+get_job_vectorstore()
 
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
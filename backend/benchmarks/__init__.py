@@ -0,0 +1,11 @@
+"""
+Offline benchmark suite for the screening pipeline.
+
+Run from the backend directory:
+    python -m benchmarks --sizes 10 50 100 --output bench.json
+    python -m benchmarks --sizes 10 50 100 --baseline bench.json  # regression gate
+
+Each corpus size runs in its own subprocess and working directory, with the
+local Groq stub (llm_stub_server.py) standing in for the LLM and the hashing
+embedding backend standing in for sentence-transformers unless told otherwise.
+"""
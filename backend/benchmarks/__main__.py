@@ -0,0 +1,125 @@
+# benchmarks/__main__.py
+"""Command-line entry point: python -m benchmarks --help"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+from benchmarks.harness import BACKEND_DIR, setup_environment
+from benchmarks.compare import gate
+
+SCENARIOS = ("agents", "routes")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Offline latency/throughput benchmarks for the screening pipeline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100], help="corpus sizes to run")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--output", default="bench_results.json", help="where to write the JSON results")
+    parser.add_argument("--baseline", help="baseline JSON to gate against; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--embeddings", choices=["hash", "huggingface", "onnx"], default="hash",
+                        help="hash = deterministic offline stand-in; huggingface/onnx = real models")
+    parser.add_argument("--llm", choices=["stub", "groq"], default="stub",
+                        help="stub = local llm_stub_server; groq = real API (costs tokens)")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="seconds of simulated stub latency")
+    parser.add_argument("--keep-workdir", action="store_true")
+    # Internal: run a single corpus size in this process
+    parser.add_argument("--worker-size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def run_worker(args):
+    """Run every scenario for one corpus size in an isolated working directory"""
+    workdir = tempfile.mkdtemp(prefix=f"bench_{args.worker_size}_")
+    try:
+        stub = setup_environment(workdir, args.embeddings, args.llm, args.llm_latency)
+        from benchmarks.corpus import build_corpus
+        from benchmarks import scenarios
+
+        jds, resumes = build_corpus(args.worker_size, args.seed)
+        pdf_paths = scenarios.resume_pdfs(resumes, os.path.join(workdir, "pdfs"))
+        results = {}
+        if "agents" in args.scenarios:
+            results.update(scenarios.run_agents(jds, resumes, pdf_paths))
+        if "routes" in args.scenarios:
+            results.update(scenarios.run_routes(jds, pdf_paths))
+        if stub is not None:
+            results["_llm_stub_requests"] = stub.stats["requests"]
+        with open(args.worker_output, "w") as f:
+            json.dump(results, f)
+    finally:
+        if not args.keep_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.worker_size is not None:
+        run_worker(args)
+        return 0
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "embeddings": args.embeddings,
+            "llm": args.llm,
+            "llm_latency": args.llm_latency,
+            "seed": args.seed,
+            "scenarios": args.scenarios,
+        },
+        "results": {},
+    }
+    passthrough = ["--scenarios", *args.scenarios, "--seed", str(args.seed), "--embeddings", args.embeddings,
+                   "--llm", args.llm, "--llm-latency", str(args.llm_latency)]
+    if args.keep_workdir:
+        passthrough.append("--keep-workdir")
+
+    for size in args.sizes:
+        print(f"⏱️  corpus size {size} ...", file=sys.stderr)
+        # A fresh process per size gives clean model caches, vector stores and peak RSS
+        with tempfile.NamedTemporaryFile(suffix=".json") as out:
+            proc = subprocess.run([sys.executable, "-m", "benchmarks", "--worker-size", str(size),
+                                   "--worker-output", out.name, *passthrough], cwd=BACKEND_DIR)
+            if proc.returncode != 0:
+                print(f"❌ corpus size {size} failed (exit {proc.returncode})", file=sys.stderr)
+                return proc.returncode
+            results = json.load(out)
+        report["meta"].setdefault("llm_stub_requests", {})[str(size)] = results.pop("_llm_stub_requests", None)
+        report["results"][str(size)] = results
+        for name, stats in results.items():
+            print(f"   {name:<36} p50 {stats['p50_ms']:>9.2f} ms  p95 {stats['p95_ms']:>9.2f} ms  "
+                  f"p99 {stats['p99_ms']:>9.2f} ms  {stats['throughput_per_s']:>8.2f}/s  "
+                  f"rss {stats['peak_rss_mb']:.0f} MB", file=sys.stderr)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"📄 results written to {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        return 0 if gate(args.baseline, report, args.tolerance) else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
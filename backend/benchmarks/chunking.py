@@ -0,0 +1,123 @@
+# benchmarks/chunking.py
+"""
+Compare chunking strategies on job descriptions: chunk counts, embedded
+tokens (including overlap), embedding time and retrieval quality.
+
+    python -m benchmarks.chunking --size 50 [--embeddings huggingface]
+
+Retrieval quality: for each JD and each of its Responsibilities /
+Requirements / Preferred sections, a question about that section is run
+against the JD's chunks. Recall is the fraction of the section's bullet
+lines found in the top-k chunks, precision the share of the retrieved text
+made up of those lines (a single whole-document chunk has perfect recall
+but poor precision).
+"""
+
+import sys
+import time
+import json
+import random
+import argparse
+from benchmarks.harness import BACKEND_DIR
+
+QUERIES = {
+    "Responsibilities": "What are the responsibilities and day to day duties of this role?",
+    "Requirements": "What skills, experience and qualifications are required?",
+    "Preferred": "Which skills are preferred or nice to have?",
+}
+
+
+def parse_sections(jd):
+    """Ground truth: bullet lines under each known heading of a fixture/synthetic JD"""
+    sections, current = {}, None
+    for line in jd.splitlines():
+        stripped = line.strip()
+        if stripped in QUERIES:
+            current = stripped
+            sections[current] = []
+        elif current and stripped.startswith("- "):
+            sections[current].append(stripped[2:])
+    return sections
+
+
+def cosine(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = (sum(x * x for x in a) ** 0.5) * (sum(y * y for y in b) ** 0.5)
+    return dot / norm if norm else 0.0
+
+
+def evaluate(strategy, jds, embeddings, k):
+    from agents.chunker import get_chunker, chunk_stats
+    chunker = get_chunker(strategy)
+    query_vecs = {heading: embeddings.embed_query(query) for heading, query in QUERIES.items()}
+    totals = {"chunks": 0, "embedded_tokens": 0, "document_tokens": 0}
+    embed_seconds, recalls, precisions = 0.0, [], []
+    for jd in jds:
+        chunks = chunker.split(jd)
+        for key, value in chunk_stats(chunks, jd, chunker.count_tokens).items():
+            if key in totals:
+                totals[key] += value
+        start = time.perf_counter()
+        vectors = embeddings.embed_documents([chunk.text for chunk in chunks])
+        embed_seconds += time.perf_counter() - start
+
+        for heading, lines in parse_sections(jd).items():
+            if not lines:
+                continue
+            ranked = sorted(zip(chunks, vectors), key=lambda cv: cosine(query_vecs[heading], cv[1]), reverse=True)
+            retrieved = " ".join(chunk.text for chunk, _ in ranked[:k])
+            found = [line for line in lines if line in retrieved]
+            recalls.append(len(found) / len(lines))
+            precisions.append(min(1.0, sum(len(line) for line in found) / max(len(retrieved), 1)))
+
+    return {
+        "documents": len(jds),
+        "chunks_per_document": round(totals["chunks"] / len(jds), 2),
+        "embedded_tokens": totals["embedded_tokens"],
+        "token_overhead": round(totals["embedded_tokens"] / totals["document_tokens"] - 1, 3),
+        "embed_ms_per_document": round(embed_seconds / len(jds) * 1000, 3),
+        f"recall_at_{k}": round(sum(recalls) / len(recalls), 3) if recalls else None,
+        f"precision_at_{k}": round(sum(precisions) / len(precisions), 3) if precisions else None,
+        "max_tokens": chunker.max_tokens,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.chunking", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=50, help="number of JDs (fixtures first, then synthetic)")
+    parser.add_argument("--strategies", nargs="+", default=["fixed", "token", "section"])
+    parser.add_argument("--embeddings", choices=["hash", "huggingface", "onnx"], default="hash")
+    parser.add_argument("--k", type=int, default=1, help="chunks retrieved per query")
+    parser.add_argument("--max-tokens", type=int, help="override Config.CHUNK_MAX_TOKENS")
+    parser.add_argument("--overlap-tokens", type=int, help="override Config.CHUNK_OVERLAP_TOKENS")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    from config import Config
+    Config.EMBEDDING_BACKEND = args.embeddings
+    if args.max_tokens is not None:
+        Config.CHUNK_MAX_TOKENS = args.max_tokens
+    if args.overlap_tokens is not None:
+        Config.CHUNK_OVERLAP_TOKENS = args.overlap_tokens
+    from embeddings import get_embeddings
+    from benchmarks.corpus import fixture_jds, synthetic_jd
+
+    rng = random.Random(args.seed)
+    jds = (fixture_jds() + [synthetic_jd(rng, i) for i in range(args.size)])[:args.size]
+    embeddings = get_embeddings(Config.EMBEDDING_MODEL)
+
+    results = {strategy: evaluate(strategy, jds, embeddings, args.k) for strategy in args.strategies}
+    for strategy, stats in results.items():
+        print(f"{strategy:<8} " + "  ".join(f"{key} {value}" for key, value in stats.items()), file=sys.stderr)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"embeddings": args.embeddings, "k": args.k, "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
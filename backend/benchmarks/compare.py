@@ -0,0 +1,74 @@
+# benchmarks/compare.py
+"""
+Regression gate: compare a benchmark result file against a baseline.
+
+    python -m benchmarks.compare baseline.json current.json --tolerance 0.2
+
+Exits with status 1 when any scenario's p50/p95 latency grew, or its
+throughput fell, by more than the tolerance.
+"""
+
+import sys
+import json
+import argparse
+
+LATENCY_METRICS = ("p50_ms", "p95_ms")
+
+
+def compare(baseline, current, tolerance=0.2, min_delta_ms=1.0):
+    """Return (report rows, regression rows) for scenarios present in both runs"""
+    rows, regressions = [], []
+    for size, scenarios in current.get("results", {}).items():
+        for name, stats in scenarios.items():
+            base = baseline.get("results", {}).get(size, {}).get(name)
+            if not base:
+                continue
+            for metric in LATENCY_METRICS:
+                before, after = base[metric], stats[metric]
+                ratio = after / before if before else 1.0
+                row = (size, name, metric, before, after, ratio)
+                rows.append(row)
+                # Ignore sub-millisecond jitter on very fast scenarios
+                if ratio > 1 + tolerance and after - before > min_delta_ms:
+                    regressions.append(row)
+            before, after = base["throughput_per_s"], stats["throughput_per_s"]
+            ratio = after / before if before else 1.0
+            row = (size, name, "throughput_per_s", before, after, ratio)
+            rows.append(row)
+            if ratio < 1 - tolerance:
+                regressions.append(row)
+    return rows, regressions
+
+
+def print_report(rows, regressions):
+    flagged = set(regressions)
+    print(f"{'size':>6}  {'scenario':<36} {'metric':<17} {'baseline':>11} {'current':>11} {'ratio':>7}")
+    for row in rows:
+        size, name, metric, before, after, ratio = row
+        marker = "  REGRESSION" if row in flagged else ""
+        print(f"{size:>6}  {name:<36} {metric:<17} {before:>11.3f} {after:>11.3f} {ratio:>7.2f}{marker}")
+
+
+def gate(baseline_path, current, tolerance=0.2, min_delta_ms=1.0):
+    """Print the comparison and return True when there are no regressions"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    rows, regressions = compare(baseline, current, tolerance, min_delta_ms)
+    print_report(rows, regressions)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {tolerance:.0%} tolerance")
+        return False
+    print(f"\n✅ No regressions beyond {tolerance:.0%} tolerance")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--min-delta-ms", type=float, default=1.0)
+    args = parser.parse_args()
+    with open(args.current) as f:
+        current = json.load(f)
+    sys.exit(0 if gate(args.baseline, current, args.tolerance, args.min_delta_ms) else 1)
@@ -0,0 +1,153 @@
+# benchmarks/corpus.py
+"""Deterministic synthetic and fixture resumes / job descriptions"""
+
+import os
+import glob
+import random
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+RESUME_FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "uploads", "resumes")
+
+SKILLS = [
+    "python", "java", "javascript", "typescript", "react", "flask", "django", "fastapi",
+    "sql", "postgresql", "mongodb", "redis", "docker", "kubernetes", "terraform", "aws",
+    "gcp", "azure", "pandas", "numpy", "scikit-learn", "pytorch", "tensorflow", "spark",
+    "airflow", "kafka", "graphql", "rest apis", "linux", "git", "ci/cd", "nlp",
+]
+TITLES = [
+    "Backend Engineer", "Data Scientist", "Frontend Developer", "Machine Learning Engineer",
+    "DevOps Engineer", "Data Engineer", "Full Stack Developer", "Platform Engineer",
+]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Vandelay Industries"]
+DEGREES = [
+    ("B.Sc.", "Computer Science"), ("Bachelor of Engineering", "Information Technology"),
+    ("M.Sc.", "Data Science"), ("Master of Science", "Statistics"), ("PhD", "Machine Learning"),
+]
+CERTIFICATIONS = [
+    "AWS Certified Developer", "Certified Kubernetes Administrator",
+    "Google Professional Data Engineer", "Microsoft Azure Fundamentals",
+]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def synthetic_jd(rng, index):
+    title = rng.choice(TITLES)
+    required = rng.sample(SKILLS, 5)
+    preferred = rng.sample([s for s in SKILLS if s not in required], 3)
+    years = rng.randint(1, 8)
+    degree = rng.choice(["Bachelor's degree", "Master's degree", "PhD"])
+    responsibilities = [
+        f"Design and maintain {rng.choice(required)} services for the {rng.choice(COMPANIES)} platform",
+        f"Collaborate with product teams on {rng.choice(['search', 'ranking', 'analytics', 'billing'])} features",
+        "Write tests, review code and improve observability",
+        f"Own the reliability of {rng.choice(['batch', 'streaming', 'web'])} workloads in production",
+    ]
+    return "\n".join([
+        f"{title} (Req #{index})",
+        "",
+        "About the role",
+        f"{rng.choice(COMPANIES)} is hiring a {title} to join a growing engineering team.",
+        "",
+        "Responsibilities",
+        *[f"- {r}" for r in responsibilities],
+        "",
+        "Requirements",
+        f"- {years}+ years of professional experience",
+        *[f"- Strong experience with {s}" for s in required],
+        f"- {degree} in Computer Science or a related field",
+        "",
+        "Preferred",
+        *[f"- Familiarity with {s}" for s in preferred],
+    ])
+
+
+def synthetic_resume(rng, index):
+    """Return (resume text, structured resume_data) for one synthetic candidate"""
+    name = f"Candidate {index}"
+    skills = rng.sample(SKILLS, rng.randint(4, 10))
+    experience = []
+    year = 2024
+    for _ in range(rng.randint(1, 3)):
+        length = rng.randint(1, 4)
+        start = year - length
+        experience.append({
+            "title": rng.choice(TITLES),
+            "company": rng.choice(COMPANIES),
+            "start": f"{rng.choice(MONTHS)} {start}",
+            "end": "Present" if year == 2024 else f"{rng.choice(MONTHS)} {year}",
+            "duration": f"{length} years",
+        })
+        year = start
+    degree, field = rng.choice(DEGREES)
+    certifications = rng.sample(CERTIFICATIONS, rng.randint(0, 2))
+
+    lines = [name, f"candidate{index}@example.com", "", "Skills", ", ".join(skills), "", "Experience"]
+    for exp in experience:
+        lines.append(f"{exp['title']} at {exp['company']}, {exp['start']} - {exp['end']} ({exp['duration']})")
+        lines.append(f"Built {rng.choice(skills)} systems and improved {rng.choice(['latency', 'throughput', 'reliability'])}.")
+    lines += ["", "Education", f"{degree} {field}, State University"]
+    if certifications:
+        lines += ["", "Certifications", *certifications]
+
+    resume_data = {
+        "name": name,
+        "email": f"candidate{index}@example.com",
+        "skills": skills,
+        "experience": experience,
+        "education": [{"degree": f"{degree} {field}"}],
+        "certifications": certifications,
+    }
+    return "\n".join(lines), resume_data
+
+
+def fixture_jds():
+    paths = sorted(glob.glob(os.path.join(FIXTURE_DIR, "jds", "*.txt")))
+    return [open(p, encoding="utf-8").read() for p in paths]
+
+
+def fixture_resume_pdfs():
+    return sorted(glob.glob(os.path.join(RESUME_FIXTURE_DIR, "*.pdf")))
+
+
+def build_corpus(size, seed=0):
+    """Fixture documents first, topped up with synthetic ones to `size` of each"""
+    rng = random.Random(seed)
+    jds = (fixture_jds() + [synthetic_jd(rng, i) for i in range(size)])[:size]
+    resumes = [synthetic_resume(rng, i) for i in range(size)]
+    return jds, resumes
+
+
+def _pdf_escape(text):
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_text_pdf(path, text, lines_per_page=50):
+    """Write plain text as a minimal multi-page PDF (Helvetica) readable by PyPDF2"""
+    lines = text.splitlines() or [""]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page_lines in pages:
+        stream = "BT /F1 10 Tf 50 780 Td 12 TL\n" + "\n".join(
+            f"({_pdf_escape(line)}) '" for line in page_lines) + "\nET"
+        objects.append(f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream")
+        content_id = len(objects)
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>")
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(out)
+    return path
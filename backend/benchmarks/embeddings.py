@@ -0,0 +1,119 @@
+# benchmarks/embeddings.py
+"""
+Parity and throughput of the ONNX Runtime embedding backend against the
+PyTorch (HuggingFaceEmbeddings) vectors currently stored.
+
+    python -m benchmarks.embeddings --size 50 [--threads 1 2 4] [--min-cosine 0.95]
+
+The texts are the JD and resume chunks the application actually embeds.
+For every model, each ONNX variant (fp32 and int8) is compared text by text
+with the reference vectors: min and mean cosine similarity, and how often
+the top-ranked chunk for a set of queries is the same. Exits 1 when a
+variant's minimum cosine falls below --min-cosine.
+"""
+
+import sys
+import time
+import json
+import argparse
+from benchmarks.harness import BACKEND_DIR
+
+QUERIES = [
+    "What are the responsibilities of this role?",
+    "Which skills and qualifications are required?",
+    "Work experience with Python and cloud infrastructure",
+    "Education and certifications",
+]
+
+
+def cosine(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = (sum(x * x for x in a) ** 0.5) * (sum(y * y for y in b) ** 0.5)
+    return dot / norm if norm else 0.0
+
+
+def embed_timed(embeddings, texts, repeat):
+    """Embed texts (after a warm-up call); returns (vectors, texts per second)"""
+    embeddings.embed_documents(texts[:8])
+    start = time.perf_counter()
+    for _ in range(repeat):
+        vectors = embeddings.embed_documents(texts)
+    elapsed = time.perf_counter() - start
+    return vectors, round(len(texts) * repeat / elapsed, 2) if elapsed else 0.0
+
+
+def top_hits(embeddings, vectors):
+    """Index of the best matching text for each query"""
+    hits = []
+    for query in QUERIES:
+        query_vec = embeddings.embed_query(query)
+        hits.append(max(range(len(vectors)), key=lambda i: cosine(query_vec, vectors[i])))
+    return hits
+
+
+def corpus_texts(size, seed, model_name):
+    from agents.chunker import get_chunker
+    from benchmarks.corpus import build_corpus
+    jds, resumes = build_corpus(size, seed)
+    chunker = get_chunker(model_name=model_name)
+    return [chunk.text for doc in jds + [text for text, _ in resumes] for chunk in chunker.split(doc)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.embeddings", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=50, help="number of JDs and of resumes to chunk")
+    parser.add_argument("--models", nargs="+", help="default: Config.EMBEDDING_MODEL and RESUME_EMBEDDING_MODEL")
+    parser.add_argument("--threads", nargs="+", type=int, default=[0], help="ONNX intra-op thread counts (0 = all cores)")
+    parser.add_argument("--variants", nargs="+", choices=["fp32", "int8"], default=["fp32", "int8"])
+    parser.add_argument("--repeat", type=int, default=1, help="timed passes over the texts")
+    parser.add_argument("--min-cosine", type=float, default=0.95, help="parity gate; exit 1 below it")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    from config import Config
+    Config.EMBEDDING_BACKEND = "huggingface"
+    from embeddings import load_embeddings, OnnxEmbeddings
+
+    results, failed = {}, False
+    for model_name in args.models or [Config.EMBEDDING_MODEL, Config.RESUME_EMBEDDING_MODEL]:
+        texts = corpus_texts(args.size, args.seed, model_name)
+        reference = load_embeddings(model_name, "huggingface")
+        ref_vectors, ref_rate = embed_timed(reference, texts, args.repeat)
+        ref_hits = top_hits(reference, ref_vectors)
+        model_results = {"texts": len(texts), "pytorch": {"texts_per_s": ref_rate}}
+        print(f"{model_name}: {len(texts)} texts, pytorch {ref_rate} texts/s", file=sys.stderr)
+
+        for variant in args.variants:
+            for threads in args.threads:
+                onnx = OnnxEmbeddings(model_name, quantize=variant == "int8", threads=threads)
+                vectors, rate = embed_timed(onnx, texts, args.repeat)
+                similarities = [cosine(a, b) for a, b in zip(ref_vectors, vectors)]
+                stats = {
+                    "texts_per_s": rate,
+                    "speedup": round(rate / ref_rate, 2) if ref_rate else None,
+                    "min_cosine": round(min(similarities), 5),
+                    "mean_cosine": round(sum(similarities) / len(similarities), 5),
+                    "top1_agreement": round(sum(a == b for a, b in zip(ref_hits, top_hits(onnx, vectors)))
+                                            / len(QUERIES), 3),
+                }
+                failed = failed or stats["min_cosine"] < args.min_cosine
+                model_results[f"onnx_{variant}_t{threads}"] = stats
+                print(f"   onnx {variant:<5} threads {threads}: "
+                      + "  ".join(f"{key} {value}" for key, value in stats.items()), file=sys.stderr)
+        results[model_name] = model_results
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"size": args.size, "min_cosine": args.min_cosine, "results": results}, f, indent=2)
+    if failed:
+        print(f"❌ ONNX vectors below {args.min_cosine} cosine of the reference", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+# benchmarks/harness.py
+"""Timing, percentile and memory helpers plus offline environment setup"""
+
+import os
+import sys
+import time
+import resource
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(sorted_values, pct):
+    """Linear-interpolated percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def summarize(latencies, wall_seconds):
+    ordered = sorted(latencies)
+    return {
+        "count": len(ordered),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+        "throughput_per_s": round(len(ordered) / wall_seconds, 3) if wall_seconds else 0.0,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def measure(calls):
+    """Run each zero-argument callable in turn and summarize per-call latency"""
+    latencies = []
+    wall_start = time.perf_counter()
+    for call in calls:
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies, time.perf_counter() - wall_start)
+
+
+def setup_environment(workdir, embedding_backend="hash", llm="stub", llm_latency=0.0):
+    """
+    Point the application at an isolated working directory and offline stand-ins.
+
+    Must run before the agents or app are imported: they read Config and open
+    their vector stores relative to the working directory at import time.
+    """
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+
+    from config import Config
+    Config.EMBEDDING_BACKEND = embedding_backend
+    Config.DATABASE_PATH = os.path.join(workdir, "db", "resume_screening.db")
+    Config.UPLOAD_FOLDER = os.path.join(workdir, "uploads")
+    os.makedirs(os.path.dirname(Config.DATABASE_PATH), exist_ok=True)
+
+    stub = None
+    if llm == "stub":
+        import llm_stub_server
+        stub, url = llm_stub_server.serve_in_background(port=0, latency=llm_latency)
+        Config.GROQ_API_BASE = url
+        Config.GROQ_API_KEY = Config.GROQ_API_KEY or "stub-key"
+        # The stub is never rate limited, so don't let the buckets dominate timings
+        Config.LLM_DEFAULT_LIMITS = {**Config.LLM_DEFAULT_LIMITS,
+                                     "requests_per_minute": 10**6, "tokens_per_minute": 10**9}
+    return stub
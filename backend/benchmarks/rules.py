@@ -0,0 +1,181 @@
+# benchmarks/rules.py
+"""
+Accuracy and speed of the experience/education rules (agents/rule_engine.py)
+against the split()-based parsing they replaced.
+
+    python -m benchmarks.rules [--size 10000] [--output rules.json]
+
+Candidates are generated with known experience (in months) and degree
+level, written the ways parsed resumes actually come back: "3 years",
+"2 years 6 months", "Jan 2019 – Present", "03/2017 - 11/2020",
+"2015 to 2018", "B.Sc.", "MS in ...", "Ph.D." and so on. Accuracy is the
+share of candidates whose years are within a month of the truth and whose
+degree level is exact. Timings cover scoring every candidate against one
+job, one call per candidate and through the batched score_candidates(),
+each starting with cold parse caches.
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+from datetime import date
+
+TODAY = date(2024, 12, 1)
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+DEGREES = [
+    ("High School Diploma", 1), ("Associate's degree in Information Technology", 2),
+    ("B.Sc. Computer Science", 3), ("BSc Physics", 3), ("Bachelor's in Mathematics", 3),
+    ("B.Tech Mechanical Engineering", 3), ("Bachelor of Engineering", 3),
+    ("M.Sc. Data Science", 4), ("MS in Statistics", 4), ("Master of Science", 4), ("MBA", 4),
+    ("Ph.D. Machine Learning", 5), ("PhD in Physics", 5),
+]
+JOB = ("5+ years of professional experience", "Master's degree in Computer Science or a related field")
+
+
+# The parsing the rule engine replaced, kept here as the baseline
+def legacy_experience_score(resume_exp, jd_exp):
+    try:
+        resume_years = 0
+        for exp in resume_exp:
+            duration = exp.get('duration', '').lower()
+            if 'year' in duration:
+                try:
+                    resume_years += float(duration.split()[0])
+                except:
+                    pass
+        jd_years = 0
+        for word in jd_exp.replace('+', '').lower().split():
+            try:
+                jd_years = float(word)
+                break
+            except:
+                pass
+        if jd_years == 0:
+            return 50.0, resume_years
+        return (100.0 if resume_years >= jd_years else resume_years / jd_years * 100), resume_years
+    except:
+        return 50.0, 0
+
+
+def legacy_education_score(resume_edu, jd_edu):
+    education_levels = {'high school': 1, 'associate': 2, 'bachelor': 3, 'master': 4, 'phd': 5, 'doctorate': 5}
+    resume_level = 0
+    for edu in resume_edu:
+        degree = edu.get('degree', '').lower()
+        for level_name, level_value in education_levels.items():
+            if level_name in degree:
+                resume_level = max(resume_level, level_value)
+    jd_level = 0
+    for level_name, level_value in education_levels.items():
+        if level_name in jd_edu.lower():
+            jd_level = max(jd_level, level_value)
+    if jd_level == 0 or resume_level >= jd_level:
+        return 100.0, resume_level
+    return resume_level / jd_level * 100, resume_level
+
+
+def write_duration(rng, start, end, ongoing):
+    """One experience entry's duration in one of the formats parsers produce"""
+    months = end - start
+    style = rng.choice(["years", "years_months", "month_range", "numeric_range", "year_range"])
+    if style == "years" and months % 12 == 0:
+        return f"{months // 12} years"
+    if style in ("years", "years_months"):
+        return f"{months // 12} years {months % 12} months" if months >= 12 else f"{months} months"
+    if style == "year_range" and start % 12 == 0 and end % 12 == 0 and not ongoing:
+        return f"{start // 12} to {end // 12}"
+    if style == "numeric_range":
+        end_text = "Present" if ongoing else f"{end % 12 + 1:02d}/{end // 12}"
+        return f"{start % 12 + 1:02d}/{start // 12} - {end_text}"
+    end_text = "Present" if ongoing else f"{MONTHS[end % 12]} {end // 12}"
+    return f"{MONTHS[start % 12]} {start // 12} – {end_text}"
+
+
+def candidate(rng):
+    """(parsed resume data, true years of experience, true degree level)"""
+    now = TODAY.year * 12 + TODAY.month - 1
+    end, total, experience = now, 0, []
+    for i in range(rng.randint(1, 4)):
+        length = rng.choice([rng.randint(3, 60), 12 * rng.randint(1, 5)])
+        start = end - length
+        experience.append({"title": "Engineer", "duration": write_duration(rng, start, end, ongoing=i == 0)})
+        total += length
+        end = start - rng.randint(0, 6)
+    degree, level = rng.choice(DEGREES)
+    return {"experience": experience, "education": [{"degree": degree}]}, total / 12, level
+
+
+def run(size, seed):
+    from agents import rule_engine
+    rng = random.Random(seed)
+    candidates = [candidate(rng) for _ in range(size)]
+    resumes = [c[0] for c in candidates]
+    jd_experience, jd_education = JOB
+
+    def accuracy(years_levels):
+        correct = sum(1 for (years, level), (_, true_years, true_level) in zip(years_levels, candidates)
+                      if abs(years - true_years) <= 1 / 12 + 1e-9 and level == true_level)
+        experience = sum(1 for (years, _), c in zip(years_levels, candidates) if abs(years - c[1]) <= 1 / 12 + 1e-9)
+        education = sum(1 for (_, level), c in zip(years_levels, candidates) if level == c[2])
+        return {"both": round(correct / size, 4), "experience": round(experience / size, 4),
+                "education": round(education / size, 4)}
+
+    results = {"size": size}
+
+    start = time.perf_counter()
+    legacy = [(legacy_experience_score(r["experience"], jd_experience)[1],
+               legacy_education_score(r["education"], jd_education)[1]) for r in resumes]
+    results["legacy"] = {"seconds": round(time.perf_counter() - start, 4), "accuracy": accuracy(legacy)}
+
+    def cold():
+        # Each timing starts without the engine's parse caches
+        rule_engine._parse_duration.cache_clear()
+        rule_engine.degree_level.cache_clear()
+
+    cold()
+    start = time.perf_counter()
+    for r in resumes:
+        rule_engine.experience_score(rule_engine.experience_years(r["experience"], TODAY),
+                                     rule_engine.required_years(jd_experience))
+        rule_engine.education_score(rule_engine.education_level(r["education"]),
+                                    rule_engine.degree_level(jd_education))
+    results["rule_engine"] = {"seconds": round(time.perf_counter() - start, 4)}
+
+    cold()
+    start = time.perf_counter()
+    rule_engine.score_candidates(resumes, jd_experience, jd_education, today=TODAY)
+    results["rule_engine_batch"] = {"seconds": round(time.perf_counter() - start, 4)}
+
+    extracted = [(rule_engine.experience_years(r["experience"], TODAY), rule_engine.education_level(r["education"]))
+                 for r in resumes]
+    results["rule_engine"]["accuracy"] = accuracy(extracted)
+    for name in ("legacy", "rule_engine", "rule_engine_batch"):
+        results[name]["candidates_per_s"] = round(size / results[name]["seconds"]) if results[name]["seconds"] else None
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.rules", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=10000, help="number of candidates")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.size, args.seed)
+    for name in ("legacy", "rule_engine", "rule_engine_batch"):
+        stats = results[name]
+        accuracy = stats.get("accuracy", results["rule_engine"]["accuracy"])
+        print(f"{name:<18} {stats['seconds']:>8.3f}s  {stats['candidates_per_s']:>8} candidates/s  "
+              f"accuracy {accuracy['both']:.1%} (experience {accuracy['experience']:.1%}, "
+              f"education {accuracy['education']:.1%})", file=sys.stderr)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+# benchmarks/scenarios.py
+"""Benchmark scenarios: the agents called directly, and the Flask routes end to end"""
+
+import os
+from functools import partial
+from benchmarks.corpus import fixture_resume_pdfs, write_text_pdf
+from benchmarks.harness import measure
+
+# Job ids used when calling the agents directly, kept clear of the ids the
+# routes scenario creates through the API
+AGENT_JOB_ID_BASE = 1_000_000
+
+
+def resume_pdfs(resumes, directory):
+    """Fixture PDFs first, then synthetic resumes rendered to PDF, one per corpus entry"""
+    os.makedirs(directory, exist_ok=True)
+    paths = fixture_resume_pdfs()[:len(resumes)]
+    for i, (text, _) in enumerate(resumes[len(paths):], start=len(paths)):
+        paths.append(write_text_pdf(os.path.join(directory, f"synthetic_{i}.pdf"), text))
+    return paths
+
+
+def run_agents(jds, resumes, pdf_paths):
+    from agents.jd_summarizer import summarize_jd
+    from agents.resume_parser import parse_resume
+    from agents.shortlister import get_semantic_similarity, evaluate_match, build_candidate_profile
+
+    n_jobs = len(jds)
+    job_ids = [AGENT_JOB_ID_BASE + i for i in range(n_jobs)]
+    results = {}
+    results["summarize_jd"] = measure(
+        [partial(summarize_jd, jd, job_id) for jd, job_id in zip(jds, job_ids)])
+    results["parse_resume"] = measure([partial(parse_resume, path) for path in pdf_paths])
+
+    profiles = [build_candidate_profile(data) for _, data in resumes]
+    results["get_semantic_similarity"] = measure([
+        partial(get_semantic_similarity, profile, job_ids[i % n_jobs])
+        for i, profile in enumerate(profiles)])
+    results["evaluate_match"] = measure([
+        partial(evaluate_match, data, jds[i % n_jobs], job_id=job_ids[i % n_jobs])
+        for i, (_, data) in enumerate(resumes)])
+    return results
+
+
+def _checked(response):
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.request.method} {response.request.path} -> "
+                           f"{response.status_code}: {response.get_data(as_text=True)[:200]}")
+    return response
+
+
+def run_routes(jds, pdf_paths, read_repeats=5):
+    import app as app_module
+
+    client = app_module.app.test_client()
+    admin_token = _checked(client.post("/api/login", json={"username": "admin", "password": "admin123"})).json["token"]
+    admin = {"Authorization": f"Bearer {admin_token}"}
+    _checked(client.post("/api/register", json={
+        "username": "bench", "email": "bench@example.com", "password": "bench"}))
+    applicant_token = _checked(client.post("/api/login", json={"username": "bench", "password": "bench"})).json["token"]
+    applicant = {"Authorization": f"Bearer {applicant_token}"}
+
+    results = {}
+    job_ids = []
+
+    def post_job(i, jd):
+        response = _checked(client.post("/api/jobs", json={"title": f"Benchmark role {i}", "description": jd}, headers=admin))
+        job_ids.append(response.json["job_id"])
+    results["POST /api/jobs"] = measure([partial(post_job, i, jd) for i, jd in enumerate(jds)])
+
+    reads = max(len(jds), 20) * read_repeats
+    results["GET /api/jobs"] = measure([partial(lambda: _checked(client.get("/api/jobs")))] * reads)
+    results["GET /api/jobs/<id>"] = measure([
+        partial(lambda job_id: _checked(client.get(f"/api/jobs/{job_id}")), job_ids[i % len(job_ids)])
+        for i in range(reads)])
+
+    resume_ids = []
+
+    def upload(path):
+        with open(path, "rb") as f:
+            response = _checked(client.post(
+                "/api/resumes", data={"resume": (f, os.path.basename(path))},
+                headers=applicant, content_type="multipart/form-data"))
+        resume_ids.append(response.json["resume_id"])
+    results["POST /api/resumes"] = measure([partial(upload, path) for path in pdf_paths])
+
+    # One application per job (an applicant may apply to each job once)
+    results["POST /api/applications"] = measure([
+        partial(lambda job_id, resume_id: _checked(client.post(
+            "/api/applications", json={"job_id": job_id, "resume_id": resume_id}, headers=applicant)),
+            job_id, resume_ids[i % len(resume_ids)])
+        for i, job_id in enumerate(job_ids)])
+    results["GET /api/jobs/<id>/applications"] = measure([
+        partial(lambda job_id: _checked(client.get(f"/api/jobs/{job_id}/applications", headers=admin)),
+                job_ids[i % len(job_ids)])
+        for i in range(reads)])
+    results["GET /api/admin/applications"] = measure(
+        [partial(lambda: _checked(client.get("/api/admin/applications", headers=admin)))] * reads)
+    return results
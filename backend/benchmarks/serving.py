@@ -0,0 +1,179 @@
+# benchmarks/serving.py
+"""
+Memory per worker of the gunicorn production profile (gunicorn.conf.py),
+with the models loaded in the master before forking and without.
+
+    python -m benchmarks.serving --workers 1 2 4 [--embeddings huggingface]
+
+Each setting starts a gunicorn master in a fresh process set up like the
+other benchmarks (temporary database, stub LLM), sends a burst of requests
+so every worker has served traffic, then reads RSS, PSS and private memory
+of the master and each worker from /proc/<pid>/smaps_rollup (Linux only).
+PSS divides shared pages among the processes sharing them, so the summed
+PSS is the real footprint; with preloading the per-worker private memory
+should stay flat as workers are added. Use --embeddings huggingface (or
+onnx) for numbers that include real model weights.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import shutil
+import signal
+import argparse
+import tempfile
+import subprocess
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.harness import BACKEND_DIR, setup_environment
+
+SMAPS_FIELDS = ("Rss", "Pss", "Private_Clean", "Private_Dirty")
+
+
+def memory_mb(pid):
+    """RSS, PSS and private (unshared) memory of a process in MB"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in SMAPS_FIELDS:
+                values[key] = int(rest.split()[0]) / 1024
+    return {
+        "rss_mb": round(values.get("Rss", 0.0), 1),
+        "pss_mb": round(values.get("Pss", 0.0), 1),
+        "private_mb": round(values.get("Private_Clean", 0.0) + values.get("Private_Dirty", 0.0), 1),
+    }
+
+
+def child_pids(pid):
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; fields after it are fixed
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            children.append(int(entry))
+    return children
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve(args):
+    """Run gunicorn from gunicorn.conf.py in this process (the benchmark's child)"""
+    setup_environment(args.workdir, args.embeddings)
+    from gunicorn.app.base import Application
+
+    class ProfileApplication(Application):
+        def load_config(self):
+            self.load_config_from_file(os.path.join(BACKEND_DIR, "gunicorn.conf.py"))
+            self.cfg.set("bind", f"127.0.0.1:{args.port}")
+            self.cfg.set("workers", args.serve_workers)
+            self.cfg.set("preload_app", args.preload)
+            self.cfg.set("pidfile", None)
+            self.cfg.set("accesslog", None)
+
+        def load(self):
+            import wsgi
+            return wsgi.app
+
+    ProfileApplication().run()
+
+
+def wait_ready(url, master, timeout=300):
+    deadline = time.time() + timeout
+    while time.time() < deadline and master.poll() is None:
+        try:
+            with urllib.request.urlopen(url, timeout=5) as response:
+                if response.status == 200:
+                    return True
+        except OSError:
+            time.sleep(0.5)
+    return False
+
+
+def measure(workers, preload, embeddings, requests):
+    port = free_port()
+    workdir = tempfile.mkdtemp(prefix="bench_serving_")
+    command = [sys.executable, "-m", "benchmarks.serving", "--serve", "--workdir", workdir,
+               "--port", str(port), "--serve-workers", str(workers), "--embeddings", embeddings]
+    if preload:
+        command.append("--preload")
+    master = subprocess.Popen(command, cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        url = f"http://127.0.0.1:{port}/api/jobs"
+        if not wait_ready(url, master):
+            raise RuntimeError(f"gunicorn did not come up on port {port}")
+        # Keep every worker busy at once so each one serves requests
+        with ThreadPoolExecutor(max_workers=workers * 4) as pool:
+            list(pool.map(lambda _: urllib.request.urlopen(url, timeout=30).read(), range(requests)))
+        time.sleep(1)
+
+        workers_mem = [memory_mb(pid) for pid in child_pids(master.pid)]
+        master_mem = memory_mb(master.pid)
+        count = len(workers_mem) or 1
+        return {
+            "workers": len(workers_mem),
+            "preload": preload,
+            "master": master_mem,
+            **{f"worker_{key}": round(sum(w[key] for w in workers_mem) / count, 1) for key in master_mem},
+            "total_pss_mb": round(master_mem["pss_mb"] + sum(w["pss_mb"] for w in workers_mem), 1),
+        }
+    finally:
+        master.send_signal(signal.SIGTERM)
+        try:
+            master.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            master.kill()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.serving", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--modes", nargs="+", choices=["preload", "no-preload"], default=["preload", "no-preload"])
+    parser.add_argument("--embeddings", choices=["hash", "huggingface", "onnx"], default="hash")
+    parser.add_argument("--requests", type=int, default=100, help="requests sent before measuring")
+    parser.add_argument("--output", help="also write the results as JSON")
+    # Internal: run the gunicorn master
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--serve-workers", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--preload", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve(args)
+        return 0
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        print("❌ /proc/<pid>/smaps_rollup is required (Linux)", file=sys.stderr)
+        return 1
+
+    results = []
+    for mode in args.modes:
+        for workers in args.workers:
+            stats = measure(workers, mode == "preload", args.embeddings, args.requests)
+            results.append(stats)
+            print(f"{mode:<10} workers {stats['workers']}  master rss {stats['master']['rss_mb']} MB  "
+                  f"worker rss {stats['worker_rss_mb']} MB  pss {stats['worker_pss_mb']} MB  "
+                  f"private {stats['worker_private_mb']} MB  total pss {stats['total_pss_mb']} MB", file=sys.stderr)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"embeddings": args.embeddings, "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+# benchmarks/vector_index.py
+"""
+Retrieval latency of the job index backends (vector_index.py).
+
+    python -m benchmarks.vector_index [--jobs 500] [--queries 200] [--output index.json]
+
+A synthetic catalog is chunked, embedded once (hash embeddings unless
+--embeddings huggingface) and stored through the numpy backend, which
+writes Chroma as well, so both backends search the same vectors. Timed:
+
+- per-job searches (k=3, what screening does for every application) on
+  Chroma and on the numpy flat index, with warm caches
+- cross-job searches (k=10) on Chroma, the numpy flat index and the IVF
+  approximate index, with recall@10 against the exact results
+- building the numpy files of every job from Chroma (after a migration,
+  compaction or restore)
+"""
+
+import sys
+import json
+import time
+import random
+import tempfile
+import argparse
+
+
+def run(jobs, queries, embedding_backend, seed=0):
+    from benchmarks.harness import setup_environment, measure
+    setup_environment(tempfile.mkdtemp(prefix="bench-index-"), embedding_backend=embedding_backend, llm=None)
+    from config import Config
+    from benchmarks.corpus import synthetic_jd, synthetic_resume
+    from agents.jd_summarizer import chunk_jd
+    from agents.shortlister import job_embeddings, build_candidate_profile
+    import vector_index
+
+    rng = random.Random(seed)
+    numpy_index = vector_index.NumpyIndex()
+    start = time.perf_counter()
+    chunks = 0
+    for job_id in range(1, jobs + 1):
+        texts, metadatas = chunk_jd(synthetic_jd(rng, job_id), job_id)
+        numpy_index.replace([(job_id, texts, metadatas, None)])
+        chunks += len(texts)
+    results = {"jobs": jobs, "chunks": chunks, "store_seconds": round(time.perf_counter() - start, 3)}
+
+    embeddings = job_embeddings()
+    vectors = embeddings.embed_documents([build_candidate_profile(synthetic_resume(rng, i)[1])
+                                          for i in range(queries)])
+    targets = [rng.randint(1, jobs) for _ in range(queries)]
+    chroma_index = vector_index.ChromaIndex()
+
+    def per_job(index):
+        for vector, job_id in zip(vectors, targets):  # warm-up: loads and maps the files
+            index.search(vector, 3, job_id)
+        return measure([lambda v=v, j=j: index.search(v, 3, j) for v, j in zip(vectors, targets)])
+
+    results["per_job"] = {"chroma": per_job(chroma_index), "numpy": per_job(numpy_index)}
+
+    def key(hit):
+        return hit.metadata.get("job_id"), hit.text
+
+    exact = [{key(hit) for hit in numpy_index.search_all(vector, 10)} for vector in vectors]
+
+    def cross_job(index):
+        index.search(vectors[0], 10)
+        found = [{key(hit) for hit in index.search(vector, 10)} for vector in vectors]
+        summary = measure([lambda v=v: index.search(v, 10) for v in vectors])
+        summary["recall_at_10"] = round(sum(len(f & e) for f, e in zip(found, exact)) /
+                                        max(sum(len(e) for e in exact), 1), 4)
+        return summary
+
+    results["cross_job"] = {"chroma": cross_job(chroma_index), "numpy_flat": cross_job(numpy_index)}
+    Config.VECTOR_INDEX_ANN_MIN_SIZE = 0
+    ivf_index = vector_index.NumpyIndex()
+    start = time.perf_counter()
+    ivf_index.search(vectors[0], 10)
+    results["ivf_build_seconds"] = round(time.perf_counter() - start, 3)
+    results["cross_job"]["numpy_ivf"] = cross_job(ivf_index)
+
+    import vector_store
+    vector_store.drop_derived("jobs")
+    rebuilt = vector_index.NumpyIndex()
+    start = time.perf_counter()
+    for job_id in range(1, jobs + 1):
+        rebuilt.load(job_id)
+    results["rebuild_from_chroma_seconds"] = round(time.perf_counter() - start, 3)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.vector_index", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--embeddings", choices=["hash", "huggingface", "onnx"], default="hash")
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.jobs, args.queries, args.embeddings)
+    print(f"{results['jobs']} jobs, {results['chunks']} chunks (stored in {results['store_seconds']}s)",
+          file=sys.stderr)
+    for scope, backends in (("per-job k=3", results["per_job"]), ("cross-job k=10", results["cross_job"])):
+        for name, stats in backends.items():
+            recall = f"  recall@10 {stats['recall_at_10']:.1%}" if "recall_at_10" in stats else ""
+            print(f"{scope:<15} {name:<11} p50 {stats['p50_ms'] * 1000:>9.1f}us  p95 {stats['p95_ms'] * 1000:>9.1f}us"
+                  f"{recall}", file=sys.stderr)
+    print(f"IVF build {results['ivf_build_seconds']}s, numpy files rebuilt from Chroma in "
+          f"{results['rebuild_from_chroma_seconds']}s", file=sys.stderr)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -26,14 +26,115 @@ class Config:
     # File Storage
     UPLOAD_FOLDER: str = os.path.join(os.path.dirname(__file__), "uploads")
     MAX_FILE_SIZE: int = 5 * 1024 * 1024  # 5MB
+    MAX_CONTENT_LENGTH: int = MAX_FILE_SIZE + 64 * 1024  # request body cap: file plus multipart overhead
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024
     ALLOWED_EXTENSIONS: set = {".pdf", ".docx"}
+    RESUME_CACHE_MAX_AGE: int = 3600  # seconds browsers may reuse a downloaded resume (private cache only)
+    # Hand file bodies to the front-end server (Apache mod_xsendfile / lighttpd) instead of Python
+    USE_X_SENDFILE: bool = os.getenv("USE_X_SENDFILE", "False").lower() == "true"
     
     # AI/ML Model Configuration
     EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"  # Sentence Transformer model
+    RESUME_EMBEDDING_MODEL: str = "sentence-transformers/all-mpnet-base-v2"
+    EMBEDDING_BACKEND: str = os.getenv("EMBEDDING_BACKEND", "huggingface")  # huggingface | onnx | hash
+    ONNX_QUANTIZE: bool = os.getenv("ONNX_QUANTIZE", "True").lower() == "true"  # int8 dynamic quantization
+    ONNX_THREADS: int = int(os.getenv("ONNX_THREADS", "0"))  # intra-op threads, 0 = one per core
+    ONNX_CACHE_DIR: str = os.getenv("ONNX_CACHE_DIR", os.path.join(os.path.dirname(__file__), "models", "onnx"))
     EMBEDDING_DEVICE: str = "cuda" if os.getenv("USE_GPU", "False").lower() == "true" else "cpu"
     GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
-    LLM_MODEL: str = "llama3-70b-8192"  # Groq model name
-    
+    GROQ_API_BASE: str = os.getenv("GROQ_API_BASE", "")  # e.g. http://127.0.0.1:8088 for llm_stub_server.py
+    LLM_MODEL: str = "openai/gpt-oss-20b"  # Groq model name
+
+    # Chunking (see agents/chunker.py)
+    CHUNK_STRATEGY: str = os.getenv("CHUNK_STRATEGY", "section")  # section | token | fixed
+    CHUNK_MAX_TOKENS: int = int(os.getenv("CHUNK_MAX_TOKENS", 0))  # 0 = the embedding model's limit
+    CHUNK_OVERLAP_TOKENS: int = int(os.getenv("CHUNK_OVERLAP_TOKENS", 16))
+    CHUNK_MIN_TOKENS: int = 6  # smaller sections (bare headings, title lines) are folded into the next one
+
+    # LLM Gateway (see llm_gateway.py)
+    LLM_MAX_CONCURRENT_REQUESTS: int = int(os.getenv("LLM_MAX_CONCURRENT_REQUESTS", 4))
+    LLM_TIMEOUT_SECONDS: float = float(os.getenv("LLM_TIMEOUT_SECONDS", 60))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", 4))
+    LLM_BACKOFF_BASE: float = 0.5  # seconds
+    LLM_BACKOFF_MAX: float = 20.0  # seconds
+    LLM_DEFAULT_LIMITS: Dict[str, int] = {
+        "max_concurrency": 4,
+        "requests_per_minute": int(os.getenv("LLM_REQUESTS_PER_MINUTE", 30)),
+        "tokens_per_minute": int(os.getenv("LLM_TOKENS_PER_MINUTE", 8000)),
+    }
+    LLM_MODEL_LIMITS: Dict[str, Dict[str, int]] = {}  # per-model overrides of LLM_DEFAULT_LIMITS
+    LLM_MAX_CONCURRENT_PER_JOB: int = int(os.getenv("LLM_MAX_CONCURRENT_PER_JOB", 2))  # match analyses; 0 = no limit
+
+    # Size of the match analysis prompt and answer (see agents/prompt_budget.py)
+    LLM_PROMPT_TOKEN_BUDGET: int = int(os.getenv("LLM_PROMPT_TOKEN_BUDGET", 2000))  # whole prompt, instructions included
+    LLM_PROMPT_JD_SHARE: float = float(os.getenv("LLM_PROMPT_JD_SHARE", 0.4))  # most of the rest the JD chunks may use
+    LLM_MATCH_MAX_TOKENS: int = int(os.getenv("LLM_MATCH_MAX_TOKENS", 1500))  # answer length cap; 0 = no cap
+
+    # Bulk Applications
+    BULK_APPLICATION_MAX_JOBS: int = 20
+    BULK_APPLICATION_WORKERS: int = int(os.getenv("BULK_APPLICATION_WORKERS", 4))
+
+    # Rescoring of existing applications (see rescoring.py)
+    RESCORE_WORKERS: int = int(os.getenv("RESCORE_WORKERS", 4))
+    RESCORE_BATCH_SIZE: int = 25
+    RESCORE_ON_JOB_UPDATE: bool = os.getenv("RESCORE_ON_JOB_UPDATE", "True").lower() == "true"
+
+    # Retrieval of job chunks (see vector_index.py): "numpy" (in-process, memory-mapped) or "chroma"
+    VECTOR_INDEX_BACKEND: str = os.getenv("VECTOR_INDEX_BACKEND", "numpy")
+    VECTOR_INDEX_DIR: str = os.getenv("VECTOR_INDEX_DIR", os.path.join("db", "vector_index"))
+    VECTOR_INDEX_ANN_MIN_SIZE: int = int(os.getenv("VECTOR_INDEX_ANN_MIN_SIZE", 20000))  # chunks; IVF above
+    VECTOR_INDEX_NPROBE: int = int(os.getenv("VECTOR_INDEX_NPROBE", 8))  # IVF lists searched per query
+
+    # Vector store lifecycle (see vector_store.py)
+    VECTOR_SNAPSHOT_DIR: str = os.getenv("VECTOR_SNAPSHOT_DIR", os.path.join("db", "snapshots"))
+    VECTOR_SNAPSHOT_KEEP: int = int(os.getenv("VECTOR_SNAPSHOT_KEEP", 5))  # newest snapshots kept per store
+    VECTOR_COMPACT_DEAD_RATIO: float = float(os.getenv("VECTOR_COMPACT_DEAD_RATIO", 0.2))  # compact above this
+    VECTOR_COMPACT_GRACE_SECONDS: float = 2.0  # before dropping the compacted collection
+    VECTOR_SCRATCH_TTL_SECONDS: int = 3600  # resume scratch chunks older than this are leftovers
+
+    # Bulk job imports (see job_import.py)
+    JOB_IMPORT_MAX_ROWS: int = 5000
+    JOB_IMPORT_MAX_BYTES: int = int(os.getenv("JOB_IMPORT_MAX_BYTES", 64 * 1024 * 1024))  # catalog request body cap
+    JOB_IMPORT_EMBED_BATCH: int = int(os.getenv("JOB_IMPORT_EMBED_BATCH", 256))  # chunks per embed/upsert call
+    JOB_IMPORT_LLM_WORKERS: int = int(os.getenv("JOB_IMPORT_LLM_WORKERS", 8))  # concurrent summarizations
+    JOB_IMPORT_COMMIT_EVERY: int = 25  # summaries per progress commit
+
+    # Bulk resume ingestion (see resume_ingest.py)
+    RESUME_INGEST_ROOT: str = os.getenv("RESUME_INGEST_ROOT", os.path.join(UPLOAD_FOLDER, "ingest"))  # API sources
+    RESUME_INGEST_BATCH_SIZE: int = int(os.getenv("RESUME_INGEST_BATCH_SIZE", 32))  # files per checkpoint
+    RESUME_INGEST_EXTRACT_WORKERS: int = int(os.getenv("RESUME_INGEST_EXTRACT_WORKERS", 0))  # processes; 0 = CPUs
+    RESUME_INGEST_LLM_WORKERS: int = int(os.getenv("RESUME_INGEST_LLM_WORKERS", 4))  # concurrent parses
+
+    # Read cache, conditional requests and compression of job endpoints (see http_cache.py)
+    JOB_CACHE_MAX_AGE: int = int(os.getenv("JOB_CACHE_MAX_AGE", 30))  # Cache-Control max-age, seconds
+    JOB_CACHE_MAX_ENTRIES: int = 1024  # cached responses per process (least recently used evicted)
+    HTTP_COMPRESS_MIN_BYTES: int = 1024  # smaller bodies are sent uncompressed
+
+    # Job recommendations for applicants (see recommender.py)
+    RECOMMENDATION_DEFAULT_K: int = 10
+    RECOMMENDATION_MAX_K: int = 50
+
+    # Reuse of LLM match analyses for near-duplicate profiles (see analysis_cache.py)
+    MATCH_CACHE_ENABLED: bool = os.getenv("MATCH_CACHE_ENABLED", "True").lower() == "true"
+    MATCH_CACHE_MAX_DISTANCE: float = float(os.getenv("MATCH_CACHE_MAX_DISTANCE", "0.02"))  # cosine distance
+    MATCH_CACHE_MAX_ENTRIES_PER_JOB: int = 200
+
+    # Admission control of expensive endpoints (see admission.py); limits are per process
+    ADMISSION_CONTROL_ENABLED: bool = os.getenv("ADMISSION_CONTROL_ENABLED", "True").lower() == "true"
+    ADMISSION_POOLS: Dict[str, Dict[str, float]] = {
+        "resume_upload": {"max_concurrent": int(os.getenv("ADMISSION_UPLOAD_CONCURRENCY", 4)),
+                          "max_queue": 16, "queue_timeout": 20.0},
+        "application": {"max_concurrent": int(os.getenv("ADMISSION_APPLICATION_CONCURRENCY", 4)),
+                        "max_queue": 16, "queue_timeout": 20.0},
+        "job_write": {"max_concurrent": 2, "max_queue": 4, "queue_timeout": 30.0},
+    }
+    ADMISSION_USER_MAX_IN_FLIGHT: int = int(os.getenv("ADMISSION_USER_MAX_IN_FLIGHT", 2))  # per user and pool
+    ADMISSION_USER_REQUESTS_PER_MINUTE: int = int(os.getenv("ADMISSION_USER_REQUESTS_PER_MINUTE", 20))
+
+    # Server-sent progress events (see progress.py)
+    PROGRESS_HEARTBEAT_SECONDS: float = 15.0  # keep-alive comment on idle streams
+    PROGRESS_RETENTION_SECONDS: int = 600  # finished operations answer retries and reconnects this long
+
     @classmethod
     def validate_groq_key(cls):
         """Validate that GROQ API key is set"""
@@ -49,6 +150,14 @@ class Config:
     EXPERIENCE_WEIGHT: float = 0.30
     EDUCATION_WEIGHT: float = 0.15
     CERTIFICATION_WEIGHT: float = 0.10
+
+    # Scoring mode: "hybrid" = semantic blended with LLM analysis, "local" = semantic
+    # + rule-based scores with no LLM call (see agents/local_scorer.py).
+    # Jobs may override this with their own scoring_mode.
+    SCORING_MODE: str = os.getenv("SCORING_MODE", "hybrid")
+    SCORING_MODES: tuple = ("hybrid", "local")
+    HYBRID_SEMANTIC_WEIGHT: float = 0.7  # share of the hybrid score taken from embedding similarity (rest: LLM)
+    LOCAL_SEMANTIC_WEIGHT: float = 0.5  # share of the local score taken from embedding similarity
     
     # Email Configuration
     SMTP_CONFIG: Dict[str, Any] = {
@@ -105,6 +214,16 @@ class ProductionConfig(Config):
     DEBUG = False
     PROPAGATE_EXCEPTIONS = True
 
+    # gunicorn profile (gunicorn.conf.py)
+    BIND: str = os.getenv("BIND", "0.0.0.0:5000")
+    WORKERS: int = int(os.getenv("WEB_WORKERS", "2"))
+    THREADS_PER_WORKER: int = int(os.getenv("WEB_THREADS", "4"))
+    PRELOAD_MODELS: bool = os.getenv("PRELOAD_MODELS", "True").lower() == "true"  # load once, share copy-on-write
+    INFERENCE_THREADS_PER_WORKER: int = int(os.getenv("INFERENCE_THREADS_PER_WORKER", "0"))  # 0 = cores / workers
+    WORKER_TIMEOUT: int = 120  # LLM-backed requests can take a while
+    GRACEFUL_TIMEOUT: int = 30
+    PIDFILE: str = os.path.join(os.path.dirname(__file__), "gunicorn.pid")
+
 
 # Configuration selector
 config = {
@@ -0,0 +1,197 @@
+# embeddings.py
+"""
+Embedding model factory shared by the agents.
+
+Models are loaded once per process and reused. `Config.EMBEDDING_BACKEND`
+selects the implementation:
+    huggingface - sentence-transformers models via HuggingFaceEmbeddings
+    onnx        - the same models exported to ONNX Runtime on CPU, int8
+                  dynamically quantized unless Config.ONNX_QUANTIZE is off
+    hash        - deterministic feature-hashing vectors (no model download),
+                  used for offline runs and benchmarks
+"""
+
+import os
+import re
+import math
+import hashlib
+import threading
+from array import array
+from langchain_core.embeddings import Embeddings
+from config import Config
+from metrics import span
+
+# Output dimension of the models used in this project
+MODEL_DIMENSIONS = {
+    "all-MiniLM-L6-v2": 384,
+    "sentence-transformers/all-MiniLM-L6-v2": 384,
+    "all-mpnet-base-v2": 768,
+    "sentence-transformers/all-mpnet-base-v2": 768,
+}
+
+# Maximum input length (word-piece tokens) of each model; longer text is truncated
+MODEL_MAX_TOKENS = {
+    "all-MiniLM-L6-v2": 256,
+    "sentence-transformers/all-MiniLM-L6-v2": 256,
+    "all-mpnet-base-v2": 384,
+    "sentence-transformers/all-mpnet-base-v2": 384,
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+class HashingEmbeddings(Embeddings):
+    """Deterministic bag-of-words embeddings built with the hashing trick"""
+
+    def __init__(self, dimension=384):
+        self.dimension = dimension
+
+    def _embed(self, text):
+        vector = [0.0] * self.dimension
+        for token in TOKEN_PATTERN.findall(text.lower()):
+            digest = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+            vector[digest % self.dimension] += 1.0 if (digest >> 32) & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector))
+        return [v / norm for v in vector] if norm else vector
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+class OnnxEmbeddings(Embeddings):
+    """
+    Sentence-transformers model (mean pooling, L2 normalized) run through
+    ONNX Runtime. The model is exported from the PyTorch checkpoint once and,
+    when quantize is set, its weights dynamically quantized to int8; both
+    files are cached under Config.ONNX_CACHE_DIR.
+    """
+
+    def __init__(self, model_name, quantize=True, threads=0, cache_dir=None, batch_size=32):
+        from transformers import AutoTokenizer
+
+        self.model_name = model_name
+        self.max_length = MODEL_MAX_TOKENS.get(model_name, 256)
+        self.batch_size = batch_size
+        self.source = model_name if os.path.isdir(model_name) or "/" in model_name \
+            else f"sentence-transformers/{model_name}"
+        self.cache_dir = os.path.join(cache_dir or Config.ONNX_CACHE_DIR,
+                                      re.sub(r"[^A-Za-z0-9_.-]+", "_", self.source.strip("/")))
+        self.tokenizer = AutoTokenizer.from_pretrained(self.source)
+        self.model_path = self._model_file(quantize)
+        self.threads = threads
+        self.session_pid = None
+        self.session_lock = threading.Lock()
+        self.input_names = {i.name for i in self._session().get_inputs()}
+
+    def _session(self):
+        # ONNX Runtime's thread pool does not survive a fork: each worker opens its own session
+        with self.session_lock:
+            if self.session_pid != os.getpid():
+                import onnxruntime as ort
+                options = ort.SessionOptions()
+                options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+                if self.threads:
+                    options.intra_op_num_threads = self.threads
+                self.session = ort.InferenceSession(self.model_path, options, providers=["CPUExecutionProvider"])
+                self.session_pid = os.getpid()
+            return self.session
+
+    def _model_file(self, quantize):
+        """Path of the (exported, optionally quantized) ONNX model, building it if missing"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fp32_path = os.path.join(self.cache_dir, "model.onnx")
+        if not os.path.exists(fp32_path):
+            self._export(fp32_path)
+        if not quantize:
+            return fp32_path
+        int8_path = os.path.join(self.cache_dir, "model_qint8.onnx")
+        if not os.path.exists(int8_path):
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+            tmp_path = f"{int8_path}.{os.getpid()}.tmp"
+            quantize_dynamic(fp32_path, tmp_path, weight_type=QuantType.QInt8)
+            os.replace(tmp_path, int8_path)
+        return int8_path
+
+    def _export(self, path):
+        import torch
+        from transformers import AutoModel
+        model = AutoModel.from_pretrained(self.source)
+        model.eval()
+        sample = self.tokenizer(["export sample"], return_tensors="pt")
+        names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+        axes = {name: {0: "batch", 1: "sequence"} for name in names}
+        axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with torch.no_grad():
+            torch.onnx.export(model, tuple(sample[name] for name in names), tmp_path,
+                              input_names=names, output_names=["last_hidden_state"],
+                              dynamic_axes=axes, opset_version=17, dynamo=False)
+        os.replace(tmp_path, path)
+
+    def _embed(self, texts):
+        import numpy as np
+        # Batch texts of similar length together to keep padding down
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+        vectors = [None] * len(texts)
+        for start in range(0, len(order), self.batch_size):
+            indices = order[start:start + self.batch_size]
+            batch = self.tokenizer([texts[i] for i in indices], padding=True, truncation=True,
+                                   max_length=self.max_length, return_tensors="np")
+            feed = {name: batch[name].astype(np.int64) for name in self.input_names}
+            hidden = self._session().run(None, feed)[0]
+            mask = batch["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            for i, vector in zip(indices, pooled.tolist()):
+                vectors[i] = vector
+        return vectors
+
+    def embed_documents(self, texts):
+        return self._embed(list(texts)) if texts else []
+
+    def embed_query(self, text):
+        return self._embed([text])[0]
+
+
+def vector_to_blob(vector):
+    """Pack an embedding as float32 bytes for storage in SQLite"""
+    return array("f", vector).tobytes()
+
+
+def blob_to_vector(blob):
+    vector = array("f")
+    vector.frombytes(blob)
+    return vector.tolist()
+
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def load_embeddings(model_name, backend):
+    """Instantiate an embedding model for the given backend (uncached)"""
+    if backend == "hash":
+        return HashingEmbeddings(MODEL_DIMENSIONS.get(model_name, 384))
+    if backend == "huggingface":
+        from langchain_community.embeddings import HuggingFaceEmbeddings
+        return HuggingFaceEmbeddings(
+            model_name=model_name,
+            model_kwargs={"device": Config.EMBEDDING_DEVICE}
+        )
+    if backend == "onnx":
+        return OnnxEmbeddings(model_name, quantize=Config.ONNX_QUANTIZE, threads=Config.ONNX_THREADS)
+    raise ValueError(f"Unknown embedding backend: {backend}")
+
+
+def get_embeddings(model_name=None):
+    """Return the shared embedding model for model_name (default Config.EMBEDDING_MODEL)"""
+    model_name = model_name or Config.EMBEDDING_MODEL
+    key = (Config.EMBEDDING_BACKEND, model_name)
+    with _models_lock:
+        if key not in _models:
+            with span("embedding_model_load"):
+                _models[key] = load_embeddings(model_name, Config.EMBEDDING_BACKEND)
+        return _models[key]
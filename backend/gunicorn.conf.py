@@ -0,0 +1,52 @@
+# gunicorn.conf.py
+"""
+Production server profile (settings in config.ProductionConfig):
+
+    cd backend && gunicorn -c gunicorn.conf.py wsgi:app
+
+A pre-fork server with WEB_WORKERS processes of WEB_THREADS threads each.
+With PRELOAD_MODELS the master imports wsgi, which loads the embedding
+models, before forking: workers share the weights copy-on-write, so adding
+workers adds request-handling memory, not another copy of every model.
+
+Graceful reload: `kill -HUP $(cat gunicorn.pid)` replaces the workers after
+they finish their current requests; new workers fork from the master's
+already-loaded models. To pick up new code or models with preloading on,
+start a new master with `kill -USR2`, then stop the old one with
+`kill -QUIT <old master pid>` once the new workers are up.
+"""
+
+import os
+import gc
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from config import ProductionConfig
+
+# Tokenizers used before a fork otherwise warn and disable their own threads in every worker
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+os.environ.setdefault("FLASK_ENV", "production")
+
+bind = ProductionConfig.BIND
+workers = ProductionConfig.WORKERS
+threads = ProductionConfig.THREADS_PER_WORKER
+worker_class = "gthread"
+preload_app = ProductionConfig.PRELOAD_MODELS
+timeout = ProductionConfig.WORKER_TIMEOUT
+graceful_timeout = ProductionConfig.GRACEFUL_TIMEOUT
+pidfile = ProductionConfig.PIDFILE
+accesslog = "-"
+
+
+def when_ready(server):
+    # Keep the collector from touching (and so un-sharing) objects loaded before the fork
+    gc.collect()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Split the cores between workers instead of every worker using all of them
+    inference_threads = (ProductionConfig.INFERENCE_THREADS_PER_WORKER
+                         or max(1, (os.cpu_count() or 1) // server.cfg.workers))
+    if "torch" in sys.modules:
+        sys.modules["torch"].set_num_threads(inference_threads)
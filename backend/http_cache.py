@@ -0,0 +1,133 @@
+# http_cache.py
+"""
+Read-path cache for the public job endpoints (GET /api/jobs and
+GET /api/jobs/<id>).
+
+Responses are cached in process per key, e.g. ("job", id, version). The
+key includes the job's version (jobs.version, bumped by a trigger on
+every change to what the endpoints return), so a stale entry can never
+be served, by this process or any other. add_job and update_job also
+drop the cached entries right away. A request costs one small version
+query; a hit skips the job query and the JSON serialization.
+
+Every cached response carries an ETag, Cache-Control (public,
+Config.JOB_CACHE_MAX_AGE) and Vary: Accept-Encoding. If-None-Match is
+answered with 304. Bodies of at least Config.HTTP_COMPRESS_MIN_BYTES are
+sent gzip- or brotli-encoded (brotli only when the optional brotli
+package is installed), whichever the client accepts and prefers. Each
+encoding is compressed once per entry.
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from flask import current_app, request, Response
+from config import Config
+from metrics import registry, span
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+requests_total = registry.counter(
+    "http_cache_requests_total", "Cached read endpoint requests by cache and outcome (hit, miss, not_modified)")
+encoded_bytes_total = registry.counter(
+    "http_cache_encoded_bytes_total", "Response bytes sent by cache and content encoding (identity, gzip, br)")
+
+ENCODERS = {"gzip": lambda body: gzip.compress(body, compresslevel=6, mtime=0)}
+if brotli is not None:
+    ENCODERS["br"] = lambda body: brotli.compress(body, quality=5)
+
+
+class Entry:
+    """One serialized response and its compressed variants"""
+
+    def __init__(self, body):
+        self.body = body
+        self.etag = hashlib.sha256(body).hexdigest()[:20]
+        self.encoded = {"identity": body}
+        self.lock = threading.Lock()
+
+    def encode(self, encoding):
+        if encoding not in self.encoded:
+            with self.lock, span("http_compress"):
+                if encoding not in self.encoded:
+                    self.encoded[encoding] = ENCODERS[encoding](self.body)
+        return self.encoded[encoding]
+
+
+_entries = OrderedDict()  # key -> Entry, least recently used first
+_entries_lock = threading.Lock()
+
+
+def invalidate(prefix=None):
+    """Drop cached entries whose key starts with prefix (all when None)"""
+    with _entries_lock:
+        for key in [key for key in _entries if prefix is None or key[:len(prefix)] == prefix]:
+            del _entries[key]
+
+
+def _lookup(key):
+    with _entries_lock:
+        entry = _entries.get(key)
+        if entry is not None:
+            _entries.move_to_end(key)
+        return entry
+
+
+def _store(key, entry):
+    with _entries_lock:
+        _entries[key] = entry
+        _entries.move_to_end(key)
+        while len(_entries) > Config.JOB_CACHE_MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+
+def negotiate(body_size):
+    """Content encoding for this request: the best accepted of br and gzip, or identity"""
+    if body_size < Config.HTTP_COMPRESS_MIN_BYTES:
+        return "identity"
+    offered = [name for name in ("br", "gzip") if name in ENCODERS]
+    return request.accept_encodings.best_match(offered) or "identity"
+
+
+def _etag_matches(entry):
+    # Encoded variants carry a suffix ("...-gzip") but describe the same content
+    tags = [tag.strip().removeprefix("W/").strip('"') for tag in request.headers.get("If-None-Match", "").split(",")]
+    return "*" in tags or any(tag.split("-")[0] == entry.etag for tag in tags)
+
+
+def cached_json(cache, key, build):
+    """
+    JSON response for a read endpoint, from the cache when key is known
+
+    cache names the endpoint (metrics label and invalidation prefix); key
+    must change whenever the response would; build() returns the data to
+    serialize on a miss.
+    """
+    key = (cache,) + tuple(key)
+    entry = _lookup(key)
+    outcome = "hit"
+    if entry is None:
+        outcome = "miss"
+        entry = Entry(current_app.json.dumps(build()).encode() + b"\n")
+        _store(key, entry)
+
+    headers = {
+        "Cache-Control": f"public, max-age={Config.JOB_CACHE_MAX_AGE}",
+        "Vary": "Accept-Encoding",
+    }
+    encoding = negotiate(len(entry.body))
+    headers["ETag"] = f'"{entry.etag}"' if encoding == "identity" else f'"{entry.etag}-{encoding}"'
+    if _etag_matches(entry):
+        requests_total.inc(cache=cache, outcome="not_modified")
+        return Response(status=304, headers=headers)
+
+    requests_total.inc(cache=cache, outcome=outcome)
+    body = entry.encode(encoding)
+    encoded_bytes_total.inc(len(body), cache=cache, encoding=encoding)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(body, status=200, mimetype="application/json", headers=headers)
@@ -0,0 +1,284 @@
+# job_import.py
+"""
+Bulk import of job descriptions from a JSONL or CSV catalog.
+
+Each row needs a title and a description; scoring_mode and status are
+optional. An import runs in three stages:
+
+1. validate every row and insert the valid ones into jobs in a single
+   transaction, closed for now
+2. chunk all descriptions, embed the chunks in batches of
+   Config.JOB_IMPORT_EMBED_BATCH and store them in the job index
+   (vector_index.py) batch by batch, then the jobs' vectors for
+   recommendations (recommender.py); only then are the jobs meant to be
+   open opened, so a failed import never leaves open jobs without chunks
+3. summarize each job with the LLM on a pool of Config.JOB_IMPORT_LLM_WORKERS
+   threads (the gateway still applies its rate limits), committing the
+   summaries as they arrive
+
+Rows that fail validation or summarization are listed in the import's
+errors with their line number; the other rows are imported. Jobs whose
+summary failed keep summarized_data NULL.
+
+    python -m job_import catalog.jsonl [--format csv] [--db PATH]
+"""
+
+import io
+import os
+import csv
+import sys
+import json
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from config import Config
+from metrics import registry, span
+from vector_index import get_job_index
+from agents.shortlister import job_embeddings
+from agents.jd_summarizer import chunk_jd, summarize_stored_jd, SUMMARY_QUERY
+from rescoring import connect
+import recommender
+
+imported_rows_total = registry.counter(
+    "job_import_rows_total", "Catalog rows processed by job imports, by outcome")
+
+FORMATS = ("jsonl", "csv")
+# Imports are serialized so two catalogs never compete for the LLM and embedding model
+_import_lock = threading.Lock()
+
+
+class ImportFormatError(ValueError):
+    """The catalog cannot be read at all (as opposed to individual bad rows)"""
+
+
+def detect_format(filename, content_type=None):
+    name = (filename or "").lower()
+    if name.endswith(".csv") or (content_type or "").startswith("text/csv"):
+        return "csv"
+    return "jsonl"
+
+
+def read_rows(text, fmt):
+    """[(line number, row dict or None, parse error or None)] of a catalog"""
+    if fmt not in FORMATS:
+        raise ImportFormatError(f"format must be one of {', '.join(FORMATS)}")
+    rows = []
+    if fmt == "csv":
+        reader = csv.DictReader(io.StringIO(text))
+        if not reader.fieldnames:
+            raise ImportFormatError("CSV catalog has no header row")
+        end_of_previous = reader.line_num
+        for row in reader:
+            # Quoted descriptions span several lines; report where the record starts
+            rows.append((end_of_previous + 1, {k.strip().lower(): v for k, v in row.items() if k}, None))
+            end_of_previous = reader.line_num
+        return rows
+    for line_number, line in enumerate(text.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            rows.append((line_number, None, f"invalid JSON: {e.msg}"))
+            continue
+        if not isinstance(row, dict):
+            rows.append((line_number, None, "expected a JSON object"))
+        else:
+            rows.append((line_number, row, None))
+    return rows
+
+
+def validate_row(row):
+    """(job values, error message or None) of one catalog row"""
+    title = str(row.get("title") or "").strip()
+    description = str(row.get("description") or "").strip()
+    scoring_mode = str(row.get("scoring_mode") or "").strip() or None
+    status = str(row.get("status") or "").strip() or "open"
+    if not title or not description:
+        return None, "title and description are required"
+    if scoring_mode is not None and scoring_mode not in Config.SCORING_MODES:
+        return None, f"scoring_mode must be one of {', '.join(Config.SCORING_MODES)}"
+    if status not in ("open", "closed"):
+        return None, "status must be open or closed"
+    return {"title": title, "description": description, "scoring_mode": scoring_mode, "status": status}, None
+
+
+def create_import(db, filename=None):
+    """Record a new import (commits) and return its id"""
+    cursor = db.execute('INSERT INTO job_imports (filename) VALUES (?)', [filename])
+    db.commit()
+    return cursor.lastrowid
+
+
+def get_import(db, import_id):
+    row = db.execute('SELECT * FROM job_imports WHERE id = ?', [import_id]).fetchone()
+    if row is None:
+        return None
+    result = dict(row)
+    result['errors'] = json.loads(result['errors'] or '[]')
+    result['job_ids'] = json.loads(result['job_ids'] or '[]')
+    return result
+
+
+def _update(db, import_id, **fields):
+    assignments = ", ".join(f"{name} = ?" for name in fields)
+    db.execute(f"UPDATE job_imports SET {assignments}, updated_at = datetime('now') WHERE id = ?",
+               list(fields.values()) + [import_id])
+    db.commit()
+
+
+def insert_jobs(db, jobs):
+    """Insert validated jobs in one transaction; returns their ids in order"""
+    ids = []
+    with span("job_import_insert"):
+        for job in jobs:
+            cursor = db.execute('INSERT INTO jobs (title, description, scoring_mode, status) VALUES (?, ?, ?, ?)',
+                                [job['title'], job['description'], job['scoring_mode'], job['status']])
+            ids.append(cursor.lastrowid)
+        db.commit()
+    return ids
+
+
+def store_chunks(job_ids, descriptions):
+    """
+    Chunk every description, embed the chunks of about
+    Config.JOB_IMPORT_EMBED_BATCH at a time and store each batch of jobs in
+    the job index. Returns the chunk count of each job.
+    """
+    index, embeddings = get_job_index(), job_embeddings()
+    counts, pending = [], []
+
+    def flush():
+        texts = [text for _, job_texts, _ in pending for text in job_texts]
+        with span("embed"):
+            vectors = iter(embeddings.embed_documents(texts))
+        index.replace([(job_id, job_texts, job_metadatas, [next(vectors) for _ in job_texts])
+                       for job_id, job_texts, job_metadatas in pending])
+        pending.clear()
+
+    for job_id, description in zip(job_ids, descriptions):
+        job_texts, job_metadatas = chunk_jd(description, job_id)
+        pending.append((job_id, job_texts, job_metadatas))
+        counts.append(len(job_texts))
+        if sum(len(texts) for _, texts, _ in pending) >= Config.JOB_IMPORT_EMBED_BATCH:
+            flush()
+    if pending:
+        flush()
+    return counts
+
+
+def _summarize(job_id, chunk_count, query_vec):
+    summary = summarize_stored_jd(job_id, chunk_count, query_vec=query_vec)
+    if "error" in summary:
+        raise RuntimeError(summary["error"])
+    return summary
+
+
+def run_import(import_id, text, fmt, db_path=None, on_progress=None):
+    """
+    Execute an import synchronously. on_progress, when given, is called with
+    the import dict after each committed batch of summaries.
+    """
+    with _import_lock:
+        db = connect(db_path)
+        try:
+            _update(db, import_id, status='running')
+            errors, valid, lines = [], [], []
+            for line_number, row, error in read_rows(text, fmt):
+                job = None
+                if error is None:
+                    job, error = validate_row(row)
+                if error is not None:
+                    errors.append({"line": line_number, "title": (row or {}).get("title"), "stage": "validate",
+                                   "message": error})
+                    imported_rows_total.inc(outcome="invalid")
+                    continue
+                valid.append(job)
+                lines.append(line_number)
+            if len(valid) > Config.JOB_IMPORT_MAX_ROWS:
+                raise ImportFormatError(f"At most {Config.JOB_IMPORT_MAX_ROWS} jobs per import")
+
+            # Closed until their chunks are stored (applications and recommendations need them)
+            job_ids = insert_jobs(db, [dict(job, status='closed') for job in valid])
+            _update(db, import_id, total=len(valid) + len(errors), failed=len(errors),
+                    errors=json.dumps(errors), job_ids=json.dumps(job_ids))
+
+            with span("job_import_embed"):
+                chunk_counts = store_chunks(job_ids, [job['description'] for job in valid])
+                recommender.refresh_jobs(db, job_ids)
+            db.executemany("UPDATE jobs SET status = 'open' WHERE id = ?",
+                           [[job_id] for job_id, job in zip(job_ids, valid) if job['status'] == 'open'])
+            db.commit()
+            query_vec = job_embeddings().embed_query(SUMMARY_QUERY)
+
+            imported, failed = 0, len(errors)
+            with ThreadPoolExecutor(max_workers=Config.JOB_IMPORT_LLM_WORKERS) as pool:
+                futures = {pool.submit(_summarize, job_id, count, query_vec): (job_id, line, job)
+                           for job_id, count, line, job in zip(job_ids, chunk_counts, lines, valid)}
+                for done, future in enumerate(as_completed(futures), 1):
+                    job_id, line_number, job = futures[future]
+                    try:
+                        db.execute('UPDATE jobs SET summarized_data = ? WHERE id = ?',
+                                   [json.dumps(future.result()), job_id])
+                        imported += 1
+                        imported_rows_total.inc(outcome="imported")
+                    except Exception as e:
+                        print(f"Error summarizing imported job {job_id}: {e}")
+                        errors.append({"line": line_number, "title": job['title'], "job_id": job_id,
+                                       "stage": "summarize", "message": str(e)})
+                        failed += 1
+                        imported_rows_total.inc(outcome="failed")
+                    if done % Config.JOB_IMPORT_COMMIT_EVERY == 0 or done == len(futures):
+                        _update(db, import_id, imported=imported, failed=failed, errors=json.dumps(errors))
+                        if on_progress:
+                            on_progress(get_import(db, import_id))
+
+            _update(db, import_id, status='completed')
+            return get_import(db, import_id)
+        except Exception as e:
+            print(f"Error in job import {import_id}: {e}")
+            db.rollback()
+            _update(db, import_id, status='failed', error=str(e))
+            return get_import(db, import_id)
+        finally:
+            db.close()
+
+
+def start_import(db, text, fmt, filename=None, db_path=None):
+    """Create an import and execute it on a background thread; returns the import id"""
+    import_id = create_import(db, filename)
+    thread = threading.Thread(target=run_import, args=(import_id, text, fmt, db_path),
+                              name=f"job-import-{import_id}", daemon=True)
+    thread.start()
+    return import_id
+
+
+def _print_progress(job_import):
+    print(f"   import {job_import['id']}: {job_import['imported']}/{job_import['total']} imported, "
+          f"{job_import['failed']} failed", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m job_import", description="Import a catalog of job descriptions")
+    parser.add_argument("path", help="JSONL or CSV file with title, description[, scoring_mode, status]")
+    parser.add_argument("--format", choices=FORMATS, help="default: from the file extension")
+    parser.add_argument("--db", help="database path (default Config.DATABASE_PATH)")
+    args = parser.parse_args(argv)
+
+    with open(args.path, encoding="utf-8-sig") as f:
+        text = f.read()
+    db = connect(args.db)
+    import_id = create_import(db, os.path.basename(args.path))
+    db.close()
+    job_import = run_import(import_id, text, args.format or detect_format(args.path), args.db,
+                            on_progress=_print_progress)
+    for error in job_import['errors']:
+        print(f"   line {error['line']} ({error['stage']}): {error['message']}", file=sys.stderr)
+    print(f"{'✅' if job_import['status'] == 'completed' else '❌'} import {import_id} {job_import['status']}"
+          + (f": {job_import['error']}" if job_import['error'] else ""), file=sys.stderr)
+    _print_progress(job_import)
+    return 0 if job_import['status'] == 'completed' and not job_import['failed'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+# llm_gateway.py
+"""
+Shared gateway for every Groq chat completion made by the agents.
+
+One pooled AsyncGroq client runs on a background event loop. Calls are
+limited by a global and a per-model concurrency cap and by per-model
+token buckets (requests and tokens per minute), retried with jittered
+exponential backoff on 429/5xx, and identical in-flight requests are
+coalesced into a single upstream call.
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+import hashlib
+import threading
+from groq import AsyncGroq, APIConnectionError, APITimeoutError, APIStatusError
+from config import Config
+from metrics import registry
+
+llm_upstream_seconds = registry.histogram(
+    "llm_upstream_duration_seconds", "Latency of individual upstream LLM API calls")
+llm_retries = registry.counter("llm_retries_total", "LLM calls retried after a retryable error")
+llm_coalesced = registry.counter("llm_coalesced_total", "LLM calls served by an identical in-flight request")
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at `rate` tokens per second"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self, amount=1):
+        # Never ask for more than the bucket can hold or we would wait forever
+        amount = min(amount, self.capacity)
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token) used for rate limiting"""
+    return max(1, len(text) // 4)
+
+
+def is_retryable(error):
+    if isinstance(error, (APIConnectionError, APITimeoutError)):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+class LLMGateway:
+    """Process-wide LLM client; use get_gateway() rather than instantiating directly"""
+
+    def __init__(self, api_key=None, base_url=None):
+        self.api_key = api_key or Config.GROQ_API_KEY
+        self.base_url = base_url or Config.GROQ_API_BASE or None
+        self.loop = None
+        self.pid = None
+        self.start_lock = threading.Lock()
+        self.stats = {"requests": 0, "coalesced": 0, "retries": 0, "failures": 0}
+
+    # Event loop management
+    def _ensure_started(self):
+        # A forked worker inherits the object but not the loop thread
+        with self.start_lock:
+            if self.loop is not None and self.pid == os.getpid():
+                return
+            self.pid = os.getpid()
+            self.loop = asyncio.new_event_loop()
+            ready = threading.Event()
+            thread = threading.Thread(target=self._run_loop, args=(ready,), name="llm-gateway", daemon=True)
+            thread.start()
+            ready.wait()
+
+    def _run_loop(self, ready):
+        asyncio.set_event_loop(self.loop)
+        self.client = AsyncGroq(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            timeout=Config.LLM_TIMEOUT_SECONDS,
+            max_retries=0,  # retries are handled here with jitter
+        )
+        self.global_slots = asyncio.Semaphore(Config.LLM_MAX_CONCURRENT_REQUESTS)
+        self.model_slots = {}
+        self.request_buckets = {}
+        self.token_buckets = {}
+        self.inflight = {}
+        ready.set()
+        self.loop.run_forever()
+
+    def _model_limits(self, model):
+        if model not in self.model_slots:
+            limits = {**Config.LLM_DEFAULT_LIMITS, **Config.LLM_MODEL_LIMITS.get(model, {})}
+            self.model_slots[model] = asyncio.Semaphore(limits["max_concurrency"])
+            rpm = limits["requests_per_minute"]
+            tpm = limits["tokens_per_minute"]
+            self.request_buckets[model] = TokenBucket(rpm / 60.0, rpm)
+            self.token_buckets[model] = TokenBucket(tpm / 60.0, tpm)
+        return self.model_slots[model], self.request_buckets[model], self.token_buckets[model]
+
+    # Public API
+    def complete(self, prompt, model=None, temperature=0.0, system=None, max_tokens=None):
+        """Blocking chat completion; safe to call from any request thread"""
+        return self.complete_many([prompt], model, temperature, system, max_tokens)[0]
+
+    def complete_many(self, prompts, model=None, temperature=0.0, system=None, max_tokens=None):
+        """Run several prompts concurrently and return their texts in order"""
+        self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(
+            self._complete_all(prompts, model, temperature, system, max_tokens), self.loop
+        )
+        return future.result()
+
+    async def _complete_all(self, prompts, model, temperature, system, max_tokens):
+        return await asyncio.gather(*[
+            self.acomplete(p, model, temperature, system, max_tokens) for p in prompts
+        ])
+
+    async def acomplete(self, prompt, model=None, temperature=0.0, system=None, max_tokens=None):
+        """Chat completion on the gateway loop, coalescing identical in-flight calls"""
+        model = model or Config.LLM_MODEL
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+
+        key = hashlib.sha256(json.dumps(
+            [model, temperature, max_tokens, messages], sort_keys=True
+        ).encode()).hexdigest()
+        if key in self.inflight:
+            self.stats["coalesced"] += 1
+            llm_coalesced.inc(model=model)
+            return await asyncio.shield(self.inflight[key])
+
+        task = self.loop.create_task(self._request(model, messages, temperature, max_tokens))
+        self.inflight[key] = task
+        task.add_done_callback(lambda _: self.inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _request(self, model, messages, temperature, max_tokens):
+        model_slots, request_bucket, token_bucket = self._model_limits(model)
+        tokens = sum(estimate_tokens(m["content"]) for m in messages) + (max_tokens or 0)
+        kwargs = {"model": model, "messages": messages, "temperature": temperature}
+        if max_tokens:
+            kwargs["max_tokens"] = max_tokens
+
+        for attempt in range(Config.LLM_MAX_RETRIES + 1):
+            await request_bucket.acquire()
+            await token_bucket.acquire(tokens)
+            try:
+                async with self.global_slots, model_slots:
+                    self.stats["requests"] += 1
+                    start = time.perf_counter()
+                    try:
+                        response = await self.client.chat.completions.create(**kwargs)
+                    finally:
+                        llm_upstream_seconds.observe(time.perf_counter() - start, model=model)
+                return response.choices[0].message.content or ""
+            except Exception as e:
+                if attempt >= Config.LLM_MAX_RETRIES or not is_retryable(e):
+                    self.stats["failures"] += 1
+                    raise
+                self.stats["retries"] += 1
+                llm_retries.inc(model=model)
+                await asyncio.sleep(self._backoff(attempt, e))
+
+    def _backoff(self, attempt, error):
+        """Full-jitter exponential backoff, honouring Retry-After when the server sends it"""
+        delay = min(Config.LLM_BACKOFF_MAX, Config.LLM_BACKOFF_BASE * (2 ** attempt))
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return float(retry_after) + random.uniform(0, Config.LLM_BACKOFF_BASE)
+            except ValueError:
+                pass
+        return random.uniform(0, delay)
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway():
+    """Return the process-wide LLM gateway"""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway()
+        return _gateway
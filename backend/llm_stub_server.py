@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Groq chat completions API.
+
+Answers POST /openai/v1/chat/completions with deterministic content derived
+from the prompt, so the LLM gateway and the agents can be exercised without
+network access or API spend. Failures, latency and malformed JSON answers
+can be injected to test retries, rate limiting and output repair; GET /stats
+reports how many calls were received.
+
+Usage:
+    python llm_stub_server.py --port 8088 --latency 0.2 --error-rate 0.1 --malformed-rate 0.2
+    GROQ_API_BASE=http://127.0.0.1:8088 python app.py
+"""
+
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+def fake_completion(prompt):
+    """Deterministic response text shaped like what each agent prompt asks for"""
+    digest = int(hashlib.sha256(prompt.encode()).hexdigest(), 16)
+    if '"match_score"' in prompt:
+        return json.dumps({
+            "match_score": digest % 101,
+            "strengths": [{"category": "skills", "description": "Relevant skills", "relevance": "Matches requirements"}],
+            "gaps": [{"category": "experience", "description": "Limited domain exposure", "importance": "medium"}],
+            "detailed_analysis": "Stub analysis generated locally.",
+            "recommendation": "interview"
+        })
+    if '"job_title"' in prompt:
+        return json.dumps({
+            "job_title": "Software Engineer",
+            "required_skills": ["python", "sql"],
+            "preferred_skills": ["docker"],
+            "experience_required": f"{digest % 6} years",
+            "education": "Bachelor's degree",
+            "responsibilities": ["Build services"],
+            "company_info": ""
+        })
+    return f"Stub answer {digest % 10000}"
+
+
+def malform(content):
+    """JSON answer damaged the ways real models damage it (fences, prose, trailing commas, truncation)"""
+    defect = random.choice(["fenced", "trailing_comma", "truncated", "prose"])
+    if defect == "fenced":
+        return f"```json\n{json.dumps(json.loads(content), indent=2)}\n```"
+    if defect == "trailing_comma":
+        return content[:-1] + ",}"
+    if defect == "truncated":
+        return content[:int(len(content) * 0.8)]
+    return "Here is the analysis you asked for:\n" + content + "\nLet me know if you need more detail."
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server_version = "GroqStub/1.0"
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            with self.server.lock:
+                self._send_json(200, dict(self.server.stats))
+        else:
+            self._send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        if not self.path.endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        with self.server.lock:
+            self.server.stats["requests"] += 1
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if random.random() < self.server.error_rate:
+            with self.server.lock:
+                self.server.stats["rate_limited"] += 1
+            self._send_json(429, {"error": {"message": "Rate limit reached", "type": "requests"}},
+                            headers={"retry-after": "0.1"})
+            return
+
+        prompt = "\n".join(m.get("content", "") for m in body.get("messages", []))
+        content = fake_completion(prompt)
+        if content.startswith("{") and random.random() < self.server.malformed_rate:
+            with self.server.lock:
+                self.server.stats["malformed"] += 1
+            content = malform(content)
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = len(content) // 4
+        self._send_json(200, {
+            "id": "chatcmpl-stub-" + hashlib.md5(prompt.encode()).hexdigest()[:12],
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        })
+
+
+def make_server(host="127.0.0.1", port=8088, latency=0.0, error_rate=0.0, malformed_rate=0.0, quiet=True):
+    """Build a stub server; call serve_forever() (or serve_in_background) to run it"""
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.error_rate = error_rate
+    server.malformed_rate = malformed_rate
+    server.quiet = quiet
+    server.lock = threading.Lock()
+    server.stats = {"requests": 0, "rate_limited": 0, "malformed": 0}
+    return server
+
+
+def serve_in_background(**kwargs):
+    """Start a stub server on a daemon thread and return it with its base URL"""
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Groq API stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8088)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls answered with 429")
+    parser.add_argument("--malformed-rate", type=float, default=0.0,
+                        help="fraction of JSON answers returned fenced, truncated or otherwise malformed")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.latency, args.error_rate, args.malformed_rate,
+                         quiet=not args.verbose)
+    print(f"🧪 Groq stub listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,202 @@
+# metrics.py
+"""
+In-process latency metrics for the screening pipeline.
+
+Pipeline stages are wrapped in `span("stage")` (or decorated with
+`@timed("stage")`). Every span feeds a Prometheus histogram, and when the
+caller sends an `X-Debug-Trace: 1` header the spans of that request are
+also returned in a `Server-Timing` response header. `init_app` wires up
+request timing and the `/metrics` endpoint.
+"""
+
+import time
+import uuid
+import threading
+import contextvars
+from functools import wraps
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=None):
+    pairs = list(key) + (extra or [])
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+class Counter:
+    def __init__(self, name, documentation):
+        self.name = name
+        self.documentation = documentation
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self.values.get(_label_key(labels), 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            for key, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    def set(self, value, **labels):
+        with self.lock:
+            self.values[_label_key(labels)] = value
+
+    def render(self):
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self.series = {}  # label key -> [bucket counts..., sum, count]
+        self.lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        with self.lock:
+            series = self.series.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            for key, series in sorted(self.series.items()):
+                for bound, count in zip(self.buckets, series):
+                    lines.append(f"{self.name}_bucket{_format_labels(key, [('le', repr(bound))])} {count}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, [('le', '+Inf')])} {series[-1]}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {series[-2]}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series[-1]}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, documentation, **kwargs):
+        with self.lock:
+            if name not in self.metrics:
+                self.metrics[name] = cls(name, documentation, **kwargs)
+            return self.metrics[name]
+
+    def counter(self, name, documentation):
+        return self._get_or_create(Counter, name, documentation)
+
+    def gauge(self, name, documentation):
+        return self._get_or_create(Gauge, name, documentation)
+
+    def histogram(self, name, documentation, buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, documentation, buckets=buckets)
+
+    def render(self):
+        lines = []
+        for name in sorted(self.metrics):
+            lines.extend(self.metrics[name].render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+stage_seconds = registry.histogram(
+    "screening_stage_duration_seconds", "Time spent in each screening pipeline stage")
+http_request_seconds = registry.histogram(
+    "http_request_duration_seconds", "Flask request latency by endpoint")
+
+# Spans of the current request when tracing was requested, else None
+_trace = contextvars.ContextVar("trace", default=None)
+
+
+@contextmanager
+def span(stage):
+    """Time a block, record it in the stage histogram and the active trace"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stage_seconds.observe(elapsed, stage=stage)
+        trace = _trace.get()
+        if trace is not None:
+            trace.append((stage, elapsed))
+
+
+def timed(stage):
+    """Decorator form of span()"""
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return f(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def server_timing(trace):
+    """Render spans as a Server-Timing header value"""
+    return ", ".join(f"{stage};dur={elapsed * 1000:.1f}" for stage, elapsed in trace)
+
+
+def init_app(app):
+    """Time every request, honour X-Debug-Trace and expose GET /metrics"""
+    from flask import g, request, Response
+
+    @app.before_request
+    def _start_request_timer():
+        g._request_start = time.perf_counter()
+        if request.headers.get("X-Debug-Trace", "").lower() in ("1", "true"):
+            g._trace_id = request.headers.get("X-Trace-Id") or uuid.uuid4().hex
+            g._trace_token = _trace.set([])
+
+    @app.after_request
+    def _record_request(response):
+        start = getattr(g, "_request_start", None)
+        if start is not None:
+            http_request_seconds.observe(
+                time.perf_counter() - start,
+                endpoint=request.endpoint or "unknown",
+                method=request.method,
+                status=str(response.status_code),
+            )
+        trace = _trace.get()
+        if trace is not None:
+            response.headers["X-Trace-Id"] = g._trace_id
+            if trace:
+                response.headers["Server-Timing"] = server_timing(trace)
+        return response
+
+    @app.teardown_request
+    def _end_trace(exception):
+        # Worker threads are reused across requests, so never leak a trace
+        if g.pop("_trace_token", None) is not None:
+            _trace.set(None)
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics():
+        return Response(registry.render(), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,167 @@
+# progress.py
+"""
+Progress events of long-running screening operations, streamed to the
+client as server-sent events (SSE).
+
+An operation runs the pipeline in a background thread. Pipeline stages call
+`stage(name)` and `emit(event, **data)`, which are no-ops outside an
+operation, so the same code serves the blocking endpoints. Events are kept on the operation and
+numbered, so a client that reconnects with Last-Event-ID gets only what it
+missed. Operations are keyed (e.g. by user, job and resume): a client that
+retries after a timeout is attached to the operation already running, or
+gets its result if it finished within Config.PROGRESS_RETENTION_SECONDS,
+instead of starting the work again. Failed operations are not joined, so a
+retry after an error runs again.
+
+    event: stage          data: {"stage": "extracting", ...}
+    event: partial        data: {"semantic_score": 71.3}
+    event: result         data: <the blocking endpoint's JSON body>
+    event: error          data: {"message": "...", "status": 500}
+"""
+
+import json
+import time
+import uuid
+import threading
+import contextvars
+from config import Config
+from metrics import registry
+
+operations_total = registry.counter(
+    "progress_operations_total", "Streamed operations by outcome (started, joined by a retried request)")
+
+# Operation of the current thread, else None
+_operation = contextvars.ContextVar("operation", default=None)
+
+
+def emit(event, **data):
+    """Record a progress event on the current operation, if any"""
+    operation = _operation.get()
+    if operation is not None:
+        operation.publish(event, data)
+
+
+def stage(name, **data):
+    emit("stage", stage=name, **data)
+
+
+class Operation:
+    def __init__(self, key, owner_id):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.owner_id = owner_id
+        self.events = []  # (id, event, data)
+        self.done = False
+        self.finished_at = None
+        self.condition = threading.Condition()
+
+    def publish(self, event, data):
+        with self.condition:
+            self.events.append((len(self.events) + 1, event, data))
+            self.condition.notify_all()
+
+    def finish(self, event, data):
+        with self.condition:
+            self.events.append((len(self.events) + 1, event, data))
+            self.done = True
+            self.finished_at = time.monotonic()
+            self.condition.notify_all()
+
+    def follow(self, after=0, heartbeat=None):
+        """Yield events after the given id until the operation finishes; None on idle heartbeats"""
+        heartbeat = heartbeat or Config.PROGRESS_HEARTBEAT_SECONDS
+        position = after
+        while True:
+            with self.condition:
+                if len(self.events) <= position and not self.done:
+                    self.condition.wait(heartbeat)
+                pending = self.events[position:]
+                done = self.done
+            if not pending and not done:
+                yield None
+            for item in pending:
+                yield item
+            position += len(pending)
+            if done and position >= len(self.events):
+                return
+
+
+_operations = {}  # id -> Operation
+_by_key = {}  # key -> Operation
+_lock = threading.Lock()
+
+
+def _expire():
+    cutoff = time.monotonic() - Config.PROGRESS_RETENTION_SECONDS
+    for operation in [op for op in _operations.values() if op.done and op.finished_at < cutoff]:
+        _operations.pop(operation.id, None)
+        if _by_key.get(operation.key) is operation:
+            _by_key.pop(operation.key)
+
+
+def get(operation_id):
+    with _lock:
+        _expire()
+        return _operations.get(operation_id)
+
+
+def start(key, owner_id, target, on_done=None):
+    """
+    Run target() in a background thread as a new operation, or return the
+    operation already registered under key. target returns
+    (response body, HTTP status) and may raise. on_done, when given, is
+    called once target has returned or raised, or right away when the key
+    joined an operation already running.
+    """
+    with _lock:
+        _expire()
+        existing = _by_key.get(key)
+        if existing is not None:
+            operations_total.inc(outcome="joined")
+            if on_done:
+                on_done()
+            return existing
+        operation = Operation(key, owner_id)
+        _operations[operation.id] = operation
+        _by_key[key] = operation
+    operations_total.inc(outcome="started")
+
+    def run():
+        _operation.set(operation)
+        try:
+            body, status = target()
+            if status < 400:
+                operation.finish("result", body)
+            else:
+                fail(body, status)
+        except Exception as e:
+            print(f"Error in operation {operation.id}: {e}")
+            fail({"message": str(e)}, 500)
+        finally:
+            if on_done:
+                on_done()
+
+    def fail(body, status):
+        with _lock:
+            if _by_key.get(key) is operation:
+                _by_key.pop(key)
+        operation.finish("error", {**body, "status": status})
+
+    operation.publish("started", {"operation_id": operation.id})
+    threading.Thread(target=contextvars.copy_context().run, args=(run,),
+                     name=f"operation-{operation.id[:8]}", daemon=True).start()
+    return operation
+
+
+def format_event(event_id, event, data):
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def sse_stream(operation, last_event_id=0):
+    """Body of a text/event-stream response following an operation"""
+    for item in operation.follow(last_event_id):
+        if item is None:
+            # Comment line: keeps proxies from closing an idle connection
+            yield ": keep-alive\n\n"
+        else:
+            yield format_event(*item)
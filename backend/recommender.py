@@ -0,0 +1,108 @@
+# recommender.py
+"""
+Job recommendations for applicants, from their stored profile embedding.
+
+Each job is represented by one vector: the normalized mean of the JD
+chunk vectors summarize_jd stored for it. These are kept in the
+job_embeddings table per embedding model, written when a job's
+description is stored (add_job, update_job, bulk import) and backfilled
+for open jobs that have none, e.g. after a model migration.
+
+Every process keeps a matrix of the open jobs' vectors. It is rebuilt only
+when a job's vector changes or a job opens or closes, which a single
+aggregate query detects. Recommending is then one matrix-vector product
+over all open jobs, whatever their number.
+"""
+
+import time
+import threading
+import numpy as np
+from metrics import registry, span
+from embeddings import vector_to_blob, blob_to_vector
+from vector_store import active_model
+from vector_index import get_job_index, normalized, top_indices
+
+matrix_builds_total = registry.counter(
+    "recommender_matrix_builds_total", "Rebuilds of the open-jobs matrix used for recommendations")
+
+_matrix = None  # (version, job ids, matrix)
+_matrix_lock = threading.Lock()
+
+
+def job_vector(job_id, index=None):
+    """Normalized mean of a job's chunk vectors, or None when it has no chunks"""
+    vectors = (index or get_job_index()).vectors(job_id)
+    if not len(vectors):
+        return None
+    return normalized(np.asarray(vectors).mean(axis=0))
+
+
+def refresh_jobs(db, job_ids):
+    """Recompute and store the vectors of these jobs (after their chunks changed)"""
+    index, model = get_job_index(), active_model("jobs")
+    for job_id in job_ids:
+        vector = job_vector(job_id, index)
+        if vector is None:
+            db.execute("DELETE FROM job_embeddings WHERE job_id = ? AND embedding_model = ?", [job_id, model])
+        else:
+            db.execute('''
+                INSERT OR REPLACE INTO job_embeddings (job_id, embedding_model, embedding, updated_at)
+                VALUES (?, ?, ?, ?)
+            ''', [job_id, model, vector_to_blob(vector), time.time()])
+    db.commit()
+
+
+def _version(db, model):
+    """(open jobs, sum of their ids, stored vectors, latest update): changes whenever the matrix must"""
+    row = db.execute('''
+        SELECT COUNT(*), COALESCE(SUM(j.id), 0), COUNT(e.job_id), MAX(e.updated_at)
+        FROM jobs j
+        LEFT JOIN job_embeddings e ON e.job_id = j.id AND e.embedding_model = ?
+        WHERE j.status = 'open'
+    ''', [model]).fetchone()
+    return tuple(row)
+
+
+def job_matrix(db):
+    """(job ids, normalized matrix) of the open jobs, rebuilt only when they changed"""
+    global _matrix
+    model = active_model("jobs")
+    version = (model,) + _version(db, model)
+    cached = _matrix
+    if cached is not None and cached[0] == version:
+        return cached[1], cached[2]
+
+    if version[1] != version[3]:
+        # Open jobs without a vector for this model (created before recommendations, or migrated)
+        missing = [row[0] for row in db.execute('''
+            SELECT j.id FROM jobs j
+            WHERE j.status = 'open' AND NOT EXISTS (
+                SELECT 1 FROM job_embeddings e WHERE e.job_id = j.id AND e.embedding_model = ?)
+        ''', [model])]
+        refresh_jobs(db, missing)
+        version = (model,) + _version(db, model)
+    with _matrix_lock, span("recommender_build"):
+        rows = db.execute('''
+            SELECT e.job_id, e.embedding FROM job_embeddings e
+            JOIN jobs j ON j.id = e.job_id
+            WHERE j.status = 'open' AND e.embedding_model = ?
+            ORDER BY e.job_id
+        ''', [model]).fetchall()
+        job_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        matrix = np.array([blob_to_vector(row[1]) for row in rows], dtype=np.float32)
+        _matrix = (version, job_ids, matrix)
+    matrix_builds_total.inc()
+    return job_ids, matrix
+
+
+def recommend(db, profile_vec, k=10, exclude=()):
+    """[(job_id, similarity %)] of the k open jobs closest to a profile embedding, best first"""
+    job_ids, matrix = job_matrix(db)
+    if not len(job_ids):
+        return []
+    with span("recommend"):
+        scores = matrix @ normalized(profile_vec)
+        if exclude:
+            scores[np.isin(job_ids, list(exclude))] = -np.inf
+        best = [i for i in top_indices(scores, k) if np.isfinite(scores[i])]
+    return [(int(job_ids[i]), round(float(min(100, max(0, scores[i] * 100))), 2)) for i in best]
@@ -0,0 +1,315 @@
+# rescoring.py
+"""
+Rescore existing applications after a job description or the scoring
+weights change.
+
+Every application records the fingerprints of the inputs it was scored
+with (jd_hash: description, JD summary, scoring mode and embedding model;
+weights_hash: the blend weights of its scoring mode). A run walks the
+applications in id order and only touches stale ones:
+
+* weights changed, inputs unchanged: recombine the stored component
+  scores, no embedding or LLM work at all
+* inputs changed: recompute the semantic score from the resume's cached
+  profile embedding (and, for local jobs, the rule-based scores), keeping
+  the stored LLM score unless include_llm is set
+
+With include_llm set, hybrid applications that have no LLM score (its
+answer could not be parsed, or the call failed) are rescored too.
+
+Each batch is scored in parallel and committed together with the run's
+cursor, so a run that dies part way can be resumed where it stopped.
+
+    python -m rescoring [--job-id N] [--include-llm] [--resume RUN_ID]
+"""
+
+import sys
+import json
+import sqlite3
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from metrics import registry, span
+from embeddings import blob_to_vector
+from vector_store import active_model
+from agents.resume_parser import extract_text
+from agents.shortlister import (
+    evaluate_match,
+    get_semantic_similarity,
+    build_candidate_profile,
+    embed_candidate_profile,
+    combine_hybrid_score,
+)
+from agents.local_scorer import evaluate_match_local, combine_local_score
+
+rescored_total = registry.counter(
+    "rescore_applications_total", "Applications examined by rescoring runs, by outcome")
+
+# Runs are serialized so a run started after a job edit always sees the
+# latest fingerprints and never races an earlier run over the same rows
+_run_lock = threading.Lock()
+
+APPLICATION_ROWS = '''
+    SELECT a.id, a.job_id, a.match_analysis, a.semantic_score, a.llm_score, a.jd_hash, a.weights_hash,
+           r.file_path, r.parsed_data, r.profile_embedding, r.embedding_model
+    FROM applications a
+    LEFT JOIN resumes r ON a.resume_id = r.id
+'''
+
+
+def connect(db_path=None):
+    db = sqlite3.connect(db_path or Config.DATABASE_PATH, timeout=30)
+    db.row_factory = sqlite3.Row
+    return db
+
+
+def job_scoring_mode(job):
+    return job['scoring_mode'] or Config.SCORING_MODE
+
+
+def jd_fingerprint(job):
+    """Hash of everything a job contributes to an application's component scores"""
+    inputs = [job['description'], job['summarized_data'], job_scoring_mode(job), active_model("jobs")]
+    return hashlib.sha256(json.dumps(inputs).encode()).hexdigest()
+
+
+def weights_fingerprint(scoring_mode):
+    """Hash of the weights used to blend component scores in a scoring mode"""
+    if scoring_mode == 'local':
+        weights = [Config.LOCAL_SEMANTIC_WEIGHT, Config.SKILL_WEIGHT,
+                   Config.EXPERIENCE_WEIGHT, Config.EDUCATION_WEIGHT]
+    else:
+        weights = [Config.HYBRID_SEMANTIC_WEIGHT]
+    return hashlib.sha256(json.dumps([scoring_mode, weights]).encode()).hexdigest()
+
+
+def score_fingerprints(job):
+    """(jd_hash, weights_hash) to store with an application scored against job"""
+    return jd_fingerprint(job), weights_fingerprint(job_scoring_mode(job))
+
+
+def rescore_application(row, job, include_llm=False):
+    """
+    Recompute one stale application. Returns (match result, outcome); the
+    result is None when the application cannot be rescored without an LLM
+    call and include_llm is off.
+    """
+    jd_hash = jd_fingerprint(job)
+    if row['jd_hash'] == jd_hash and not _missing_llm_score(row, job, include_llm):
+        # Only the weights moved: recombine the stored components
+        analysis = json.loads(row['match_analysis'] or '{}')
+        if job_scoring_mode(job) == 'local':
+            final_score, rule_score = combine_local_score(row['semantic_score'], analysis['component_scores'])
+            analysis['rule_score'] = round(rule_score, 2)
+        else:
+            final_score = combine_hybrid_score(row['semantic_score'], row['llm_score'])
+        return {
+            "match_score": round(final_score, 2),
+            "analysis": analysis,
+            "semantic_score": row['semantic_score'],
+            "llm_score": row['llm_score']
+        }, "recombined"
+
+    if job_scoring_mode(job) == 'local':
+        resume_text = extract_text(row['file_path'])
+        jd_data = json.loads(job['summarized_data'] or '{}')
+        return evaluate_match_local(resume_text, jd_data, job_id=job['id'],
+                                    profile_vec=embed_candidate_profile(resume_text)), "recomputed"
+
+    if row['parsed_data'] is None or (row['llm_score'] is None and not include_llm):
+        return None, "needs_llm"
+    resume_data = json.loads(row['parsed_data'])
+    if row['profile_embedding'] and row['embedding_model'] == active_model("jobs"):
+        profile_vec = blob_to_vector(row['profile_embedding'])
+    else:
+        profile_vec = embed_candidate_profile(build_candidate_profile(resume_data))
+
+    if include_llm:
+        return evaluate_match(resume_data, job['description'], job_id=job['id'],
+                              profile_vec=profile_vec), "recomputed_llm"
+
+    semantic_score = get_semantic_similarity(None, job['id'], resume_vec=profile_vec)
+    return {
+        "match_score": round(combine_hybrid_score(semantic_score, row['llm_score']), 2),
+        "analysis": json.loads(row['match_analysis'] or '{}'),
+        "semantic_score": round(semantic_score, 2),
+        "llm_score": row['llm_score']
+    }, "recomputed"
+
+
+def _rescore_safely(row, job, include_llm):
+    try:
+        return rescore_application(row, job, include_llm)
+    except Exception as e:
+        print(f"Error rescoring application {row['id']}: {e}")
+        return None, "failed"
+
+
+def create_run(db, job_id=None, include_llm=False):
+    """Record a new rescoring run (commits) and return its id"""
+    cursor = db.execute('INSERT INTO rescore_runs (job_id, include_llm) VALUES (?, ?)',
+                        [job_id, int(bool(include_llm))])
+    db.commit()
+    return cursor.lastrowid
+
+
+def get_run(db, run_id):
+    row = db.execute('SELECT * FROM rescore_runs WHERE id = ?', [run_id]).fetchone()
+    return dict(row) if row else None
+
+
+def _load_jobs(db, job_id):
+    if job_id is None:
+        rows = db.execute('SELECT * FROM jobs').fetchall()
+    else:
+        rows = db.execute('SELECT * FROM jobs WHERE id = ?', [job_id]).fetchall()
+    return {job['id']: job for job in rows}
+
+
+def _missing_llm_score(row, job, include_llm):
+    """A hybrid application whose LLM score is missing, to be filled in when include_llm is set"""
+    return bool(include_llm) and job_scoring_mode(job) != 'local' and row['llm_score'] is None
+
+
+def _is_stale(row, fingerprints, jobs, include_llm=False):
+    jd_hash, weights_hash = fingerprints[row['job_id']]
+    return (row['jd_hash'] != jd_hash or row['weights_hash'] != weights_hash
+            or _missing_llm_score(row, jobs[row['job_id']], include_llm))
+
+
+def _scope(job_id):
+    return (' AND a.job_id = ?', [job_id]) if job_id is not None else ('', [])
+
+
+def run_rescore(run_id, db_path=None, on_progress=None):
+    """
+    Execute (or resume) a rescoring run synchronously. on_progress, when
+    given, is called with the run dict after every committed batch.
+    """
+    with _run_lock:
+        db = connect(db_path)
+        try:
+            run = get_run(db, run_id)
+            if run is None or run['status'] == 'completed':
+                return run
+            db.execute("UPDATE rescore_runs SET status = 'running', updated_at = datetime('now') WHERE id = ?",
+                       [run_id])
+            db.commit()
+
+            jobs = _load_jobs(db, run['job_id'])
+            fingerprints = {job_id: score_fingerprints(job) for job_id, job in jobs.items()}
+            scope_sql, scope_args = _scope(run['job_id'])
+            if run['total'] is None:
+                rows = db.execute('SELECT a.job_id, a.jd_hash, a.weights_hash, a.llm_score FROM applications a WHERE 1 = 1'
+                                  + scope_sql, scope_args).fetchall()
+                total = sum(1 for row in rows
+                            if row['job_id'] in jobs and _is_stale(row, fingerprints, jobs, run['include_llm']))
+                db.execute('UPDATE rescore_runs SET total = ? WHERE id = ?', [total, run_id])
+                db.commit()
+
+            with ThreadPoolExecutor(max_workers=Config.RESCORE_WORKERS) as pool:
+                while True:
+                    run = get_run(db, run_id)
+                    rows = db.execute(APPLICATION_ROWS + ' WHERE a.id > ?' + scope_sql + ' ORDER BY a.id LIMIT ?',
+                                      [run['last_application_id']] + scope_args + [Config.RESCORE_BATCH_SIZE]
+                                      ).fetchall()
+                    if not rows:
+                        break
+                    stale = [row for row in rows
+                             if row['job_id'] in jobs and _is_stale(row, fingerprints, jobs, run['include_llm'])]
+                    with span("rescore_batch"):
+                        results = list(pool.map(
+                            lambda row: _rescore_safely(row, jobs[row['job_id']], run['include_llm']), stale))
+
+                    counts = {"rescored": 0, "skipped": 0, "failed": 0}
+                    for row, (result, outcome) in zip(stale, results):
+                        rescored_total.inc(outcome=outcome)
+                        if result is None:
+                            counts["failed" if outcome == "failed" else "skipped"] += 1
+                            continue
+                        jd_hash, weights_hash = fingerprints[row['job_id']]
+                        analysis = json.dumps(result['analysis'])
+                        llm_score = float(result['llm_score']) if result['llm_score'] is not None else None
+                        db.execute('''
+                            UPDATE applications
+                            SET match_score = ?, match_analysis = ?, semantic_score = ?, llm_score = ?,
+                                jd_hash = ?, weights_hash = ?
+                            WHERE id = ?
+                        ''', [result['match_score'], analysis, result['semantic_score'], llm_score,
+                              jd_hash, weights_hash, row['id']])
+                        db.execute('UPDATE job_rankings SET match_score = ?, match_analysis = ? WHERE application_id = ?',
+                                   [result['match_score'], analysis, row['id']])
+                        counts["rescored"] += 1
+
+                    # Results and the cursor commit together, so a resumed run starts after this batch
+                    db.execute('''
+                        UPDATE rescore_runs
+                        SET last_application_id = ?, processed = processed + ?, rescored = rescored + ?,
+                            skipped = skipped + ?, failed = failed + ?, updated_at = datetime('now')
+                        WHERE id = ?
+                    ''', [rows[-1]['id'], len(stale), counts["rescored"], counts["skipped"], counts["failed"], run_id])
+                    db.commit()
+                    if on_progress:
+                        on_progress(get_run(db, run_id))
+
+            db.execute("UPDATE rescore_runs SET status = 'completed', updated_at = datetime('now') WHERE id = ?",
+                       [run_id])
+            db.commit()
+            return get_run(db, run_id)
+        except Exception as e:
+            print(f"Error in rescoring run {run_id}: {e}")
+            db.rollback()
+            db.execute("UPDATE rescore_runs SET status = 'failed', error = ?, updated_at = datetime('now') WHERE id = ?",
+                       [str(e), run_id])
+            db.commit()
+            return get_run(db, run_id)
+        finally:
+            db.close()
+
+
+def start_rescore(db, job_id=None, include_llm=False, db_path=None):
+    """Create a run and execute it on a background thread; returns the run id"""
+    run_id = create_run(db, job_id, include_llm)
+    resume_in_background(run_id, db_path)
+    return run_id
+
+
+def resume_in_background(run_id, db_path=None):
+    thread = threading.Thread(target=run_rescore, args=(run_id, db_path), name=f"rescore-{run_id}", daemon=True)
+    thread.start()
+    return thread
+
+
+def _print_progress(run):
+    print(f"   run {run['id']}: {run['processed']}/{run['total']} processed, {run['rescored']} rescored, "
+          f"{run['skipped']} skipped, {run['failed']} failed", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m rescoring", description="Rescore stale applications")
+    parser.add_argument("--job-id", type=int, help="only rescore this job's applications")
+    parser.add_argument("--include-llm", action="store_true",
+                        help="also re-run the LLM analysis for hybrid jobs whose description changed")
+    parser.add_argument("--resume", type=int, metavar="RUN_ID", help="resume an interrupted run")
+    parser.add_argument("--db", help="database path (default Config.DATABASE_PATH)")
+    args = parser.parse_args(argv)
+
+    if args.resume is not None:
+        run_id = args.resume
+    else:
+        db = connect(args.db)
+        run_id = create_run(db, args.job_id, args.include_llm)
+        db.close()
+    run = run_rescore(run_id, args.db, on_progress=_print_progress)
+    if run is None:
+        print(f"❌ No rescoring run {run_id}", file=sys.stderr)
+        return 1
+    print(f"{'✅' if run['status'] == 'completed' else '❌'} run {run_id} {run['status']}", file=sys.stderr)
+    _print_progress(run)
+    return 0 if run['status'] == 'completed' else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
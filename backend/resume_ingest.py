@@ -0,0 +1,418 @@
+# resume_ingest.py
+"""
+Bulk ingestion of resumes from a local directory or a .zip archive (e.g. an
+ATS export), without going through POST /api/resumes once per file.
+
+Files are processed in batches of Config.RESUME_INGEST_BATCH_SIZE:
+
+1. each file is streamed into the resume folder while being hashed, the
+   same way uploads are; files the owner already has (by SHA-256) are
+   recorded as duplicates, and files whose content another applicant
+   uploaded reuse that parsed profile and embedding
+2. text is extracted on a pool of Config.RESUME_INGEST_EXTRACT_WORKERS
+   processes (fresh interpreters running agents/document_text.py)
+3. resumes are parsed with the LLM on Config.RESUME_INGEST_LLM_WORKERS threads
+4. the candidate profiles of the batch are embedded together, and the
+   resumes rows (parsed_data, profile_embedding, embedding_model, as
+   upload_resume writes them) are inserted along with a record of every
+   file of the batch, in one transaction
+
+The per-file records are the checkpoint: running an ingestion again (after
+a crash or a failure) skips every file already recorded and continues with
+the rest. All resumes of an ingestion belong to one applicant account.
+
+    python -m resume_ingest /exports/ats-2023.zip --applicant-id 7 [--db PATH]
+    python -m resume_ingest --resume 3
+"""
+
+import os
+import sys
+import json
+import uuid
+import queue
+import hashlib
+import zipfile
+import argparse
+import threading
+import subprocess
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from metrics import registry, span
+from embeddings import vector_to_blob
+from vector_store import active_model
+from agents.resume_parser import parse_resume_text
+from agents.shortlister import build_candidate_profile, job_embeddings
+from rescoring import connect
+
+ingested_files_total = registry.counter(
+    "resume_ingest_files_total", "Files processed by resume ingestions, by outcome")
+
+OUTCOMES = ("ingested", "reused", "duplicate", "skipped", "failed")
+# One ingestion at a time: they share the extraction processes' CPU and the LLM
+_ingest_lock = threading.Lock()
+
+
+class FileTooLarge(Exception):
+    pass
+
+
+class Source:
+    """Supported resume files of a directory (recursively) or a zip archive"""
+
+    def __init__(self, path):
+        self.path = path
+        self.archive = zipfile.ZipFile(path) if zipfile.is_zipfile(path) else None
+        if self.archive is None and not os.path.isdir(path):
+            raise ValueError(f"{path} is neither a directory nor a zip archive")
+
+    def entries(self):
+        if self.archive is not None:
+            names = [info.filename for info in self.archive.infolist() if not info.is_dir()]
+        else:
+            names = [os.path.relpath(os.path.join(root, name), self.path)
+                     for root, _, files in os.walk(self.path) for name in files]
+        return sorted(name for name in names
+                      if os.path.splitext(name)[1].lower() in Config.ALLOWED_EXTENSIONS
+                      and not name.startswith("__MACOSX/")
+                      and not os.path.basename(name).startswith("."))
+
+    @contextmanager
+    def open(self, entry):
+        if self.archive is not None:
+            with self.archive.open(entry) as f:
+                yield f
+        else:
+            with open(os.path.join(self.path, entry), "rb") as f:
+                yield f
+
+    def close(self):
+        if self.archive is not None:
+            self.archive.close()
+
+
+def copy_streaming(stream, directory, max_size):
+    """Copy a file object into directory chunk by chunk while hashing it; returns (temp path, SHA-256)"""
+    tmp_path = os.path.join(directory, f".ingest-{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp_path, "wb") as out:
+            while True:
+                chunk = stream.read(Config.UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise FileTooLarge(f"larger than {max_size // (1024 * 1024)}MB")
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return tmp_path, digest.hexdigest()
+
+
+def create_ingestion(db, source, applicant_id):
+    """Record a new ingestion (commits) and return its id"""
+    cursor = db.execute('INSERT INTO resume_ingestions (source, applicant_id) VALUES (?, ?)',
+                        [os.path.abspath(source), applicant_id])
+    db.commit()
+    return cursor.lastrowid
+
+
+def get_ingestion(db, ingestion_id, problems_limit=100):
+    """An ingestion with its counters and the files that were skipped or failed"""
+    row = db.execute('SELECT * FROM resume_ingestions WHERE id = ?', [ingestion_id]).fetchone()
+    if row is None:
+        return None
+    result = dict(row)
+    result['problems'] = [dict(r) for r in db.execute('''
+        SELECT entry, outcome, error FROM resume_ingestion_files
+        WHERE ingestion_id = ? AND outcome IN ('skipped', 'failed') ORDER BY id LIMIT ?
+    ''', [ingestion_id, problems_limit]).fetchall()]
+    return result
+
+
+def _status(db, ingestion_id, status, error=None):
+    db.execute("UPDATE resume_ingestions SET status = ?, error = ?, updated_at = datetime('now') WHERE id = ?",
+               [status, error, ingestion_id])
+    db.commit()
+
+
+class ExtractionPool:
+    """
+    Text extraction on worker processes that live as long as the pool
+
+    Workers are new interpreters running agents.document_text, not forks:
+    this process runs the LLM gateway loop, chromadb and sqlite threads,
+    whose locks a forked child could inherit held, and multiprocessing's
+    spawn and forkserver would re-import the main module (the whole app or
+    this CLI) in every worker. Each worker imports only PyPDF2 and zipfile.
+    """
+
+    def __init__(self, workers):
+        self.idle = queue.Queue()
+        self.workers = []
+        for _ in range(workers):
+            self.idle.put(self._start_worker())
+        self.threads = ThreadPoolExecutor(max_workers=workers)
+
+    def _start_worker(self):
+        backend_dir = os.path.dirname(os.path.abspath(__file__))
+        path = os.pathsep.join(filter(None, [backend_dir, os.environ.get("PYTHONPATH")]))
+        env = dict(os.environ, PYTHONPATH=path)
+        worker = subprocess.Popen([sys.executable, "-m", "agents.document_text"], env=env, text=True,
+                                  encoding="utf-8", stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self.workers.append(worker)
+        return worker
+
+    def _extract(self, file_path):
+        worker = self.idle.get()
+        try:
+            worker.stdin.write(json.dumps(os.path.abspath(file_path)) + "\n")
+            worker.stdin.flush()
+            line = worker.stdout.readline()
+        except OSError:
+            line = ""
+        if not line:
+            # The worker died on this file (crash, out of memory): replace it
+            worker.kill()
+            worker.wait()
+            self.idle.put(self._start_worker())
+            raise RuntimeError("extraction worker exited")
+        self.idle.put(worker)
+        reply = json.loads(line)
+        if "error" in reply:
+            raise ValueError(reply["error"])
+        return reply["text"]
+
+    def submit(self, file_path):
+        """Future of a file's text (raises what extraction raised)"""
+        return self.threads.submit(self._extract, file_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.threads.shutdown()
+        for worker in self.workers:
+            if worker.poll() is None:
+                worker.stdin.close()
+                worker.wait()
+
+
+def _extraction_pool():
+    return ExtractionPool(Config.RESUME_INGEST_EXTRACT_WORKERS or os.cpu_count() or 1)
+
+
+def process_batch(db, ingestion, source, entries, extract_pool, llm_pool):
+    """Ingest one batch of entries and record all of them (caller commits)"""
+    applicant_id = ingestion['applicant_id']
+    resume_dir = os.path.join(Config.UPLOAD_FOLDER, 'resumes')
+    records = {}  # entry -> {outcome, content_hash, resume_id, error}
+    staged = []  # (entry, temp path, content hash, extension)
+
+    with span("ingest_stream"):
+        for entry in entries:
+            try:
+                with source.open(entry) as stream:
+                    tmp_path, content_hash = copy_streaming(stream, resume_dir, Config.MAX_FILE_SIZE)
+                staged.append((entry, tmp_path, content_hash, os.path.splitext(entry)[1].lower()))
+            except FileTooLarge as e:
+                records[entry] = {"outcome": "skipped", "error": str(e)}
+            except Exception as e:
+                records[entry] = {"outcome": "failed", "error": f"read: {e}"}
+
+    hashes = sorted({content_hash for _, _, content_hash, _ in staged})
+    placeholders = ",".join("?" * len(hashes))
+    own = {row['content_hash']: row['id'] for row in db.execute(
+        f'SELECT content_hash, MIN(id) AS id FROM resumes WHERE applicant_id = ? AND content_hash IN ({placeholders}) '
+        'GROUP BY content_hash', [applicant_id] + hashes).fetchall()} if hashes else {}
+    shared = {row['content_hash']: row for row in db.execute(
+        f'SELECT content_hash, parsed_data, profile_embedding, embedding_model FROM resumes '
+        f'WHERE content_hash IN ({placeholders}) AND parsed_data IS NOT NULL GROUP BY content_hash',
+        hashes).fetchall()} if hashes else {}
+
+    # Keep one file per content; the rest point at its resume
+    firsts, later = {}, []
+    for entry, tmp_path, content_hash, ext in staged:
+        if content_hash in own or content_hash in firsts:
+            os.remove(tmp_path)
+            later.append((entry, content_hash))
+            continue
+        filepath = os.path.join(resume_dir, f"{content_hash}_{applicant_id}{ext}")
+        os.replace(tmp_path, filepath)
+        firsts[content_hash] = (entry, filepath)
+
+    # Text and LLM parse only for content nobody has parsed yet
+    to_parse = [(content_hash, filepath) for content_hash, (_, filepath) in firsts.items()
+                if content_hash not in shared]
+    parsed, errors = {}, {}
+    with span("ingest_extract"):
+        text_futures = {content_hash: extract_pool.submit(filepath)
+                        for content_hash, filepath in to_parse}
+        parse_futures = {}
+        for content_hash, future in text_futures.items():
+            try:
+                parse_futures[content_hash] = llm_pool.submit(parse_resume_text, future.result())
+            except Exception as e:
+                errors[content_hash] = f"extract: {e}"
+    with span("ingest_parse"):
+        for content_hash, future in parse_futures.items():
+            try:
+                parsed[content_hash] = future.result()
+            except Exception as e:
+                errors[content_hash] = f"parse: {e}"
+
+    ok = list(parsed)
+    vectors = {}
+    if ok:
+        with span("embed"):
+            embedded = job_embeddings().embed_documents([build_candidate_profile(parsed[h]) for h in ok])
+        vectors = dict(zip(ok, embedded))
+
+    model = active_model('jobs')
+    for content_hash, (entry, filepath) in firsts.items():
+        if content_hash in shared:
+            row = shared[content_hash]
+            parsed_data, embedding, embedding_model = row['parsed_data'], row['profile_embedding'], row['embedding_model']
+            outcome = "reused"
+        elif content_hash in errors:
+            records[entry] = {"outcome": "failed", "content_hash": content_hash, "error": errors[content_hash]}
+            os.remove(filepath)
+            continue
+        else:
+            parsed_data, embedding, embedding_model = (json.dumps(parsed[content_hash]),
+                                                       vector_to_blob(vectors[content_hash]), model)
+            outcome = "ingested"
+        cursor = db.execute('''
+            INSERT INTO resumes (applicant_id, file_path, stored_filename, parsed_data,
+                                 content_hash, profile_embedding, embedding_model)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', [applicant_id, filepath, os.path.basename(filepath), parsed_data, content_hash, embedding,
+              embedding_model])
+        own[content_hash] = cursor.lastrowid
+        records[entry] = {"outcome": outcome, "content_hash": content_hash, "resume_id": cursor.lastrowid}
+    for entry, content_hash in later:
+        if content_hash in own:
+            records[entry] = {"outcome": "duplicate", "content_hash": content_hash, "resume_id": own[content_hash]}
+        else:
+            records[entry] = {"outcome": "failed", "content_hash": content_hash,
+                              "error": "same content as a file that failed"}
+
+    db.executemany('''
+        INSERT INTO resume_ingestion_files (ingestion_id, entry, content_hash, resume_id, outcome, error)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', [(ingestion['id'], entry, r.get("content_hash"), r.get("resume_id"), r["outcome"], r.get("error"))
+          for entry, r in records.items()])
+    counts = {outcome: 0 for outcome in OUTCOMES}
+    for r in records.values():
+        counts[r["outcome"]] += 1
+        ingested_files_total.inc(outcome=r["outcome"])
+    db.execute(f'''
+        UPDATE resume_ingestions
+        SET processed = processed + ?, {", ".join(f"{o} = {o} + ?" for o in OUTCOMES)}, updated_at = datetime('now')
+        WHERE id = ?
+    ''', [len(records)] + [counts[o] for o in OUTCOMES] + [ingestion['id']])
+
+
+def run_ingestion(ingestion_id, db_path=None, on_progress=None):
+    """
+    Execute (or resume) an ingestion synchronously. on_progress, when given,
+    is called with the ingestion dict after every committed batch.
+    """
+    with _ingest_lock:
+        db = connect(db_path)
+        source = None
+        try:
+            ingestion = get_ingestion(db, ingestion_id)
+            if ingestion is None or ingestion['status'] == 'completed':
+                return ingestion
+            _status(db, ingestion_id, 'running')
+            os.makedirs(os.path.join(Config.UPLOAD_FOLDER, 'resumes'), exist_ok=True)
+
+            source = Source(ingestion['source'])
+            entries = source.entries()
+            done = {row['entry'] for row in db.execute(
+                'SELECT entry FROM resume_ingestion_files WHERE ingestion_id = ?', [ingestion_id]).fetchall()}
+            pending = [entry for entry in entries if entry not in done]
+            db.execute('UPDATE resume_ingestions SET total = ? WHERE id = ?', [len(entries), ingestion_id])
+            db.commit()
+
+            batch_size = Config.RESUME_INGEST_BATCH_SIZE
+            with _extraction_pool() as extract_pool, \
+                    ThreadPoolExecutor(max_workers=Config.RESUME_INGEST_LLM_WORKERS) as llm_pool:
+                for start in range(0, len(pending), batch_size):
+                    with span("ingest_batch"):
+                        process_batch(db, ingestion, source, pending[start:start + batch_size],
+                                      extract_pool, llm_pool)
+                    # The batch's resumes and its file records commit together: the checkpoint
+                    db.commit()
+                    if on_progress:
+                        on_progress(get_ingestion(db, ingestion_id))
+
+            _status(db, ingestion_id, 'completed')
+            return get_ingestion(db, ingestion_id)
+        except Exception as e:
+            print(f"Error in resume ingestion {ingestion_id}: {e}")
+            db.rollback()
+            _status(db, ingestion_id, 'failed', str(e))
+            return get_ingestion(db, ingestion_id)
+        finally:
+            if source is not None:
+                source.close()
+            db.close()
+
+
+def resume_in_background(ingestion_id, db_path=None):
+    thread = threading.Thread(target=run_ingestion, args=(ingestion_id, db_path),
+                              name=f"resume-ingest-{ingestion_id}", daemon=True)
+    thread.start()
+    return thread
+
+
+def start_ingestion(db, source, applicant_id, db_path=None):
+    """Create an ingestion and execute it on a background thread; returns its id"""
+    ingestion_id = create_ingestion(db, source, applicant_id)
+    resume_in_background(ingestion_id, db_path)
+    return ingestion_id
+
+
+def _print_progress(ingestion):
+    print(f"   ingestion {ingestion['id']}: {ingestion['processed']}/{ingestion['total']} files, "
+          f"{ingestion['ingested']} ingested, {ingestion['reused']} reused, {ingestion['duplicate']} duplicate, "
+          f"{ingestion['skipped']} skipped, {ingestion['failed']} failed", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m resume_ingest",
+                                     description="Ingest a directory or zip archive of resumes")
+    parser.add_argument("source", nargs="?", help="directory or .zip of PDF/DOCX resumes")
+    parser.add_argument("--applicant-id", type=int, help="user who owns the ingested resumes")
+    parser.add_argument("--resume", type=int, metavar="INGESTION_ID", help="continue an interrupted ingestion")
+    parser.add_argument("--db", help="database path (default Config.DATABASE_PATH)")
+    args = parser.parse_args(argv)
+
+    if args.resume is not None:
+        ingestion_id = args.resume
+    else:
+        if not args.source or args.applicant_id is None:
+            parser.error("source and --applicant-id are required unless --resume is given")
+        db = connect(args.db)
+        ingestion_id = create_ingestion(db, args.source, args.applicant_id)
+        db.close()
+    ingestion = run_ingestion(ingestion_id, args.db, on_progress=_print_progress)
+    if ingestion is None:
+        print(f"❌ No ingestion {ingestion_id}", file=sys.stderr)
+        return 1
+    for problem in ingestion['problems']:
+        print(f"   {problem['entry']} ({problem['outcome']}): {problem['error']}", file=sys.stderr)
+    print(f"{'✅' if ingestion['status'] == 'completed' else '❌'} ingestion {ingestion_id} {ingestion['status']}"
+          + (f": {ingestion['error']}" if ingestion['error'] else ""), file=sys.stderr)
+    _print_progress(ingestion)
+    return 0 if ingestion['status'] == 'completed' else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
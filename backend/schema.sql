@@ -17,19 +17,33 @@ CREATE TABLE IF NOT EXISTS jobs (
   description TEXT NOT NULL,
   summarized_data TEXT,  -- Stores LLM-processed JD data as JSON
   posting_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-  status TEXT CHECK(status IN ('open', 'closed')) DEFAULT 'open'
+  status TEXT CHECK(status IN ('open', 'closed')) DEFAULT 'open',
+  scoring_mode TEXT CHECK(scoring_mode IN ('hybrid', 'local')),  -- NULL uses Config.SCORING_MODE
+  version INTEGER NOT NULL DEFAULT 1  -- bumped on every change; keys the read cache (see http_cache.py)
 );
 
+CREATE TRIGGER IF NOT EXISTS jobs_version AFTER UPDATE OF title, description, status, scoring_mode, posting_date ON jobs
+BEGIN
+  UPDATE jobs SET version = version + 1 WHERE id = NEW.id;
+END;
+
 -- Resumes table
 CREATE TABLE IF NOT EXISTS resumes (
   id INTEGER PRIMARY KEY,
   applicant_id INTEGER NOT NULL,
   file_path TEXT NOT NULL,
+  stored_filename TEXT,  -- basename of file_path, used to look up downloads
   parsed_data TEXT,  -- Stores LLM-parsed resume data as JSON
   upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  content_hash TEXT,  -- SHA-256 of the uploaded file
+  profile_embedding BLOB,  -- float32 candidate profile embedding
+  embedding_model TEXT,  -- model that produced profile_embedding
   FOREIGN KEY (applicant_id) REFERENCES users(id)
 );
 
+CREATE INDEX IF NOT EXISTS idx_resumes_content_hash ON resumes(content_hash);
+CREATE INDEX IF NOT EXISTS idx_resumes_stored_filename ON resumes(stored_filename);
+
 -- Applications
 CREATE TABLE IF NOT EXISTS applications (
   id INTEGER PRIMARY KEY,
@@ -40,12 +54,120 @@ CREATE TABLE IF NOT EXISTS applications (
   status TEXT CHECK(status IN ('pending', 'shortlisted', 'rejected', 'interviewed')) DEFAULT 'pending',
   match_score FLOAT,
   match_analysis TEXT,
+  semantic_score FLOAT,  -- stored components, recombined when only weights change
+  llm_score FLOAT,
+  jd_hash TEXT,  -- fingerprints of the inputs the score was computed from (see rescoring.py)
+  weights_hash TEXT,
   FOREIGN KEY (applicant_id) REFERENCES users(id),
   FOREIGN KEY (job_id) REFERENCES jobs(id),
   FOREIGN KEY (resume_id) REFERENCES resumes(id),
   UNIQUE(applicant_id, job_id) -- Prevents duplicate applications
 );
 
+-- Ranked applications per job: a denormalized copy of applications joined with
+-- users, resumes and jobs, kept in sync by app.py (sync_ranking) so ranked
+-- views are served straight from an index
+CREATE TABLE IF NOT EXISTS job_rankings (
+  application_id INTEGER PRIMARY KEY,
+  job_id INTEGER NOT NULL,
+  applicant_id INTEGER NOT NULL,
+  resume_id INTEGER,
+  match_score FLOAT,
+  match_analysis TEXT,
+  status TEXT,
+  application_date TIMESTAMP,
+  username TEXT,
+  email TEXT,
+  resume_path TEXT,
+  job_title TEXT,
+  FOREIGN KEY (application_id) REFERENCES applications(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_rankings_job ON job_rankings(job_id, match_score DESC, application_date DESC);
+CREATE INDEX IF NOT EXISTS idx_job_rankings_job_status ON job_rankings(job_id, status, match_score DESC, application_date DESC);
+CREATE INDEX IF NOT EXISTS idx_job_rankings_score ON job_rankings(match_score DESC, application_date DESC);
+CREATE INDEX IF NOT EXISTS idx_job_rankings_status ON job_rankings(status, match_score DESC, application_date DESC);
+
+-- Rescoring runs over existing applications (see rescoring.py)
+CREATE TABLE IF NOT EXISTS rescore_runs (
+  id INTEGER PRIMARY KEY,
+  job_id INTEGER,  -- NULL = all jobs
+  include_llm INTEGER NOT NULL DEFAULT 0,
+  status TEXT CHECK(status IN ('queued', 'running', 'completed', 'failed')) DEFAULT 'queued',
+  total INTEGER,
+  processed INTEGER NOT NULL DEFAULT 0,
+  rescored INTEGER NOT NULL DEFAULT 0,
+  skipped INTEGER NOT NULL DEFAULT 0,
+  failed INTEGER NOT NULL DEFAULT 0,
+  last_application_id INTEGER NOT NULL DEFAULT 0,  -- resume cursor
+  error TEXT,
+  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Bulk imports of job description catalogs (see job_import.py)
+CREATE TABLE IF NOT EXISTS job_imports (
+  id INTEGER PRIMARY KEY,
+  filename TEXT,
+  status TEXT CHECK(status IN ('queued', 'running', 'completed', 'failed')) DEFAULT 'queued',
+  total INTEGER,  -- catalog rows
+  imported INTEGER NOT NULL DEFAULT 0,
+  failed INTEGER NOT NULL DEFAULT 0,
+  job_ids TEXT,  -- JSON list of the created jobs
+  errors TEXT,  -- JSON list of {line, title, stage, message}
+  error TEXT,
+  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Bulk resume ingestions from a directory or zip archive (see resume_ingest.py)
+CREATE TABLE IF NOT EXISTS resume_ingestions (
+  id INTEGER PRIMARY KEY,
+  source TEXT NOT NULL,  -- absolute path of the directory or archive
+  applicant_id INTEGER NOT NULL,  -- owner of the ingested resumes
+  status TEXT CHECK(status IN ('queued', 'running', 'completed', 'failed')) DEFAULT 'queued',
+  total INTEGER,  -- supported files in the source
+  processed INTEGER NOT NULL DEFAULT 0,
+  ingested INTEGER NOT NULL DEFAULT 0,  -- parsed and embedded
+  reused INTEGER NOT NULL DEFAULT 0,  -- same content as another applicant's resume
+  duplicate INTEGER NOT NULL DEFAULT 0,  -- the applicant already has this content
+  skipped INTEGER NOT NULL DEFAULT 0,  -- too large
+  failed INTEGER NOT NULL DEFAULT 0,
+  error TEXT,
+  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  FOREIGN KEY (applicant_id) REFERENCES users(id)
+);
+
+-- Every file an ingestion has handled; the checkpoint a resumed ingestion continues from
+CREATE TABLE IF NOT EXISTS resume_ingestion_files (
+  id INTEGER PRIMARY KEY,
+  ingestion_id INTEGER NOT NULL,
+  entry TEXT NOT NULL,  -- path relative to the directory, or archive member name
+  content_hash TEXT,
+  resume_id INTEGER,
+  outcome TEXT CHECK(outcome IN ('ingested', 'reused', 'duplicate', 'skipped', 'failed')) NOT NULL,
+  error TEXT,
+  FOREIGN KEY (ingestion_id) REFERENCES resume_ingestions(id),
+  UNIQUE(ingestion_id, entry)
+);
+
+-- LLM match analyses reusable for near-duplicate candidate profiles (see analysis_cache.py)
+CREATE TABLE IF NOT EXISTS match_analysis_cache (
+  id INTEGER PRIMARY KEY,
+  job_id INTEGER NOT NULL,
+  jd_hash TEXT NOT NULL,  -- entries only match the job description they were produced for
+  embedding_model TEXT NOT NULL,
+  profile_embedding BLOB NOT NULL,
+  llm_score FLOAT,  -- only the score is reused: the LLM's analysis describes the other applicant
+  hits INTEGER NOT NULL DEFAULT 0,
+  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  last_hit_at TIMESTAMP,
+  FOREIGN KEY (job_id) REFERENCES jobs(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_match_analysis_cache_job ON match_analysis_cache(job_id, jd_hash, embedding_model);
+
 -- Interview scheduling
 CREATE TABLE IF NOT EXISTS interviews (
   id INTEGER PRIMARY KEY,
@@ -54,4 +176,13 @@ CREATE TABLE IF NOT EXISTS interviews (
   status TEXT CHECK(status IN ('scheduled', 'completed', 'cancelled')) DEFAULT 'scheduled',
   notes TEXT,
   FOREIGN KEY (application_id) REFERENCES applications(id)
-);
\ No newline at end of file
+);
+-- One vector per job (mean of its JD chunk vectors) for recommendations (see recommender.py)
+CREATE TABLE IF NOT EXISTS job_embeddings (
+  job_id INTEGER NOT NULL,
+  embedding_model TEXT NOT NULL,
+  embedding BLOB NOT NULL,  -- normalized float32
+  updated_at REAL NOT NULL,  -- unix time; changes invalidate the in-process matrix
+  PRIMARY KEY (job_id, embedding_model),
+  FOREIGN KEY (job_id) REFERENCES jobs(id)
+);
@@ -0,0 +1,342 @@
+# vector_index.py
+"""
+Retrieval of job description chunks, behind one interface with two
+backends (Config.VECTOR_INDEX_BACKEND):
+
+    chroma - queries the jobs Chroma collection directly
+    numpy  - in-process index: each job's chunk vectors are kept normalized
+             in a memory-mapped float32 .npy file with its texts and metadata
+             in a JSON file next to it, so searching one job is a
+             matrix-vector product over a handful of rows. Searches across
+             all jobs use a flat index of every chunk, or above
+             Config.VECTOR_INDEX_ANN_MIN_SIZE chunks an IVF approximate index
+             (spherical k-means lists, Config.VECTOR_INDEX_NPROBE probed)
+
+Chroma remains the store of record with either backend: writes go to the
+collection first, so migrations, compaction and snapshots (vector_store.py)
+keep working, and the numpy files are derived from it. They live under
+Config.VECTOR_INDEX_DIR in a folder named after the active collection, so
+after a migration or compaction they are rebuilt lazily from the stored
+vectors, without re-embedding. A job's files are replaced atomically;
+other processes pick up the change on their next search of that job.
+
+Hits carry the chunk vector and its cosine similarity to the query, so
+callers never re-embed retrieved chunks.
+"""
+
+import os
+import re
+import json
+import uuid
+import shutil
+import threading
+from collections import namedtuple
+import numpy as np
+from config import Config
+from metrics import registry, span
+from embeddings import get_embeddings
+from vector_store import get_store, active_model, active_collection, mark_changed
+
+Hit = namedtuple("Hit", "text metadata vector score")
+
+index_builds_total = registry.counter(
+    "vector_index_builds_total", "Job index files and cross-job indexes built, by kind")
+
+COMPLETE_MARKER = ".complete"
+JOB_FILE = re.compile(r"^job-(\d+)\.json$")
+WRITE_BATCH = 1000  # documents per Chroma add call
+
+
+def normalized(vectors):
+    """float32 copy of a vector or matrix scaled to unit length (zero vectors stay zero)"""
+    array = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(array, axis=-1, keepdims=True)
+    return array / np.where(norms == 0, 1, norms)
+
+
+def chunk_ids(job_id, count):
+    return [f"job-{job_id}-chunk-{i}" for i in range(count)]
+
+
+def top_indices(scores, k):
+    """Indices of the k highest scores, best first"""
+    if k >= len(scores):
+        return np.argsort(-scores)
+    best = np.argpartition(-scores, k)[:k]
+    return best[np.argsort(-scores[best])]
+
+
+class ChromaIndex:
+    """Chunks stored and searched in the jobs Chroma collection"""
+    name = "chroma"
+
+    def collection(self):
+        return get_store("jobs")._collection
+
+    def embeddings(self):
+        return get_embeddings(active_model("jobs"))
+
+    def replace(self, jobs):
+        """
+        Store the chunks of several jobs, replacing any each had before.
+        jobs: [(job_id, texts, metadatas, vectors or None to embed them)].
+        Returns the same list with the vectors filled in.
+        """
+        jobs = list(jobs)
+        to_embed = [text for _, texts, _, vectors in jobs if vectors is None for text in texts]
+        if to_embed:
+            with span("embed"):
+                embedded = iter(self.embeddings().embed_documents(to_embed))
+        prepared, ids, documents, metadatas, vectors = [], [], [], [], []
+        for job_id, job_texts, job_metadatas, job_vectors in jobs:
+            if job_vectors is None:
+                job_vectors = [next(embedded) for _ in job_texts]
+            job_vectors = [[float(x) for x in vector] for vector in job_vectors]
+            prepared.append((job_id, job_texts, job_metadatas, job_vectors))
+            ids += chunk_ids(job_id, len(job_texts)) if job_id is not None else \
+                [uuid.uuid4().hex for _ in job_texts]
+            documents += job_texts
+            metadatas += job_metadatas
+            vectors += job_vectors
+
+        collection = self.collection()
+        with span("vector_write"):
+            replaced = [job_id for job_id, *_ in prepared if job_id is not None]
+            if replaced:
+                # Upsert over the previous chunks and delete only the surplus: chromadb 0.4 loses
+                # track of ids deleted and re-added before its index is flushed
+                existing = collection.get(where={"job_id": {"$in": replaced}}, include=[])["ids"]
+                stale = sorted(set(existing) - set(ids))
+                if stale:
+                    collection.delete(ids=stale)
+            for start in range(0, len(ids), WRITE_BATCH):
+                batch = slice(start, start + WRITE_BATCH)
+                collection.upsert(ids=ids[batch], embeddings=vectors[batch], documents=documents[batch],
+                                  metadatas=metadatas[batch])
+        mark_changed("jobs")
+        return prepared
+
+    def search(self, vector, k, job_id=None):
+        """The k chunks closest to vector, of one job or (job_id None) of all jobs"""
+        collection = self.collection()
+        result = collection.query(query_embeddings=[[float(x) for x in vector]], n_results=k,
+                                  where={"job_id": job_id} if job_id is not None else None,
+                                  include=["documents", "metadatas", "embeddings"])
+        if not result["ids"][0]:
+            return []
+        chunk_vectors = np.asarray(result["embeddings"][0], dtype=np.float32)
+        scores = normalized(chunk_vectors) @ normalized(vector)
+        hits = [Hit(text, metadata or {}, chunk_vector, float(score)) for text, metadata, chunk_vector, score
+                in zip(result["documents"][0], result["metadatas"][0], chunk_vectors, scores)]
+        # chromadb 0.4 can return more than n_results when unflushed writes are merged in
+        return hits[:k]
+
+    def vectors(self, job_id):
+        """Normalized matrix of a job's chunk vectors (no rows when it has none)"""
+        stored = self.collection().get(where={"job_id": job_id}, include=["embeddings"])
+        if not stored["ids"]:
+            return np.zeros((0, 0), dtype=np.float32)
+        return normalized(stored["embeddings"])
+
+    def search_text(self, query, k, job_id=None):
+        with span("embed"):
+            vector = self.embeddings().embed_query(query)
+        return self.search(vector, k, job_id)
+
+
+class NumpyIndex(ChromaIndex):
+    """Chroma for writes, memory-mapped per-job matrices for reads"""
+    name = "numpy"
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.jobs = {}  # (directory, job_id) -> (json mtime, (texts, metadatas, matrix))
+        self.cross_job = None  # (directory, directory mtime, index)
+        self.directory_in_use = None
+
+    def directory(self):
+        """Folder of the active collection's files; folders of earlier collections are removed"""
+        directory = os.path.join(Config.VECTOR_INDEX_DIR, "jobs", active_collection("jobs"))
+        if directory != self.directory_in_use:
+            os.makedirs(directory, exist_ok=True)
+            parent = os.path.dirname(directory)
+            for entry in os.listdir(parent):
+                if os.path.join(parent, entry) != directory:
+                    shutil.rmtree(os.path.join(parent, entry), ignore_errors=True)
+            self.directory_in_use = directory
+        return directory
+
+    def replace(self, jobs):
+        prepared = super().replace(jobs)
+        directory = self.directory()
+        for job_id, texts, metadatas, vectors in prepared:
+            if job_id is not None:
+                self._write(directory, job_id, texts, metadatas, vectors)
+        return prepared
+
+    def _write(self, directory, job_id, texts, metadatas, vectors):
+        """Write a job's files: the vectors under a fresh name, then the JSON pointing at them"""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"job-{job_id}.json")
+        vectors_file = None
+        if texts:
+            vectors_file = f"job-{job_id}.{uuid.uuid4().hex[:12]}.npy"
+            np.save(os.path.join(directory, vectors_file), normalized(vectors))
+        try:
+            with open(path) as f:
+                previous = json.load(f).get("vectors")
+        except (OSError, ValueError):
+            previous = None
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"vectors": vectors_file, "texts": texts, "metadatas": metadatas}, f)
+        os.replace(tmp_path, path)
+        if previous and previous != vectors_file:
+            try:
+                # Processes that mapped the old file keep reading it until they reload
+                os.remove(os.path.join(directory, previous))
+            except FileNotFoundError:
+                pass
+
+    def _warm(self, directory, job_id):
+        """Build a job's files from the vectors stored in Chroma"""
+        stored = self.collection().get(where={"job_id": job_id}, include=["documents", "metadatas", "embeddings"])
+        order = sorted(range(len(stored["ids"])), key=lambda i: stored["ids"][i])
+        self._write(directory, job_id, [stored["documents"][i] for i in order],
+                    [stored["metadatas"][i] for i in order], [stored["embeddings"][i] for i in order])
+        index_builds_total.inc(kind="job")
+
+    def load(self, job_id, directory=None):
+        """(texts, metadatas, normalized matrix) of a job, mapped once per version of its files"""
+        directory = directory or self.directory()
+        path = os.path.join(directory, f"job-{job_id}.json")
+        for _ in range(3):
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                self._warm(directory, job_id)
+                continue
+            cached = self.jobs.get((directory, job_id))
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+                # A plain ndarray view of the mapping: row access skips np.memmap's per-slice overhead
+                matrix = np.asarray(np.load(os.path.join(directory, data["vectors"]), mmap_mode="r")) \
+                    if data["vectors"] else np.zeros((0, 0), dtype=np.float32)
+            except (FileNotFoundError, ValueError):
+                # Replaced by another process between the stat and the reads
+                continue
+            entry = (data["texts"], data["metadatas"], matrix)
+            with self.lock:
+                self.jobs[(directory, job_id)] = (mtime, entry)
+            return entry
+        raise RuntimeError(f"Could not load the vector index files of job {job_id}")
+
+    def vectors(self, job_id):
+        return self.load(job_id)[2]
+
+    def search(self, vector, k, job_id=None):
+        if job_id is None:
+            return self.search_all(vector, k)
+        texts, metadatas, matrix = self.load(job_id)
+        if not texts:
+            return []
+        query = normalized(vector)
+        scores = matrix @ query
+        return [Hit(texts[i], metadatas[i], matrix[i], float(scores[i])) for i in top_indices(scores, k)]
+
+    def _cross_job_index(self):
+        """Flat (and above the size threshold, IVF) index of every job's chunks, rebuilt when files change"""
+        directory = self.directory()
+        marker = os.path.join(directory, COMPLETE_MARKER)
+        if not os.path.exists(marker):
+            # Jobs written before this backend was enabled only exist in Chroma
+            stored = self.collection().get(include=["metadatas"])
+            job_ids = {metadata["job_id"] for metadata in stored["metadatas"] if metadata and "job_id" in metadata}
+            for job_id in job_ids:
+                if not os.path.exists(os.path.join(directory, f"job-{job_id}.json")):
+                    self._warm(directory, job_id)
+            open(marker, "w").close()
+        version = os.stat(directory).st_mtime_ns
+        cached = self.cross_job
+        if cached is not None and cached[:2] == (directory, version):
+            return cached[2]
+
+        with span("vector_index_build"):
+            job_ids = sorted(int(m.group(1)) for m in map(JOB_FILE.match, os.listdir(directory)) if m)
+            rows, matrices = [], []
+            for job_id in job_ids:
+                texts, _, matrix = self.load(job_id, directory)
+                if texts:
+                    rows += [(job_id, i) for i in range(len(texts))]
+                    matrices.append(matrix)
+            matrix = np.concatenate(matrices) if matrices else np.zeros((0, 0), dtype=np.float32)
+            index = {"rows": rows, "matrix": matrix, "ivf": None}
+            if len(rows) >= Config.VECTOR_INDEX_ANN_MIN_SIZE:
+                index["ivf"] = build_ivf(matrix)
+        index_builds_total.inc(kind="ivf" if index["ivf"] else "flat")
+        self.cross_job = (directory, version, index)
+        return index
+
+    def search_all(self, vector, k):
+        index = self._cross_job_index()
+        if not index["rows"]:
+            return []
+        query = normalized(vector)
+        if index["ivf"] is None:
+            candidates = None
+            scores = index["matrix"] @ query
+        else:
+            candidates = ivf_candidates(index["ivf"], query, Config.VECTOR_INDEX_NPROBE)
+            scores = index["matrix"][candidates] @ query
+        hits = []
+        for i in top_indices(scores, k):
+            job_id, position = index["rows"][i if candidates is None else candidates[i]]
+            texts, metadatas, matrix = self.load(job_id)
+            if position < len(texts):
+                hits.append(Hit(texts[position], metadatas[position], matrix[position], float(scores[i])))
+        return hits
+
+
+def build_ivf(matrix, iterations=8, seed=0):
+    """
+    Inverted file index: spherical k-means with about sqrt(n) lists, rows
+    sorted by list so each list is a contiguous slice
+    """
+    lists = max(1, int(np.sqrt(len(matrix))))
+    rng = np.random.default_rng(seed)
+    centroids = np.array(matrix[rng.choice(len(matrix), lists, replace=False)], dtype=np.float32)
+    for _ in range(iterations):
+        assignment = np.argmax(matrix @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, matrix)
+        empty = ~sums.any(axis=1)
+        centroids = np.where(empty[:, None], centroids, normalized(sums))
+    assignment = np.argmax(matrix @ centroids.T, axis=1)
+    order = np.argsort(assignment, kind="stable")
+    offsets = np.searchsorted(assignment[order], np.arange(lists + 1))
+    return {"centroids": centroids, "order": order, "offsets": offsets}
+
+
+def ivf_candidates(ivf, query, nprobe):
+    """Rows of the nprobe lists whose centroids are closest to the query"""
+    probed = top_indices(ivf["centroids"] @ query, nprobe)
+    return np.concatenate([ivf["order"][ivf["offsets"][i]:ivf["offsets"][i + 1]] for i in probed])
+
+
+BACKENDS = {backend.name: backend for backend in (ChromaIndex, NumpyIndex)}
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_job_index(backend=None):
+    """Shared index of job description chunks (default Config.VECTOR_INDEX_BACKEND)"""
+    backend = backend or Config.VECTOR_INDEX_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown vector index backend: {backend}")
+    with _indexes_lock:
+        if backend not in _indexes:
+            _indexes[backend] = BACKENDS[backend]()
+        return _indexes[backend]
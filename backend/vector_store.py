@@ -0,0 +1,696 @@
+# vector_store.py
+"""
+Chroma vector stores that record which embedding model produced them.
+
+Every collection carries `embedding_model` and `embedding_dimension` in its
+Chroma metadata. Opening a non-empty collection with a different model
+raises EmbeddingModelMismatch instead of silently comparing vectors from
+two models; empty collections and ones created before models were recorded
+(with a matching dimension) are stamped on first open.
+
+A store's active collection is named in `active_collection.json` in its
+persist directory. `migrate` re-embeds the active collection's documents
+in batches into a new collection, catches up on writes made meanwhile and
+swaps the pointer file atomically; processes pick up the new collection on
+their next `get_store` call. A process still configured with the model a
+migration moved away from follows the store to the new model, so Config
+can be updated after the swap.
+
+Deleted vectors stay in Chroma's HNSW index and its sqlite write-ahead
+queue, so stores only grow. `purge` deletes the chunks of closed or deleted
+jobs and leftover resume scratch chunks; `compact` copies the live vectors
+(without re-embedding) into a fresh collection the same way, drops the old
+one and reclaims its files. `snapshot` copies a store to
+Config.VECTOR_SNAPSHOT_DIR while it is in use, and `restore` puts a
+snapshot back in place without re-embedding anything. `index_stats` reports
+sizes, dead vectors and measured query latency. Purges and restores drop
+the in-process index files derived from a store (vector_index.py).
+
+chromadb keeps each process's index in memory and does not see other
+processes' writes, so writers call `mark_changed` and `get_store` reopens
+a store another process (e.g. another gunicorn worker) has written to.
+
+    python -m vector_store status [--probe 20]
+    python -m vector_store migrate jobs --model all-MiniLM-L12-v2 [--batch-size 64]
+    python -m vector_store maintain [jobs|resumes]   # purge, then compact when worthwhile
+    python -m vector_store snapshot jobs
+    python -m vector_store restore jobs db/snapshots/jobs-20240101-120000
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import sqlite3
+import argparse
+import threading
+from contextlib import closing
+from chromadb.api.client import SharedSystemClient
+from langchain_community.vectorstores import Chroma
+from config import Config
+from metrics import registry, span
+from embeddings import MODEL_DIMENSIONS, get_embeddings
+
+# Store name -> (persist directory, Config attribute naming its embedding model)
+STORES = {
+    "jobs": ("db/vector_store/jobs", "EMBEDDING_MODEL"),
+    "resumes": ("temp_db_resume", "RESUME_EMBEDDING_MODEL"),
+}
+LEGACY_COLLECTION = "langchain"  # LangChain's default, used before collections were versioned
+POINTER_FILE = "active_collection.json"
+GENERATION_FILE = "generation"
+
+reembedded_total = registry.counter(
+    "vector_store_reembedded_documents_total", "Documents re-embedded by vector store migrations")
+purged_total = registry.counter(
+    "vector_store_purged_documents_total", "Dead documents deleted from vector stores")
+query_seconds = registry.histogram(
+    "vector_store_query_seconds", "Latency of vector store probe queries")
+documents_gauge = registry.gauge("vector_store_documents", "Live documents in each vector store")
+disk_bytes_gauge = registry.gauge("vector_store_disk_bytes", "Disk usage of each vector store")
+dead_vectors_gauge = registry.gauge(
+    "vector_store_dead_vectors", "Deleted vectors still held by a store's HNSW index")
+
+
+class EmbeddingModelMismatch(RuntimeError):
+    """A collection holds vectors from a different embedding model than the one requested"""
+
+
+def model_dimension(model_name):
+    if model_name in MODEL_DIMENSIONS:
+        return MODEL_DIMENSIONS[model_name]
+    return len(get_embeddings(model_name).embed_query("dimension probe"))
+
+
+_pointers = {}
+
+
+def read_pointer(name):
+    """The store's pointer file ({} before its first migration), cached by mtime"""
+    path = os.path.join(STORES[name][0], POINTER_FILE)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    cached = _pointers.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path) as f:
+            cached = (mtime, json.load(f))
+        _pointers[path] = cached
+    return cached[1]
+
+
+def write_pointer(name, pointer):
+    path = os.path.join(STORES[name][0], POINTER_FILE)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(pointer, f)
+    os.replace(tmp_path, path)
+
+
+def active_collection(name):
+    return read_pointer(name).get("collection", LEGACY_COLLECTION)
+
+
+def active_model(name):
+    """
+    Embedding model of a store: the configured one, or the model a migration
+    moved the store to when this process is still configured with the old one
+    """
+    configured = getattr(Config, STORES[name][1])
+    pointer = read_pointer(name)
+    if pointer.get("model") and configured == pointer.get("previous_model"):
+        return pointer["model"]
+    return configured
+
+
+def _open(name, collection_name, model_name):
+    persist_directory = STORES[name][0]
+    os.makedirs(persist_directory, exist_ok=True)
+    return Chroma(
+        persist_directory=persist_directory,
+        collection_name=collection_name,
+        embedding_function=get_embeddings(model_name)
+    )
+
+
+def check_collection(collection, model_name, dimension):
+    """Stamp an empty or unversioned collection with its model; raise if it holds another model's vectors"""
+    metadata = dict(collection.metadata or {})
+    recorded_model, recorded_dimension = metadata.get("embedding_model"), metadata.get("embedding_dimension")
+    if (recorded_model, recorded_dimension) == (model_name, dimension):
+        return
+    if collection.count():
+        if recorded_model is not None:
+            raise EmbeddingModelMismatch(
+                f"Collection {collection.name} holds {recorded_model} ({recorded_dimension}-d) vectors, "
+                f"not {model_name} ({dimension}-d); migrate it with `python -m vector_store migrate`")
+        sample = collection.get(limit=1, include=["embeddings"])["embeddings"][0]
+        if len(sample) != dimension:
+            raise EmbeddingModelMismatch(
+                f"Collection {collection.name} holds {len(sample)}-d vectors, not {model_name} ({dimension}-d); "
+                f"migrate it with `python -m vector_store migrate`")
+        print(f"Recording {model_name} as the embedding model of existing collection {collection.name}")
+    metadata.update(embedding_model=model_name, embedding_dimension=dimension)
+    # Chroma refuses to modify the distance function, even to the same value
+    collection.modify(metadata={k: v for k, v in metadata.items() if not k.startswith("hnsw:")})
+
+
+def _generation(name):
+    """Marker of the last write to a store by any process (see mark_changed)"""
+    try:
+        return os.stat(os.path.join(STORES[name][0], GENERATION_FILE)).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+# Shared handles, one per store; chromadb cannot open the same persist
+# directory from several threads at once
+_stores = {}
+_stores_lock = threading.Lock()
+_stores_pid = None
+
+
+def get_store(name):
+    """Shared LangChain Chroma handle on the store's active collection, checked against its model"""
+    global _stores_pid
+    collection_name, model_name = active_collection(name), active_model(name)
+    generation = _generation(name)
+    with _stores_lock:
+        if _stores_pid != os.getpid():
+            # A forked worker must open its own chromadb connections, not the parent's
+            if _stores_pid is not None:
+                _stores.clear()
+                SharedSystemClient.clear_system_cache()
+            _stores_pid = os.getpid()
+        cached = _stores.get(name)
+        if cached is not None and cached[1] != generation:
+            # Another process wrote to the store; chromadb only sees that after reloading its index
+            SharedSystemClient.clear_system_cache()
+            cached = None
+        if cached is None or cached[0] != (collection_name, model_name):
+            store = _open(name, collection_name, model_name)
+            check_collection(store._collection, model_name, model_dimension(model_name))
+            _stores[name] = [(collection_name, model_name), generation, store]
+        return _stores[name][2]
+
+
+def mark_changed(name):
+    """
+    Record a write to a store so other processes (gunicorn workers) reload it.
+    This process keeps its handle unless another process wrote in between.
+    """
+    path = os.path.join(STORES[name][0], GENERATION_FILE)
+    with _stores_lock:
+        before = _generation(name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(str(os.getpid()))
+        os.replace(tmp_path, path)
+        cached = _stores.get(name)
+        if cached is not None and cached[1] == before:
+            cached[1] = _generation(name)
+
+
+def describe(name):
+    """Model, dimension and size of a store's active collection"""
+    store = _open(name, active_collection(name), active_model(name))
+    metadata = store._collection.metadata or {}
+    return {
+        "store": name,
+        "collection": store._collection.name,
+        "embedding_model": metadata.get("embedding_model"),
+        "embedding_dimension": metadata.get("embedding_dimension"),
+        "configured_model": getattr(Config, STORES[name][1]),
+        "documents": store._collection.count(),
+        "migration": _migrations.get(name),
+    }
+
+
+def _copy_missing(source, target, embeddings, batch_size, state, prune=True):
+    """
+    Re-embed source documents the target lacks, in batches (embeddings None
+    copies the stored vectors instead). With prune, also drop target
+    documents deleted from the source. Returns documents copied.
+    """
+    source_ids = set(source.get(include=[])["ids"])
+    target_ids = set(target.get(include=[])["ids"])
+    if prune and target_ids - source_ids:
+        target.delete(ids=sorted(target_ids - source_ids))
+    missing = sorted(source_ids - target_ids)
+    for start in range(0, len(missing), batch_size):
+        include = ["documents", "metadatas"] + (["embeddings"] if embeddings is None else [])
+        batch = source.get(ids=missing[start:start + batch_size], include=include)
+        if embeddings is None:
+            vectors = batch["embeddings"]
+        else:
+            with span("reembed_batch"):
+                vectors = embeddings.embed_documents(batch["documents"])
+            reembedded_total.inc(len(batch["ids"]))
+        target.add(ids=batch["ids"], embeddings=vectors, documents=batch["documents"],
+                   metadatas=batch["metadatas"])
+        state["copied"] += len(batch["ids"])
+    return len(missing)
+
+
+def _collection_name(name, model_name):
+    slug = re.sub(r"[^A-Za-z0-9_-]+", "-", model_name.split("/")[-1]).strip("-_")[:32]
+    return f"{name}_{slug}_{int(time.time())}"
+
+
+# Migration state per store for status reporting; migrations run one at a time
+_migrations = {}
+_migrate_lock = threading.Lock()
+
+
+def migrate(name, model_name, batch_size=64, catch_up_passes=5):
+    """
+    Re-embed a store with model_name into a new collection and make it the
+    active one. The previous collection is kept for rollback until the next
+    migration of the store.
+    """
+    with _migrate_lock:
+        pointer = dict(read_pointer(name))
+        source_name, source_model = active_collection(name), active_model(name)
+        target_name = _collection_name(name, model_name)
+        state = _migrations[name] = {
+            "status": "running", "from_collection": source_name, "to_collection": target_name,
+            "from_model": source_model, "to_model": model_name, "copied": 0, "error": None,
+        }
+        try:
+            target = _open(name, target_name, model_name)
+            check_collection(target._collection, model_name, model_dimension(model_name))
+            client = target._client
+            stale = pointer.get("previous_collection")
+            if stale and stale not in (source_name, target_name):
+                try:
+                    client.delete_collection(stale)
+                except ValueError:
+                    pass
+            source = client.get_or_create_collection(source_name)
+            state["total"] = source.count()
+            embeddings = get_embeddings(model_name)
+
+            # Bulk copy, then catch up on documents written while copying
+            for _ in range(catch_up_passes):
+                if not _copy_missing(source, target._collection, embeddings, batch_size, state):
+                    break
+            with _stores_lock:
+                _copy_missing(source, target._collection, embeddings, batch_size, state)
+                write_pointer(name, {
+                    "collection": target_name, "model": model_name,
+                    "previous_collection": source_name, "previous_model": source_model,
+                })
+                _stores.pop(name, None)
+            # Writers holding the old handle across the swap
+            _copy_missing(source, target._collection, embeddings, batch_size, state, prune=False)
+            mark_changed(name)
+            state["status"] = "completed"
+        except Exception as e:
+            print(f"Error migrating vector store {name}: {e}")
+            state.update(status="failed", error=str(e))
+            try:
+                if active_collection(name) != target_name:
+                    target._client.delete_collection(target_name)
+            except Exception:
+                pass
+        return dict(state)
+
+
+def migrate_in_background(name, model_name, batch_size=64):
+    thread = threading.Thread(target=migrate, args=(name, model_name, batch_size),
+                              name=f"vector-migrate-{name}", daemon=True)
+    thread.start()
+    return thread
+
+
+# ---- Lifecycle: purge, compaction, snapshots, stats ----
+
+SQLITE_FILE = "chroma.sqlite3"
+SNAPSHOT_MANIFEST = "snapshot.json"
+UUID_DIR = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$")
+ADD_OPERATIONS = (0, 2)  # chromadb Operation.ADD, Operation.UPSERT in embeddings_queue
+DELETE_BATCH = 5000  # below chromadb's per-call limit
+
+# Last purge/compaction per store for status reporting
+_maintenance = {}
+
+
+def _tree_bytes(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+
+def _read_only(name):
+    path = os.path.abspath(os.path.join(STORES[name][0], SQLITE_FILE))
+    return closing(sqlite3.connect(f"file:{path}?mode=ro", uri=True))
+
+
+def _vector_segments(name):
+    """Segment id -> collection name of every HNSW segment the store's sqlite knows"""
+    with _read_only(name) as db:
+        return dict(db.execute('''
+            SELECT s.id, c.name FROM segments s JOIN collections c ON c.id = s.collection
+            WHERE s.scope = 'VECTOR'
+        ''').fetchall())
+
+
+def probe_latency(name, queries=20, k=4):
+    """Latency of k-NN queries using stored vectors as queries (no embedding time)"""
+    collection = get_store(name)._collection
+    count = collection.count()
+    if not count or not queries:
+        return None
+    vectors = collection.get(limit=queries, include=["embeddings"])["embeddings"]
+    timings = []
+    for vector in vectors:
+        start = time.perf_counter()
+        collection.query(query_embeddings=[vector], n_results=min(k, count), include=[])
+        timings.append(time.perf_counter() - start)
+        query_seconds.observe(timings[-1], store=name)
+    timings.sort()
+    return {
+        "queries": len(timings),
+        "p50_ms": round(timings[len(timings) // 2] * 1000, 2),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000, 2),
+        "max_ms": round(timings[-1] * 1000, 2),
+    }
+
+
+def index_stats(name, probe_queries=0):
+    """
+    Size of a store on disk, live and dead vectors of its active collection,
+    files left by dropped collections and, with probe_queries, query latency
+    """
+    directory = STORES[name][0]
+    collection = get_store(name)._collection
+    documents = collection.count()
+    segments = _vector_segments(name)
+    with _read_only(name) as db:
+        topic = db.execute('SELECT topic FROM collections WHERE name = ?', [collection.name]).fetchone()[0]
+        queue_rows = db.execute('SELECT COUNT(*) FROM embeddings_queue').fetchone()[0]
+        added = db.execute(
+            f'SELECT COUNT(DISTINCT id) FROM embeddings_queue WHERE topic = ? AND operation IN {ADD_OPERATIONS}',
+            [topic]).fetchone()[0]
+    active_segments = [segment for segment, owner in segments.items() if owner == collection.name]
+    orphaned = [entry for entry in os.listdir(directory)
+                if UUID_DIR.match(entry) and entry not in segments]
+    stats = {
+        "store": name,
+        "collection": collection.name,
+        "documents": documents,
+        "dead_vectors": max(added - documents, 0),
+        "disk_bytes": _tree_bytes(directory),
+        "sqlite_bytes": sum(os.path.getsize(os.path.join(directory, f)) for f in os.listdir(directory)
+                            if f.startswith(SQLITE_FILE)),
+        "queue_rows": queue_rows,
+        "hnsw_bytes": sum(_tree_bytes(os.path.join(directory, s)) for s in active_segments
+                          if os.path.isdir(os.path.join(directory, s))),
+        "other_collections": sorted(set(segments.values()) - {collection.name}),
+        "orphaned_bytes": sum(_tree_bytes(os.path.join(directory, entry)) for entry in orphaned),
+        "query_latency": probe_latency(name, probe_queries) if probe_queries else None,
+        "maintenance": _maintenance.get(name),
+    }
+    stats["dead_ratio"] = round(stats["dead_vectors"] / max(added, 1), 4)
+    documents_gauge.set(documents, store=name)
+    disk_bytes_gauge.set(stats["disk_bytes"], store=name)
+    dead_vectors_gauge.set(stats["dead_vectors"], store=name)
+    return stats
+
+
+def dead_ids(name, ids, metadatas, db_path=None):
+    """
+    Documents nothing reads any more: jobs chunks whose job is closed or gone,
+    resume scratch chunks older than Config.VECTOR_SCRATCH_TTL_SECONDS (a
+    parse that died before cleaning up after itself)
+    """
+    if name == "jobs":
+        from rescoring import connect  # rescoring reaches this module through the agents
+        db = connect(db_path)
+        try:
+            open_jobs = {row['id'] for row in db.execute("SELECT id FROM jobs WHERE status = 'open'").fetchall()}
+        finally:
+            db.close()
+        return [doc_id for doc_id, metadata in zip(ids, metadatas) if (metadata or {}).get("job_id") not in open_jobs]
+    cutoff = time.time() - Config.VECTOR_SCRATCH_TTL_SECONDS
+    return [doc_id for doc_id, metadata in zip(ids, metadatas) if (metadata or {}).get("added_at", 0) < cutoff]
+
+
+def purge(name, db_path=None):
+    """Delete a store's dead documents (see dead_ids); returns how many"""
+    collection = get_store(name)._collection
+    records = collection.get(include=["metadatas"])
+    dead = dead_ids(name, records["ids"], records["metadatas"], db_path)
+    with span("vector_purge"):
+        for start in range(0, len(dead), DELETE_BATCH):
+            collection.delete(ids=dead[start:start + DELETE_BATCH])
+    if dead:
+        purged_total.inc(len(dead), store=name)
+        mark_changed(name)
+        drop_derived(name)
+    return len(dead)
+
+
+def drop_derived(name):
+    """Remove the in-process index files derived from a store (vector_index.py rebuilds them from Chroma)"""
+    shutil.rmtree(os.path.join(Config.VECTOR_INDEX_DIR, name), ignore_errors=True)
+
+
+def _reclaim(name):
+    """Remove HNSW folders of dropped collections and VACUUM the sqlite file"""
+    directory = STORES[name][0]
+    segments = _vector_segments(name)
+    for entry in os.listdir(directory):
+        if UUID_DIR.match(entry) and entry not in segments:
+            shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+    try:
+        with closing(sqlite3.connect(os.path.join(directory, SQLITE_FILE), timeout=30)) as db:
+            db.execute("VACUUM")
+    except sqlite3.OperationalError as e:
+        # Busy with a long write; the space is reused by sqlite anyway
+        print(f"Skipped VACUUM of vector store {name}: {e}")
+
+
+def compact(name, batch_size=500):
+    """
+    Copy the active collection's live vectors into a new collection, swap
+    it in like a migration, then drop the old collection and reclaim its
+    files. Nothing is re-embedded.
+    """
+    with _migrate_lock:
+        pointer = dict(read_pointer(name))
+        source_name, model_name = active_collection(name), active_model(name)
+        target_name = _collection_name(name, model_name)
+        state = _maintenance[name] = {
+            "operation": "compact", "status": "running", "from_collection": source_name,
+            "to_collection": target_name, "copied": 0, "disk_bytes_before": _tree_bytes(STORES[name][0]),
+            "error": None,
+        }
+        try:
+            target = _open(name, target_name, model_name)
+            check_collection(target._collection, model_name, model_dimension(model_name))
+            client = target._client
+            source = client.get_collection(source_name)
+            for _ in range(5):
+                if not _copy_missing(source, target._collection, None, batch_size, state):
+                    break
+            with _stores_lock:
+                _copy_missing(source, target._collection, None, batch_size, state)
+                write_pointer(name, {**pointer, "collection": target_name, "model": pointer.get("model", model_name)})
+                _stores.pop(name, None)
+            mark_changed(name)
+            # Requests that fetched the old handle before the swap finish their writes there
+            time.sleep(Config.VECTOR_COMPACT_GRACE_SECONDS)
+            _copy_missing(source, target._collection, None, batch_size, state, prune=False)
+            client.delete_collection(source_name)
+            _reclaim(name)
+            state.update(status="completed", disk_bytes_after=_tree_bytes(STORES[name][0]))
+        except Exception as e:
+            print(f"Error compacting vector store {name}: {e}")
+            state.update(status="failed", error=str(e))
+            try:
+                if active_collection(name) != target_name:
+                    target._client.delete_collection(target_name)
+            except Exception:
+                pass
+        return dict(state)
+
+
+def maintain(name, db_path=None):
+    """Purge dead documents, then compact when Config.VECTOR_COMPACT_DEAD_RATIO of the index is dead"""
+    purged = purge(name, db_path)
+    stats = index_stats(name)
+    result = {"store": name, "purged": purged, "dead_ratio": stats["dead_ratio"], "compaction": None}
+    if stats["dead_ratio"] >= Config.VECTOR_COMPACT_DEAD_RATIO or stats["orphaned_bytes"]:
+        result["compaction"] = compact(name)
+    return result
+
+
+def maintain_in_background(names, db_path=None):
+    def run():
+        for name in names:
+            maintain(name, db_path)
+
+    thread = threading.Thread(target=run, name="vector-maintain", daemon=True)
+    thread.start()
+    return thread
+
+
+def _file_versions(directory):
+    return {os.path.join(root, f): os.stat(os.path.join(root, f)).st_mtime_ns
+            for root, _, files in os.walk(directory) for f in files if not f.startswith(SQLITE_FILE)}
+
+
+def snapshot(name, keep=None):
+    """
+    Consistent copy of a store in Config.VECTOR_SNAPSHOT_DIR, taken while it
+    is in use. HNSW files are copied first (again if chromadb flushed them
+    meanwhile), then sqlite through its backup API: on open chromadb replays
+    whatever the copied index lacks from the newer sqlite queue.
+    """
+    directory = STORES[name][0]
+    os.makedirs(Config.VECTOR_SNAPSHOT_DIR, exist_ok=True)
+    path = os.path.join(Config.VECTOR_SNAPSHOT_DIR, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}")
+    partial = f"{path}.partial"
+    ignore = shutil.ignore_patterns(f"{SQLITE_FILE}*", "*.tmp")
+    with _migrate_lock, span("vector_snapshot"):
+        collection = get_store(name)._collection
+        for _ in range(5):
+            shutil.rmtree(partial, ignore_errors=True)
+            before = _file_versions(directory)
+            shutil.copytree(directory, partial, ignore=ignore)
+            if _file_versions(directory) == before:
+                break
+        else:
+            shutil.rmtree(partial, ignore_errors=True)
+            raise RuntimeError(f"Vector store {name} kept changing during the snapshot")
+        with closing(sqlite3.connect(os.path.join(directory, SQLITE_FILE))) as source, \
+                closing(sqlite3.connect(os.path.join(partial, SQLITE_FILE))) as target:
+            source.backup(target)
+        manifest = {
+            "store": name, "collection": collection.name, "embedding_model": active_model(name),
+            "documents": collection.count(), "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "bytes": _tree_bytes(partial),
+        }
+        with open(os.path.join(partial, SNAPSHOT_MANIFEST), "w") as f:
+            json.dump(manifest, f)
+        os.replace(partial, path)
+
+    # Keep the newest snapshots of this store
+    keep = Config.VECTOR_SNAPSHOT_KEEP if keep is None else keep
+    for old in list_snapshots(name)[keep:]:
+        shutil.rmtree(old["path"], ignore_errors=True)
+    return {**manifest, "path": path}
+
+
+def list_snapshots(name=None):
+    """Snapshots in Config.VECTOR_SNAPSHOT_DIR, newest first"""
+    if not os.path.isdir(Config.VECTOR_SNAPSHOT_DIR):
+        return []
+    snapshots = []
+    for entry in os.listdir(Config.VECTOR_SNAPSHOT_DIR):
+        path = os.path.join(Config.VECTOR_SNAPSHOT_DIR, entry)
+        try:
+            with open(os.path.join(path, SNAPSHOT_MANIFEST)) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if name is None or manifest.get("store") == name:
+            snapshots.append({**manifest, "path": path})
+    return sorted(snapshots, key=lambda s: s["created_at"], reverse=True)
+
+
+def restore(name, path):
+    """
+    Put a snapshot back in place of a store. The replaced files are kept
+    next to the store as <directory>.before-restore-<time>.
+    """
+    with open(os.path.join(path, SNAPSHOT_MANIFEST)) as f:
+        manifest = json.load(f)
+    if manifest.get("store") != name:
+        raise ValueError(f"{path} is a snapshot of {manifest.get('store')}, not {name}")
+    directory = os.path.normpath(STORES[name][0])
+    staging = f"{directory}.restoring"
+    shutil.rmtree(staging, ignore_errors=True)
+    shutil.copytree(path, staging, ignore=shutil.ignore_patterns(SNAPSHOT_MANIFEST))
+    replaced = f"{directory}.before-restore-{time.strftime('%Y%m%d-%H%M%S')}"
+    with _migrate_lock, _stores_lock:
+        _stores.pop(name, None)
+        SharedSystemClient.clear_system_cache()
+        if os.path.exists(directory):
+            os.replace(directory, replaced)
+        os.replace(staging, directory)
+    mark_changed(name)
+    drop_derived(name)
+    get_store(name)
+    return {**manifest, "path": path, "replaced": replaced}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m vector_store", description="Inspect and migrate vector stores")
+    commands = parser.add_subparsers(dest="command", required=True)
+    status_parser = commands.add_parser("status", help="model, dimension, size and dead vectors of each store")
+    status_parser.add_argument("--probe", type=int, default=0, metavar="QUERIES", help="also measure query latency")
+    migrate_parser = commands.add_parser("migrate", help="re-embed a store with another model")
+    migrate_parser.add_argument("store", choices=sorted(STORES))
+    migrate_parser.add_argument("--model", required=True)
+    migrate_parser.add_argument("--batch-size", type=int, default=64)
+    maintain_parser = commands.add_parser("maintain", help="purge dead documents, compact when worthwhile")
+    maintain_parser.add_argument("stores", nargs="*", choices=sorted(STORES), default=sorted(STORES))
+    maintain_parser.add_argument("--db", help="database path (default Config.DATABASE_PATH)")
+    compact_parser = commands.add_parser("compact", help="rebuild a store from its live vectors")
+    compact_parser.add_argument("store", choices=sorted(STORES))
+    snapshot_parser = commands.add_parser("snapshot", help="copy a store to VECTOR_SNAPSHOT_DIR")
+    snapshot_parser.add_argument("store", choices=sorted(STORES))
+    restore_parser = commands.add_parser("restore", help="replace a store with a snapshot")
+    restore_parser.add_argument("store", choices=sorted(STORES))
+    restore_parser.add_argument("snapshot", help="snapshot directory")
+    args = parser.parse_args(argv)
+
+    if args.command == "status":
+        for name in STORES:
+            print(json.dumps({**describe(name), **index_stats(name, args.probe)}))
+        return 0
+    if args.command == "maintain":
+        for name in args.stores:
+            result = maintain(name, args.db)
+            compaction = result["compaction"] or {}
+            print(f"{'❌' if compaction.get('status') == 'failed' else '✅'} {name}: {result['purged']} dead documents "
+                  f"purged, dead ratio {result['dead_ratio']:.1%}"
+                  + (f", compacted {compaction.get('disk_bytes_before')} -> {compaction.get('disk_bytes_after')} bytes"
+                     if compaction.get("status") == "completed" else "")
+                  + (f", compaction failed: {compaction['error']}" if compaction.get("error") else ""),
+                  file=sys.stderr)
+        return 0
+    if args.command == "compact":
+        state = compact(args.store)
+        print(f"{'✅' if state['status'] == 'completed' else '❌'} {args.store}: {state['from_collection']} -> "
+              f"{state['to_collection']}, {state['copied']} vectors, {state['disk_bytes_before']} -> "
+              f"{state.get('disk_bytes_after')} bytes" + (f" ({state['error']})" if state["error"] else ""),
+              file=sys.stderr)
+        return 0 if state["status"] == "completed" else 1
+    if args.command == "snapshot":
+        result = snapshot(args.store)
+        print(f"✅ {args.store}: {result['documents']} documents, {result['bytes']} bytes -> {result['path']}",
+              file=sys.stderr)
+        return 0
+    if args.command == "restore":
+        result = restore(args.store, args.snapshot)
+        print(f"✅ {args.store} restored from {result['path']} ({result['documents']} documents, "
+              f"{result['created_at']}); previous files kept in {result['replaced']}", file=sys.stderr)
+        return 0
+
+    state = migrate(args.store, args.model, args.batch_size)
+    print(f"{'✅' if state['status'] == 'completed' else '❌'} {args.store}: {state['from_collection']} "
+          f"({state['from_model']}) -> {state['to_collection']} ({state['to_model']}), "
+          f"{state['copied']} documents re-embedded", file=sys.stderr)
+    if state["error"]:
+        print(f"   {state['error']}", file=sys.stderr)
+    return 0 if state["status"] == "completed" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
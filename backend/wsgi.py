@@ -0,0 +1,26 @@
+# wsgi.py
+"""
+WSGI entry point for production servers:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Importing this module loads every embedding model (and its tokenizer) the
+vector stores use. With gunicorn's preload_app the master does this once
+and the forked workers share the weights copy-on-write instead of each
+loading its own copy.
+"""
+
+from app import app
+from vector_store import STORES, active_model
+from embeddings import get_embeddings
+from agents.chunker import get_token_counter
+
+
+def preload_models():
+    for name in STORES:
+        model_name = active_model(name)
+        get_embeddings(model_name)
+        get_token_counter(model_name)
+
+
+preload_models()